@@ -6,6 +6,27 @@ class Bar:
     Represents a single bar (OHLCV).
     Matches cTrader's Bar struct with properties: OpenTime, Open, High, Low, Close, TickVolume
     """
+
+    __slots__ = (
+        "OpenTime",
+        "Open",
+        "High",
+        "Low",
+        "Close",
+        "TickVolume",
+        "open_time",
+        "open_bid",
+        "high_bid",
+        "low_bid",
+        "close_bid",
+        "volume_bid",
+        "open_ask",
+        "high_ask",
+        "low_ask",
+        "close_ask",
+        "volume_ask",
+    )
+
     def __init__(
         self,
         open_time: datetime = datetime.min,
@@ -0,0 +1,324 @@
+from __future__ import annotations
+from typing import Iterator, Optional, Any
+from datetime import datetime
+import numpy as np
+from Api.Bar import Bar
+from Api.TickDay import TickDay
+
+
+class BarRing:
+    """
+    Struct-of-arrays ring of bars: one preallocated float64 array, a row per field (FIELDS) and a column
+    per bar slot, with a single write position shared by all fields. A new bar is one column write;
+    the rows are contiguous 1d views (e.g. ring.close_bid) for per-tick updates of the current bar.
+
+    Relative positions are Ringbuffer-like: 0 = newest bar, 1 = the bar before, ...
+    Bars' DataSeries/TimeSeries read and write through RingColumn views of single rows; the ring pushes
+    its counters to them on append/resize, so reads (per tick, by indicators) are plain attribute loads.
+    Epoc ms are stored as float64, exact far beyond any trading date (< 2**53).
+    """
+
+    FIELDS = (
+        "time_ms",
+        "open_bid",
+        "high_bid",
+        "low_bid",
+        "close_bid",
+        "volume_bid",
+        "open_ask",
+        "high_ask",
+        "low_ask",
+        "close_ask",
+        "volume_ask",
+        "tick_volume",
+    )
+    ROW = {name: row for row, name in enumerate(FIELDS)}
+
+    time_ms: np.ndarray
+    open_bid: np.ndarray
+    high_bid: np.ndarray
+    low_bid: np.ndarray
+    close_bid: np.ndarray
+    volume_bid: np.ndarray
+    open_ask: np.ndarray
+    high_ask: np.ndarray
+    low_ask: np.ndarray
+    close_ask: np.ndarray
+    volume_ask: np.ndarray
+    tick_volume: np.ndarray
+
+    def __init__(self, _size: int):
+        self._size = _size
+        self._position = 0  # next slot to write
+        self._newest = 0  # slot of the newest bar (valid if _count > 0)
+        self._count = 0
+        self._add_count = 0  # bars appended since the start (linear index counter)
+        self._version = 0
+        self.values = np.full((len(self.FIELDS), _size), np.nan)
+        self._columns: list[RingColumn] = []
+        self._views: list[Optional[BarView]] = [None] * _size  # per slot, created on first use
+        self._bind_rows()
+
+    def _bind_rows(self):
+        for row, name in enumerate(self.FIELDS):
+            setattr(self, name, self.values[row])
+        for column in self._columns:
+            column._bind()
+
+    @property
+    def is_buffer_valid(self) -> bool:
+        return self._count == self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+    def append(self, record: tuple) -> int:
+        """Write a bar (one value per FIELDS entry) into the next slot; returns the slot"""
+        slot = self._position
+        self.values[:, slot] = record
+        self._newest = slot
+        self._position = (slot + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+        self._add_count += 1
+        self._version += 1
+        for column in self._columns:
+            column._newest = slot
+            column._position = self._position
+            column._count = self._count
+            column._add_count = self._add_count
+            column._version = self._version
+        return slot
+
+    def slot(self, rel_pos: int) -> int:
+        """Physical slot of relative position rel_pos (0 = newest)"""
+        return (self._newest - rel_pos) % self._size
+
+    def resize(self, new_size: int) -> None:
+        """Grow the ring; the bars are block copied oldest first to slot 0, _add_count stays"""
+        if new_size <= self._size:
+            return
+
+        # the bars unrolled are at most two slices (oldest .. physical end, start .. newest),
+        # each copied for all fields at once
+        count = self._count
+        oldest = (self._newest - count + 1) % self._size
+        head = min(count, self._size - oldest)
+        values = np.full((len(self.FIELDS), new_size), np.nan)
+        values[:, :head] = self.values[:, oldest : oldest + head]
+        values[:, head:count] = self.values[:, : count - head]
+        self.values = values
+        self._size = new_size
+        self._position = self._count % new_size
+        self._newest = (self._count - 1) % new_size
+        self._version += 1
+        self._views = [None] * new_size  # the bars moved to other slots
+        self._bind_rows()
+
+    def column(self, name: str) -> RingColumn:
+        """Ringbuffer-like view of one field; "time_ms" gives datetimes (TimeColumn)"""
+        column = TimeColumn(self, self.ROW[name]) if "time_ms" == name else RingColumn(self, self.ROW[name])
+        self._columns.append(column)
+        return column
+
+    def __getitem__(self, rel_pos: int) -> Optional[Bar]:
+        """The bar at relative position rel_pos as a Bar snapshot (bid prices)"""
+        if rel_pos < 0 or rel_pos >= self._count:
+            return None
+        values = self.values
+        slot = (self._newest - rel_pos) % self._size
+        return Bar(
+            open_time=TickDay.from_ms(int(values.item(0, slot))),
+            open=values.item(1, slot),
+            high=values.item(2, slot),
+            low=values.item(3, slot),
+            close=values.item(4, slot),
+            tick_volume=int(values.item(11, slot)),
+        )
+
+    def view(self, rel_pos: int) -> Optional[BarView]:
+        """
+        The bar at relative position rel_pos as a BarView of its slot (no copy); the view of a slot is
+        created once and handed out again, so repeated Bars.Last() calls allocate nothing
+        """
+        if rel_pos < 0 or rel_pos >= self._count:
+            return None
+        slot = (self._newest - rel_pos) % self._size
+        view = self._views[slot]
+        if view is None:
+            view = self._views[slot] = BarView(self, slot)
+        return view
+
+    def last(self) -> Optional[Bar]:
+        return self[0] if self._count else None
+
+    def first(self) -> Optional[Bar]:
+        return self[self._count - 1] if self._count else None
+
+
+class BarView:
+    """
+    Read-only Bar of one BarRing slot with the properties of Bar (cTrader and legacy names).
+    It reads the slot live: the view of the current bar follows its ticks, and once the ring has wrapped
+    around (look_back bars later) the slot and so the view hold a newer bar. Take a Bar snapshot
+    (BarRing[rel_pos]) to keep the values of a bar.
+    """
+
+    __slots__ = ("_ring", "_slot")
+
+    def __init__(self, ring: BarRing, slot: int):
+        self._ring = ring
+        self._slot = slot
+
+    @property
+    def OpenTime(self) -> datetime:
+        return TickDay.from_ms(int(self._ring.values.item(0, self._slot)))
+
+    @property
+    def Open(self) -> float:
+        return self._ring.values.item(1, self._slot)
+
+    @property
+    def High(self) -> float:
+        return self._ring.values.item(2, self._slot)
+
+    @property
+    def Low(self) -> float:
+        return self._ring.values.item(3, self._slot)
+
+    @property
+    def Close(self) -> float:
+        return self._ring.values.item(4, self._slot)
+
+    @property
+    def TickVolume(self) -> int:
+        return int(self._ring.values.item(11, self._slot))
+
+    # Legacy names (Bar's backward compatible attributes); ask names read the ask rows
+    open_time = OpenTime
+    open_bid = Open
+    high_bid = High
+    low_bid = Low
+    close_bid = Close
+
+    @property
+    def volume_bid(self) -> float:
+        return self._ring.values.item(5, self._slot)
+
+    @property
+    def open_ask(self) -> float:
+        return self._ring.values.item(6, self._slot)
+
+    @property
+    def high_ask(self) -> float:
+        return self._ring.values.item(7, self._slot)
+
+    @property
+    def low_ask(self) -> float:
+        return self._ring.values.item(8, self._slot)
+
+    @property
+    def close_ask(self) -> float:
+        return self._ring.values.item(9, self._slot)
+
+    @property
+    def volume_ask(self) -> float:
+        return self._ring.values.item(10, self._slot)
+
+
+class RingColumn:
+    """
+    One field of a BarRing with the interface DataSeries uses of Ringbuffer[float]
+    (relative [] get/set, _size, _count, _position, _add_count); values are appended through the ring only.
+    The counters are copies kept up to date by the ring (BarRing.column registers the view).
+    """
+
+    _size: int
+    _count: int
+    _position: int
+    _newest: int
+    _add_count: int
+    _version: int
+    _values: np.ndarray
+
+    def __init__(self, ring: BarRing, row: int):
+        self._ring = ring
+        self._row = row
+        self._bind()
+
+    def _bind(self):
+        ring = self._ring
+        self._size = ring._size
+        self._count = ring._count
+        self._position = ring._position
+        self._newest = ring._newest
+        self._add_count = ring._add_count
+        self._version = ring._version
+        self._values = ring.values[self._row]
+        self._read_only = self._values.view()
+        self._read_only.flags.writeable = False
+
+    @property
+    def is_buffer_valid(self) -> bool:
+        return self._count == self._size
+
+    def __getitem__(self, rel_pos: int) -> Any:
+        if self._count < 1:
+            raise IndexError("Must add a ring _buffer slot after initialization")
+        if rel_pos < 0 or rel_pos >= self._size:
+            raise IndexError("Index out of range")
+        return self._values.item((self._newest - rel_pos) % self._size)
+
+    def __setitem__(self, rel_pos: int, value: Any):
+        if self._count < 1:
+            raise IndexError("Must add a ring _buffer slot after initialization")
+        self._values[(self._newest - rel_pos) % self._size] = value
+
+    def window(self, length: int) -> np.ndarray:
+        """
+        The newest min(length, _count) values, oldest first. A read-only view of the row (no copy)
+        unless the window wraps around the end of the ring, then a copy.
+        """
+        length = min(length, self._count)
+        start = self._newest + 1 - length
+        if start >= 0:
+            return self._read_only[start : self._newest + 1]
+        return np.concatenate((self._values[start:], self._values[: self._newest + 1]))
+
+    def __iter__(self) -> Iterator[Any]:
+        for rel_pos in range(self._count):
+            yield self[rel_pos]
+
+    def add(self, item: Any):
+        raise TypeError("Bar columns are appended through BarRing.append (Bars.append)")
+
+    def exchange(self, item: Any):
+        if self._count == 0:
+            self.add(item)
+        self[0] = item
+
+    def last(self) -> Any:
+        return self[0] if self._count else None
+
+    def first(self) -> Any:
+        return self[self._count - 1] if self._count else None
+
+    def lowest(self) -> Any:
+        return min(self) if self._count else None
+
+    def highest(self) -> Any:
+        return max(self) if self._count else None
+
+
+class TimeColumn(RingColumn):
+    """The time_ms field of a BarRing as datetimes (UTC), like the former Ringbuffer[datetime] (window() in ms)"""
+
+    def __getitem__(self, rel_pos: int) -> datetime:
+        return TickDay.from_ms(int(RingColumn.__getitem__(self, rel_pos)))
+
+    def __setitem__(self, rel_pos: int, value: datetime):
+        RingColumn.__setitem__(self, rel_pos, TickDay.to_ms(value))
+
+
+# end of file
@@ -6,8 +6,10 @@ from Api.TimeSeries import TimeSeries
 from Api.DataSeries import DataSeries
 from Api.KitaApiEnums import *
 from Api.Bar import Bar
-from Api.ring_buffer import Ringbuffer
+from Api.BarRing import BarRing
 from Api.BarOpenedEventArgs import BarOpenedEventArgs
+from Api.SessionBoundaries import SessionBoundaries
+from Api.TickDay import TickDay
 
 
 class Bars:
@@ -38,6 +40,11 @@ class Bars:
     count: int = 0  # number of bars appended so far; if count == size, the buffer is completely filled
     _symbol: Optional[Any] = None  # Reference to parent Symbol object (for accessing digits, etc.)
     _bar_opened_handlers: List[Callable[[BarOpenedEventArgs], None]] = []  # Event handlers for BarOpened event
+    _bar_start_ms: int = 0  # current bar [start, next start) in epoc ms
+    _next_bar_start_ms: int = 0
+    bar_sequence: int = 0  # number of bars opened so far; counts on when the ring buffer is full
+    dirty_bit: int = 0  # bit of these bars in Symbol.new_bar_mask
+    _bar_closed_callbacks: List[Callable[[Bars], None]] = []  # internal: called when a bar closes
 
     @property
     def size(self) -> int:  # Gets the number of bars.#
@@ -57,6 +64,7 @@ class Bars:
         self.read_index = -1  # gets a +1 at symbol_on_tick before accessing the data
         self.count = 0  # Initialize count to 0 - bars will be built incrementally from ticks
         self._bar_opened_handlers = []  # Initialize event handlers list
+        self._bar_closed_callbacks = []
         self._bar_opened_event = None  # Cached BarOpenedEvent instance
         
         # Calculate maximum period requirement for ring buffer size
@@ -73,7 +81,8 @@ class Bars:
             # But usually indicators are created in on_init/on_start.
             if size == 0:
                 size = 1000 # Default fallback if nothing specified yet
-            self._bar_buffer: Ringbuffer[Bar] = Ringbuffer[Bar](size)
+            # All fields of all bars in one struct-of-arrays ring; the DataSeries below are views of its rows
+            self._bar_buffer: BarRing = BarRing(size)
         else:
             # For tick data, look_back doesn't apply, no storage needed
             # Tick data is not stored - ticks are processed one at a time from stream
@@ -83,23 +92,24 @@ class Bars:
             self._bar_buffer = None  # No bar buffer for tick data
 
         # Create DataSeries views for API compatibility (indicators expect DataSeries)
-        # For bar data: extract values from Ringbuffer[Bar] - uses ringbuffers
+        # For bar data: views of the BarRing rows (one shared write position)
         # For tick data: use regular Python lists (NOT ringbuffers) for temporary day-by-day loading
         # Note: The main rate_data Bars object (used during backtest) does not store ticks,
         # but temporary day objects (from get_day_at_utc) need to store ticks temporarily in lists
         if timeframe_seconds > 0:
-            # Bar data: full OHLCV DataSeries (uses ringbuffers)
-            self.open_times = TimeSeries(self, size)
-            self.open_bids = DataSeries(self, size)
-            self.open_asks = DataSeries(self, size)
-            self.volume_bids = DataSeries(self, size)
-            self.volume_asks = DataSeries(self, size)
-            self.high_bids = DataSeries(self, size)
-            self.low_bids = DataSeries(self, size)
-            self.close_bids = DataSeries(self, size)
-            self.high_asks = DataSeries(self, size)
-            self.low_asks = DataSeries(self, size)
-            self.close_asks = DataSeries(self, size)
+            # Bar data: full OHLCV DataSeries as column views of the BarRing (no own storage)
+            ring = self._bar_buffer
+            self.open_times = TimeSeries(self, size, data=ring.column("time_ms"))
+            self.open_bids = DataSeries(self, size, data=ring.column("open_bid"))
+            self.open_asks = DataSeries(self, size, data=ring.column("open_ask"))
+            self.volume_bids = DataSeries(self, size, data=ring.column("volume_bid"))
+            self.volume_asks = DataSeries(self, size, data=ring.column("volume_ask"))
+            self.high_bids = DataSeries(self, size, data=ring.column("high_bid"))
+            self.low_bids = DataSeries(self, size, data=ring.column("low_bid"))
+            self.close_bids = DataSeries(self, size, data=ring.column("close_bid"))
+            self.high_asks = DataSeries(self, size, data=ring.column("high_ask"))
+            self.low_asks = DataSeries(self, size, data=ring.column("low_ask"))
+            self.close_asks = DataSeries(self, size, data=ring.column("close_ask"))
         else:
             # Tick data: use regular Python lists (NOT ringbuffers) for temporary storage
             # High/low/close don't exist for tick data
@@ -129,38 +139,44 @@ class Bars:
         """
         Update the maximum period requirement and recalculate look_back and ring buffer size.
         New Architecture: Ring buffer size = max(period) + 1 bar.
-        Resizes the buffers if they are already initialized.
+        Resizes the buffers if they are already initialized and smaller (see reserve()).
         """
         if period > self._max_period_requirement:
             self._max_period_requirement = period
             new_look_back = self._max_period_requirement + 1
-            
+
             if self.timeframe_seconds > 0 and new_look_back > self.look_back:
-                old_look_back = self.look_back
                 self.look_back = new_look_back
-                
-                # Resize existing buffer if it exists
-                if hasattr(self, '_bar_buffer') and self._bar_buffer:
-                    old_buffer = self._bar_buffer
-                    self._bar_buffer = Ringbuffer[Bar](self.look_back)
-                    # Copy data from old buffer (from oldest to newest)
-                    for i in range(old_buffer._count - 1, -1, -1):
-                        self._bar_buffer.add(old_buffer[i])
-                    
-                    # Resize all DataSeries/TimeSeries (references are preserved!)
-                    self.open_times.resize(self.look_back)
-                    self.open_bids.resize(self.look_back)
-                    self.open_asks.resize(self.look_back)
-                    self.volume_bids.resize(self.look_back)
-                    self.volume_asks.resize(self.look_back)
-                    self.high_bids.resize(self.look_back)
-                    self.low_bids.resize(self.look_back)
-                    self.close_bids.resize(self.look_back)
-                    self.high_asks.resize(self.look_back)
-                    self.low_asks.resize(self.look_back)
-                    self.close_asks.resize(self.look_back)
-                    
-                    self.count = self._bar_buffer._count
+                if self._bar_buffer is not None and self.look_back > self._bar_buffer._size:
+                    self._resize(self.look_back)
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Declare the ring buffer capacity (bars) up front, e.g. from the indicators a robot will create
+        (Indicators.reserve): period requirements up to capacity - 1 then never resize.
+        """
+        if self._bar_buffer is not None and capacity > self._bar_buffer._size:
+            self._resize(capacity)
+
+    def _resize(self, size: int) -> None:
+        # one block copy of the BarRing (keeps _add_count), the series are views of it
+        self._bar_buffer.resize(size)
+        for series in (
+            self.open_times,
+            self.open_bids,
+            self.open_asks,
+            self.volume_bids,
+            self.volume_asks,
+            self.high_bids,
+            self.low_bids,
+            self.close_bids,
+            self.high_asks,
+            self.low_asks,
+            self.close_asks,
+        ):
+            series.resize(size)
+        self.count = self._bar_buffer._count
+
     def append(
         self,
         time: datetime,
@@ -175,19 +191,6 @@ class Bars:
         close_ask: float,
         volume_ask: float,
     ) -> None:
-        # Create a complete Bar object (OHLCV as one element)
-        import math
-        # Handle NaN values in volume
-        vol = volume_bid if not math.isnan(volume_bid) else 0.0
-        bar = Bar(
-            open_time=time,
-            open=open_bid,  # Use bid for main values
-            high=high_bid,
-            low=low_bid,
-            close=close_bid,
-            tick_volume=int(vol)
-        )
-        
         # Tick data (timeframe_seconds == 0): Only store temporarily for day-by-day loading
         # TICKS NEVER GO INTO RINGBUFFERS - use regular Python lists
         # The main rate_data Bars object (used during backtest) does not store ticks
@@ -202,39 +205,57 @@ class Bars:
             self.volume_asks_list.append(volume_ask)
             self.count = len(self.open_times_list)
             return
-        
-        # Bar data: use Ringbuffer[Bar] - each bar (OHLCV) is one element
-        self._bar_buffer.add(bar)  # Ringbuffer.add() - overwrites oldest when full
-        self.count = self._bar_buffer._count
-        
-        # Calculate write position for DataSeries (where the newest bar is stored)
-        size = self.size
-        if self.count < size:
-            # Buffer not full yet - newest bar is at count - 1
-            write_pos = self.count - 1
-        else:
-            # Buffer full - calculate write position from Ringbuffer
-            # Ringbuffer._position points to the NEXT write position
-            # So the newest bar is at (_position - 1) % size
-            write_pos = (self._bar_buffer._position - 1) % size
-        
-        # read_index must match write_pos so that last() can correctly access the newest bar
-        self.read_index = write_pos if self.count > 0 else -1
-        
-        # Also update DataSeries views for API compatibility
-        # Extract values from the Ringbuffer[Bar] and update DataSeries
-        if self.count > 0:
-            self.open_times.append_ring(time, write_pos)
-            self.open_bids.append_ring(open_bid, write_pos)
-            self.open_asks.append_ring(open_ask, write_pos)
-            self.volume_bids.append_ring(volume_bid, write_pos)
-            self.volume_asks.append_ring(volume_ask, write_pos)
-            self.high_bids.append_ring(high_bid, write_pos)
-            self.low_bids.append_ring(low_bid, write_pos)
-            self.close_bids.append_ring(close_bid, write_pos)
-            self.high_asks.append_ring(high_ask, write_pos)
-            self.low_asks.append_ring(low_ask, write_pos)
-            self.close_asks.append_ring(close_ask, write_pos)
+
+        self._append_ms(
+            TickDay.to_ms(time),
+            open_bid,
+            high_bid,
+            low_bid,
+            close_bid,
+            volume_bid,
+            open_ask,
+            high_ask,
+            low_ask,
+            close_ask,
+            volume_ask,
+        )
+
+    def _append_ms(
+        self,
+        time_ms: int,
+        open_bid: float,
+        high_bid: float,
+        low_bid: float,
+        close_bid: float,
+        volume_bid: float,
+        open_ask: float,
+        high_ask: float,
+        low_ask: float,
+        close_ask: float,
+        volume_ask: float,
+    ) -> None:
+        """Append a bar (open time in epoc ms) to the BarRing: one write of all fields, one position"""
+        # TickVolume starts with the bid volume (NaN counts as 0)
+        tick_volume = 0 if volume_bid != volume_bid else int(volume_bid)
+        ring = self._bar_buffer
+        # read_index is the slot of the newest bar so that last() can correctly access it
+        self.read_index = ring.append(
+            (
+                time_ms,
+                open_bid,
+                high_bid,
+                low_bid,
+                close_bid,
+                volume_bid,
+                open_ask,
+                high_ask,
+                low_ask,
+                close_ask,
+                volume_ask,
+                tick_volume,
+            )
+        )
+        self.count = ring._count
 
     def add(
         self,
@@ -257,13 +278,16 @@ class Bars:
         if self.count < self.open_times._size:  # type: ignore
             self.count += 1
 
-    def bars_on_tick(self, time: datetime, bid: float = None, ask: float = None, tick_volume: int = 1) -> None:
+    def bars_on_tick(self, time_ms: int, bid: float = None, ask: float = None, tick_volume: int = 1) -> None:
         """
         Build bars incrementally from ticks.
         Workflow: Internal Tick -> call bars_on_tick to evolve bars -> indicators -> user's OnTick
         
         This builds bars from ticks - indicator calculation happens separately in symbol_on_tick().
         Bars are NEVER preloaded - they are always built incrementally from ticks.
+
+        time_ms is the tick time in epoc ms (UTC); while it is before the next bar start only an integer
+        compare is done, datetime objects are created for new bars only.
         """
         self.is_new_bar = False
 
@@ -275,136 +299,83 @@ class Bars:
         if self.timeframe_seconds == 0:
             # Tick data - no bar building needed
             return
-        
-        # Calculate bar start time for this timeframe
-        from datetime import timedelta
-        import pytz
-        
-        # Calculate bar start time (aligned to timeframe)
-        bar_start_time = self._calculate_bar_start_time(time, self.timeframe_seconds)
-        
-        # Check if we need to start a new bar
-        if self.count == 0:
-            # First bar - start new bar
-            self._start_new_bar(bar_start_time, bid, ask, tick_volume)
-            self.is_new_bar = True
+
+        # Current bar is still active - update current bar (evolve it)
+        if self.count > 0 and time_ms < self._next_bar_start_ms:
+            self._update_current_bar(bid, ask, tick_volume)
+            return
+
+        # Calculate bar start time for this timeframe (aligned to timeframe)
+        bar_start_ms, next_bar_start_ms = self._bar_range(time_ms, self.timeframe_seconds)
+        if self.count > 0:
+            if bar_start_ms <= self._bar_start_ms:
+                self._update_current_bar(bid, ask, tick_volume)
+                return
+
+            # CRITICAL: Check if this new bar would be at or after BacktestEndUtc BEFORE starting it
+            # This matches C# behavior - stop before creating a bar that is >= BacktestEndUtc
+            if self._symbol is not None and bar_start_ms >= self._symbol._backtest_end_ms:
+                # Set flag to signal stop and return early
+                self._symbol._should_stop_processing = True
+                return  # Don't start this bar
+
+        is_first_bar = 0 == self.count
+        self._bar_start_ms, self._next_bar_start_ms = bar_start_ms, next_bar_start_ms
+        # New bar started - the previous bar is now closed
+        # Start new bar (read_index will be updated to point to the new bar)
+        self._start_new_bar_ms(bar_start_ms, bid, ask, tick_volume)
+        self.is_new_bar = True
+        self.bar_sequence += 1
+        if is_first_bar:
             self.read_index = self.count - 1  # Point to the new bar
             # Note: Don't fire BarOpened event for the first bar (no previous bar to close)
-        else:
-            # Check if current bar is still active
-            # Get the current bar's start time from DataSeries
-            if self.count > 0:
-                # Use DataSeries to get current bar time (read_index points to current bar)
-                current_bar_time = self.open_times.last(0) if self.read_index >= 0 else None
-            else:
-                current_bar_time = None
-            
-            if current_bar_time is None or bar_start_time > current_bar_time:
-                # CRITICAL: Check if this new bar would be at or after BacktestEndUtc BEFORE starting it
-                # This matches C# behavior - stop before creating a bar that is >= BacktestEndUtc
-                if self._symbol and hasattr(self._symbol, 'api') and hasattr(self._symbol.api, 'robot'):
-                    if hasattr(self._symbol.api.robot, '_BacktestEndUtc'):
-                        backtest_end_utc = self._symbol.api.robot._BacktestEndUtc
-                        # Ensure both are timezone-aware for proper comparison
-                        if backtest_end_utc.tzinfo is None:
-                            backtest_end_utc = backtest_end_utc.replace(tzinfo=pytz.UTC)
-                        if bar_start_time.tzinfo is None:
-                            bar_start_time = bar_start_time.replace(tzinfo=pytz.UTC)
-                        # If bar_start_time >= BacktestEndUtc, don't start this bar
-                        if bar_start_time >= backtest_end_utc:
-                            # Set flag to signal stop and return early
-                            self._symbol._should_stop_processing = True
-                            return  # Don't start this bar
-                
-                # New bar started - the previous bar is now closed
-                # Start new bar (read_index will be updated to point to the new bar)
-                self._start_new_bar(bar_start_time, bid, ask, tick_volume)
-                self.is_new_bar = True
-                # read_index is updated in _start_new_bar via append()
-                # For bar data, read_index points to newest bar (Ringbuffer[0] = newest)
-                # This is set in append() for bar data
-                
-                # Fire BarOpened event (matching cTrader API behavior)
-                # Event is fired when a new bar opens (previous bar is now closed)
-                # BUT only after BacktestStartUtc - warmup period is for internal processing only
-                # OnTick, OnBar, and BarOpened events should only fire after BacktestStart
-                # Also check if the new bar's open time (when previous bar closes) is < BacktestEndUtc
-                # This prevents logging bars that close at or after the backtest end time
-                should_fire = False
-                if self._symbol and hasattr(self._symbol, 'is_warm_up'):
-                    # Use is_warm_up flag (set in symbol_on_tick based on time < BacktestStartUtc)
-                    should_fire = not self._symbol.is_warm_up
-                elif self._symbol and hasattr(self._symbol, 'api') and hasattr(self._symbol.api, 'robot'):
-                    # Fallback: check time directly against BacktestStartUtc
-                    if hasattr(self._symbol.api.robot, '_BacktestStartUtc'):
-                        should_fire = time >= self._symbol.api.robot._BacktestStartUtc
-                
-                # Additional check: don't fire if the new bar's open time (when previous bar closes) is >= BacktestEndUtc
-                # This ensures bars that close at or after the backtest end time are not logged
-                if should_fire and self._symbol and hasattr(self._symbol, 'api') and hasattr(self._symbol.api, 'robot'):
-                    if hasattr(self._symbol.api.robot, '_BacktestEndUtc'):
-                        # bar_start_time is when the new bar opens, which is when the previous bar closes
-                        # If bar_start_time >= BacktestEndUtc, the previous bar closed at or after the end time
-                        if bar_start_time >= self._symbol.api.robot._BacktestEndUtc:
-                            should_fire = False
-                
-                if should_fire:
-                    self._fire_bar_opened_event()
-            else:
-                # Update current bar (evolve it) - read_index points to the current forming bar
-                self._update_current_bar(bid, ask, tick_volume)
-        
-        return
-    
+            return
+
+        # read_index is updated in _start_new_bar via append()
+        # For bar data, read_index points to newest bar (BarRing relative 0 = newest)
+
+        # The previous bar is closed: internal subscribers are told in warm-up too
+        for callback in self._bar_closed_callbacks:
+            callback(self)
+
+        # Fire BarOpened event (matching cTrader API behavior)
+        # Event is fired when a new bar opens (previous bar is now closed)
+        # BUT only after BacktestStartUtc - warmup period is for internal processing only
+        # OnTick, OnBar, and BarOpened events should only fire after BacktestStart
+        # (bars opening at or after BacktestEndUtc have been stopped above)
+        if self._symbol is not None and not self._symbol.is_warm_up:
+            self._fire_bar_opened_event()
+
+    def _bar_range(self, time_ms: int, timeframe_seconds: int) -> tuple[int, int]:
+        """(start, next start) in epoc ms of the bar containing time_ms"""
+        # H4 is anchored to NY 17:00 ET (21:00 UTC during EDT, 22:00 UTC during EST), D1 to 00:00 UTC;
+        # their boundaries come precomputed from SessionBoundaries (bisection only when a bar is crossed)
+        if SessionBoundaries.is_anchored(timeframe_seconds):
+            return SessionBoundaries.bar_range(timeframe_seconds, time_ms)
+
+        hour_ms = time_ms - time_ms % 3_600_000
+        if timeframe_seconds >= 3600:  # Hourly or larger
+            # Other hourly timeframes: align to hour
+            return hour_ms, hour_ms + 3_600_000
+
+        # Minute timeframes: align to minute boundaries within the hour
+        step_ms = timeframe_seconds * 1000
+        bar_start_ms = hour_ms + (time_ms - hour_ms) // step_ms * step_ms
+        return bar_start_ms, min(bar_start_ms + step_ms, hour_ms + 3_600_000)
+
     def _calculate_bar_start_time(self, time: datetime, timeframe_seconds: int) -> datetime:
         """Calculate the bar start time for a given tick time and timeframe"""
-        from datetime import timedelta
-        import pytz
-        
-        # For H4 (14400 seconds), align to NY 17:00 ET (21:00 UTC during EDT, 22:00 UTC during EST)
-        # For H1 (3600 seconds), align to hour boundaries
-        # For M1 (60 seconds), align to minute boundaries
-        
-        if timeframe_seconds >= 86400:  # Daily or larger
-            # Align to day start (00:00:00 UTC)
-            return time.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif timeframe_seconds >= 3600:  # Hourly or larger
-            hours = timeframe_seconds // 3600
-            if hours == 4:
-                # H4: align to NY 17:00 ET (21:00 UTC during EDT, 22:00 UTC during EST)
-                # Use the same logic as _resample() in Symbol.py
-                ny_tz = pytz.timezone('America/New_York')
-                ny_dt = time.astimezone(ny_tz)
-                # Anchor to 17:00 NY of the same day
-                anchor_ny = ny_dt.replace(hour=17, minute=0, second=0, microsecond=0)
-                # Convert back to UTC
-                anchor_utc = anchor_ny.astimezone(pytz.UTC)
-                
-                # Calculate hours since anchor
-                hours_since_anchor = (time - anchor_utc).total_seconds() / 3600.0
-                if hours_since_anchor < 0:
-                    # Before anchor today, use previous day's anchor
-                    anchor_utc = anchor_utc - timedelta(days=1)
-                    hours_since_anchor = (time - anchor_utc).total_seconds() / 3600.0
-                
-                # Round down to nearest 4-hour boundary
-                bar_number = int(hours_since_anchor // 4)
-                bar_start_utc = anchor_utc + timedelta(hours=bar_number * 4)
-                return bar_start_utc.replace(second=0, microsecond=0)
-            else:
-                # Other hourly timeframes: align to hour
-                return time.replace(minute=0, second=0, microsecond=0)
-        else:
-            # Minute timeframes: align to minute boundaries
-            minutes = timeframe_seconds // 60
-            minute = (time.minute // minutes) * minutes
-            return time.replace(minute=minute, second=0, microsecond=0)
+        return TickDay.from_ms(self._bar_range(TickDay.to_ms(time), timeframe_seconds)[0])
     
     def _start_new_bar(self, bar_start_time: datetime, bid: float, ask: float, tick_volume: int = 1) -> None:
         """Start a new bar with the given time and prices"""
-        # append() will update read_index automatically
-        self.append(
-            bar_start_time,
+        self._start_new_bar_ms(TickDay.to_ms(bar_start_time), bid, ask, tick_volume)
+
+    def _start_new_bar_ms(self, bar_start_ms: int, bid: float, ask: float, tick_volume: int = 1) -> None:
+        """Start a new bar with the given open time in epoc ms and prices"""
+        # _append_ms() will update read_index automatically
+        self._append_ms(
+            bar_start_ms,
             bid,  # open_bid
             bid,  # high_bid (initial)
             bid,  # low_bid (initial)
@@ -416,44 +387,67 @@ class Bars:
             ask,  # close_ask (initial)
             float(tick_volume),  # volume_ask (initial)
         )
-    
+
     def _update_current_bar(self, bid: float, ask: float, tick_volume: int = 1) -> None:
         """Update the current bar with new tick prices"""
         # Only works for bar data (timeframe_seconds > 0)
         # Tick data is not stored, so this is never called for tick data
         if self.read_index < 0 or self.read_index >= self.count:
             return
-        
-        if self._bar_buffer is None:
+
+        ring = self._bar_buffer
+        if ring is None:
             return  # No bar buffer (tick data or not initialized)
-        
-        # Update the current bar in Ringbuffer[Bar]
-        if self.count > 0:
-            current_bar = self._bar_buffer.last()  # Get newest bar (Ringbuffer[0])
-            if current_bar:
-                # Update bar values in Ringbuffer
-                if bid > current_bar.High:
-                    current_bar.High = bid
-                if bid < current_bar.Low:
-                    current_bar.Low = bid
-                current_bar.Close = bid
-                current_bar.TickVolume += tick_volume
-                
-                # Update DataSeries for bar data
-                # Ringbuffer uses relative indexing: 0 = newest (current) bar
-                if bid > self.high_bids.data[0]:
-                    self.high_bids.data[0] = bid
-                if ask > self.high_asks.data[0]:
-                    self.high_asks.data[0] = ask
-                if bid < self.low_bids.data[0]:
-                    self.low_bids.data[0] = bid
-                if ask < self.low_asks.data[0]:
-                    self.low_asks.data[0] = ask
-                self.close_bids.data[0] = bid
-                self.close_asks.data[0] = ask
-                self.volume_bids.data[0] += 1.0
-                self.volume_asks.data[0] += 1.0
-    
+
+        # The current (newest) bar is one slot of the BarRing rows
+        slot = ring._newest
+        if bid > ring.high_bid[slot]:
+            ring.high_bid[slot] = bid
+        if ask > ring.high_ask[slot]:
+            ring.high_ask[slot] = ask
+        if bid < ring.low_bid[slot]:
+            ring.low_bid[slot] = bid
+        if ask < ring.low_ask[slot]:
+            ring.low_ask[slot] = ask
+        ring.close_bid[slot] = bid
+        ring.close_ask[slot] = ask
+        ring.tick_volume[slot] += tick_volume
+        ring.volume_bid[slot] += 1.0
+        ring.volume_ask[slot] += 1.0
+
+    def add_repeated_ticks(self, tick_count: int, tick_volume: int) -> None:
+        """
+        Account tick_count ticks repeating the current bar's close (bid and ask unchanged) at once,
+        as _update_current_bar would do tick by tick: only the volumes grow.
+        """
+        ring = self._bar_buffer
+        if ring is None or self.read_index < 0 or self.read_index >= self.count:
+            return
+
+        slot = ring._newest
+        ring.tick_volume[slot] += tick_volume
+        ring.volume_bid[slot] += tick_count
+        ring.volume_ask[slot] += tick_count
+
+    def merge_bar_rest(
+        self, high_bid: float, low_bid: float, close_bid: float, high_ask: float, low_ask: float, close_ask: float
+    ) -> None:
+        """
+        Bar replay: widen the current bar by high/low/close of a streamed bar whose open went through
+        bars_on_tick() (Symbol streams bars at their open and merges the rest when the next bar opens)
+        """
+        ring = self._bar_buffer
+        if self.timeframe_seconds == 0 or ring is None or self.count == 0:
+            return
+
+        slot = ring._newest
+        ring.high_bid[slot] = max(ring.high_bid[slot], high_bid)
+        ring.high_ask[slot] = max(ring.high_ask[slot], high_ask)
+        ring.low_bid[slot] = min(ring.low_bid[slot], low_bid)
+        ring.low_ask[slot] = min(ring.low_ask[slot], low_ask)
+        ring.close_bid[slot] = close_bid
+        ring.close_ask[slot] = close_ask
+
     def high_changed(self, current_price: float) -> bool:
         """Check if current price creates a new high (higher than bar's current high)"""
         if self.read_index < 0 or self.read_index >= self.count:
@@ -509,6 +503,14 @@ class Bars:
         """Gets the Tick volumes data (cTrader API: Bars.TickVolumes)"""
         return self.volume_bids
     
+    def subscribe_bar_closed(self, callback: Callable[[Bars], None]) -> None:
+        """
+        Call callback(bars) each time a bar closes, i.e. the next bar opens (bar_sequence has grown).
+        Unlike BarOpened this is called during warm-up too; subscribing the same callback again is a no-op.
+        """
+        if callback not in self._bar_closed_callbacks:
+            self._bar_closed_callbacks.append(callback)
+
     def _fire_bar_opened_event(self):
         """Fire BarOpened event to all subscribed handlers"""
         if self._bar_opened_handlers and len(self._bar_opened_handlers) > 0:
@@ -565,7 +567,9 @@ class Bars:
             index: Number of bars ago (0 = current bar, 1 = previous closed bar, etc.)
         
         Returns:
-            Bar object with OpenTime, Open, High, Low, Close, TickVolume properties
+            Bar object with OpenTime, Open, High, Low, Close, TickVolume properties.
+            For bar data this is the cached, read-only BarView of the bar's ring slot (no allocation per call);
+            it reads the bar live, so keep values, not the view, if they are needed after look_back more bars.
         
         Example:
             prevBar = bars.Last(1)  # Previous closed bar
@@ -576,19 +580,11 @@ class Bars:
             # Return empty bar if index is out of range
             return Bar()
         
-        # For bar data, try to read from Ringbuffer[Bar] if available
+        # For bar data, the view of the bar's BarRing slot ([0] = newest bar, [1] = second newest, etc.)
         if self._bar_buffer is not None and self.count > 0:
-            # Ringbuffer[0] = newest bar, Ringbuffer[1] = second newest, etc.
-            bar = self._bar_buffer[index] if index < self.count else None
+            bar = self._bar_buffer.view(index)
             if bar:
-                return Bar(
-                    open_time=bar.OpenTime,
-                    open=bar.Open,
-                    high=bar.High,
-                    low=bar.Low,
-                    close=bar.Close,
-                    tick_volume=bar.TickVolume
-                )
+                return bar  # type: ignore
         
         # For tick data, use lists (NOT ringbuffers)
         if self.timeframe_seconds == 0:
@@ -0,0 +1,246 @@
+from __future__ import annotations
+from typing import Callable, Optional
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pytz import UTC
+from Api.TickDay import TickDay
+
+
+class DataCatalog:
+    """
+    Manifest of the day files in one provider/symbol folder (file names start with YYYYMMDD).
+    Kept as SQLite next to the folder (<folder>_catalog.sqlite) so it is updated per day and
+    queried in O(log n) through the primary key, without listing or opening the day files.
+
+    Each day records file size/mtime and, once the day has been written or decoded, its tick count,
+    first/last timestamp (epoc ms), last bid/ask and a checksum (crc32 of the file payload);
+    get_summary() only returns it while the file's size and mtime are still the recorded ones.
+    The folder's mtime is remembered at each sync; when files were added or removed since, the next
+    sync lists the folder once (only new names are stat'ed). Files found by sync have no checksum until
+    they are decoded or checked by verify().
+    """
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS days (
+            day INTEGER PRIMARY KEY,  -- YYYYMMDD
+            file_name TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            file_mtime_ns INTEGER NOT NULL,
+            tick_count INTEGER,
+            first_ms INTEGER,
+            last_ms INTEGER,
+            last_bid REAL,
+            last_ask REAL,
+            checksum TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+    """
+
+    def __init__(self, folder: str, file_suffix: str):
+        self.folder = os.path.normpath(folder)
+        self.file_suffix = file_suffix  # e.g. ".zticks" or "_quote.zip"
+        self.path = self.folder + "_catalog.sqlite"
+        os.makedirs(self.folder, exist_ok=True)
+        self._lock = threading.Lock()  # day loaders may run on a prefetch thread
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.executescript(self._schema)
+        self.sync()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # Queries
+    # region
+    def has_day(self, day: datetime) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM days WHERE day = ?", (self._key(day),)).fetchone()
+        return row is not None
+
+    def first_day(self) -> Optional[datetime]:
+        with self._lock:
+            row = self._db.execute("SELECT MIN(day) FROM days").fetchone()
+        return None if row[0] is None else self._day(row[0])
+
+    def last_day(self) -> Optional[datetime]:
+        with self._lock:
+            row = self._db.execute("SELECT MAX(day) FROM days").fetchone()
+        return None if row[0] is None else self._day(row[0])
+
+    def days(self, start: datetime, end: datetime) -> list[datetime]:
+        """Available days in [start, end)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day FROM days WHERE day >= ? AND day < ? ORDER BY day", (self._key(start), self._key(end))
+            ).fetchall()
+        return [self._day(row[0]) for row in rows]
+
+    def missing_days(self, start: datetime, end: datetime) -> list[datetime]:
+        """Days in [start, end) without a file"""
+        available = set(self.days(start, end))
+        missing = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < end:
+            if day.replace(tzinfo=UTC) not in available:
+                missing.append(day)
+            day += timedelta(days=1)
+        return missing
+
+    def get_entry(self, day: datetime) -> Optional[dict]:
+        with self._lock:
+            cursor = self._db.execute("SELECT * FROM days WHERE day = ?", (self._key(day),))
+            return self._to_entry(cursor)
+
+    def get_summary(self, day: datetime) -> Optional[dict]:
+        """
+        Entry of day if it has a summary of the file as it is now (size and mtime as recorded, one stat);
+        None if the day is not summarized yet or its file was replaced or removed since.
+        """
+        entry = self.get_entry(day)
+        if entry is None or entry["tick_count"] is None:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.folder, entry["file_name"]))
+        except FileNotFoundError:
+            return None
+        if stat.st_size != entry["file_size"] or stat.st_mtime_ns != entry["file_mtime_ns"]:
+            return None
+        return entry
+
+    def previous_entry(self, day: datetime) -> Optional[dict]:
+        """Entry of the latest available day before `day`, days known to have no ticks are skipped"""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT * FROM days WHERE day < ? AND (tick_count IS NULL OR tick_count > 0) "
+                "ORDER BY day DESC LIMIT 1",
+                (self._key(day),),
+            )
+            return self._to_entry(cursor)
+
+    # endregion
+
+    # Updates
+    # region
+    def update_day(self, day: datetime, tick_day: TickDay, checksum: str):
+        """Record a day file that has just been written or decoded"""
+        file_name, size, mtime_ns = self._stat_day_file(day)
+        if 0 == tick_day.count:
+            summary = (0, None, None, None, None)
+        else:
+            summary = (
+                tick_day.count,
+                tick_day.times.item(0),
+                tick_day.times.item(-1),
+                tick_day.bids.item(-1),
+                tick_day.asks.item(-1),
+            )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(day), file_name, size, mtime_ns) + summary + (checksum,),
+            )
+
+    def remove_day(self, day: datetime):
+        with self._lock:
+            self._db.execute("DELETE FROM days WHERE day = ?", (self._key(day),))
+
+    def sync(self):
+        """List the folder again if its mtime differs from the one recorded at the last sync"""
+        with self._lock:
+            folder_mtime_ns = os.stat(self.folder).st_mtime_ns
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'folder_mtime_ns'").fetchone()
+            if row is not None and row[0] == folder_mtime_ns:
+                return
+
+            known = {row[0] for row in self._db.execute("SELECT file_name FROM days")}
+            present = set()
+            self._db.execute("BEGIN")
+            for entry in os.scandir(self.folder):
+                if not entry.name.endswith(self.file_suffix) or not entry.name[:8].isdigit():
+                    continue
+                present.add(entry.name)
+                if entry.name not in known:
+                    # new file: summary is filled in when the day is decoded
+                    stat = entry.stat()
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO days (day, file_name, file_size, file_mtime_ns) VALUES (?, ?, ?, ?)",
+                        (int(entry.name[:8]), entry.name, stat.st_size, stat.st_mtime_ns),
+                    )
+            for name in known - present:
+                self._db.execute("DELETE FROM days WHERE file_name = ?", (name,))
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('folder_mtime_ns', ?)", (folder_mtime_ns,))
+            self._db.execute("COMMIT")
+
+    def verify(
+        self, start: datetime, end: datetime, check: Callable[[str], str], max_workers: int = 8
+    ) -> list[datetime]:
+        """
+        Integrity check of the day files in [start, end) which have no checksum yet, e.g. files left
+        behind by an interrupted writer. check(path) returns the checksum of an intact file and raises
+        for a broken one; it runs on a thread pool (zlib releases the GIL while decompressing).
+        Intact days keep the checksum, broken files are renamed to *.corrupt and removed from the catalog
+        so they are fetched again. Returns the broken days.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT day, file_name FROM days WHERE day >= ? AND day < ? AND checksum IS NULL",
+                (self._key(start), self._key(end)),
+            ).fetchall()
+        if not rows:
+            return []
+
+        def run_check(file_name: str) -> Optional[str]:
+            try:
+                return check(os.path.join(self.folder, file_name))
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers) as pool:
+            checksums = list(pool.map(run_check, [row[1] for row in rows]))
+
+        broken = []
+        for (key, file_name), checksum in zip(rows, checksums):
+            path = os.path.join(self.folder, file_name)
+            if checksum is None:
+                if os.path.exists(path):
+                    os.replace(path, path + ".corrupt")
+                self.remove_day(self._day(key))
+                broken.append(self._day(key))
+                continue
+            stat = os.stat(path)
+            with self._lock:
+                self._db.execute(
+                    "UPDATE days SET checksum = ?, file_size = ?, file_mtime_ns = ? WHERE day = ?",
+                    (checksum, stat.st_size, stat.st_mtime_ns, key),
+                )
+        return broken
+
+    # endregion
+
+    def _to_entry(self, cursor: sqlite3.Cursor) -> Optional[dict]:
+        """Row as dict; "day" is returned as UTC datetime"""
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        entry = dict(zip([column[0] for column in cursor.description], row))
+        entry["day"] = self._day(entry["day"])
+        return entry
+
+    def _stat_day_file(self, day: datetime) -> tuple[str, int, int]:
+        file_name = day.strftime("%Y%m%d") + self.file_suffix
+        stat = os.stat(os.path.join(self.folder, file_name))
+        return file_name, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _key(day: datetime) -> int:
+        return day.year * 10_000 + day.month * 100 + day.day
+
+    @staticmethod
+    def _day(key: int) -> datetime:
+        return datetime(key // 10_000, key // 100 % 100, key % 100, tzinfo=UTC)
+
+
+# end of file
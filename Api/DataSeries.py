@@ -1,9 +1,11 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Iterator, Any
+from typing import TYPE_CHECKING, Iterator, Any, Optional
 from datetime import datetime
 import numpy as np
 from typing import Iterator
-from Api.ring_buffer import Ringbuffer
+from Api.ring_buffer import NumpyRingbuffer
+from Api.BarRing import RingColumn
+from Api.RollingExtremum import RollingExtremum
 
 # from Api.IIndicator import IIndicator
 
@@ -12,12 +14,14 @@ if TYPE_CHECKING:
 
 
 class DataSeries:
-    data: Ringbuffer[float]
+    data: NumpyRingbuffer | RingColumn
     _parent: Bars
     _size: int
     _is_indicator_result: bool  # True if this is an indicator result (ring buffer mode)
 
-    def __init__(self, _parent: Bars, _size: int, is_indicator_result: bool = False):
+    def __init__(
+        self, _parent: Bars, _size: int, is_indicator_result: bool = False, data: Optional[RingColumn] = None
+    ):
         """
         Initialize a DataSeries with a ring buffer.
         
@@ -25,14 +29,17 @@ class DataSeries:
             _parent: Parent Bars object
             _size: Size of the buffer. For indicator results, this should be exactly the indicator's period.
             is_indicator_result: If True, this DataSeries is an indicator result and uses ring buffer mode with size = period.
+            data: a column of the parent's BarRing (bar prices) instead of an own ring buffer
         """
         self._parent = _parent
         self._size = _size
         self._is_indicator_result = is_indicator_result
-        self.data = Ringbuffer[float](_size)  # Use true ringbuffer - its _add_count is the linear index counter
+        # Use true ringbuffer - its _add_count is the linear index counter
+        self.data = NumpyRingbuffer(_size) if data is None else data
         self.indicator_list = []  # List of indicators attached to this DataSeries
         self._owner_indicator = None  # The indicator that produces this DataSeries as a result
         self._last_calc_index = -1  # Last absolute index calculated for this indicator result
+        self._extrema: dict[bool, RollingExtremum] = {}  # get_max (True) / get_min (False) trackers
     
     @property
     def _add_count(self) -> int:
@@ -64,16 +71,13 @@ class DataSeries:
         """
         if new_size <= self._size:
             return
-            
-        old_buffer = self.data
+        if isinstance(self.data, RingColumn):
+            self._size = new_size  # the parent Bars resizes the shared BarRing
+            return
+
         self._size = new_size
-        self.data = Ringbuffer[float](new_size)
-        
-        # Copy data from old buffer (from oldest to newest)
-        for i in range(old_buffer._count - 1, -1, -1):
-            self.data.add(old_buffer[i])
-        
-        # _add_count remains the same (total added since start)
+        # one block copy in place; _add_count remains the same (total added since start)
+        self.data.resize(new_size)
 
     def __iter__(self) -> Iterator[float]:
         """
@@ -88,6 +92,13 @@ class DataSeries:
                 if value is not None:
                     yield float(value) if not np.isnan(value) else float('nan')
 
+    def window(self, length: int) -> np.ndarray:
+        """
+        The newest min(length, count) values, oldest first, as a numpy array for numpy/talib.
+        A read-only view into the ring buffer (no copy), valid until the next append.
+        """
+        return self.data.window(length)
+
     def append(self, value: float):
         """
         Append a single value to the ring buffer.
@@ -257,8 +268,9 @@ class DataSeries:
         """
         if self.data._count == 0:
             return float("nan")
-        values = [float(self.data[i]) for i in range(self.data._count) if self.data[i] is not None and not np.isnan(self.data[i])]
-        if not values:
+        values = self.window(self.data._count)
+        values = values[~np.isnan(values)]
+        if 0 == len(values):
             return float("nan")
         return float(np.mean(values))
 
@@ -268,10 +280,7 @@ class DataSeries:
         """
         if self.data._count == 0:
             return float("nan")
-        values = [float(self.data[i]) for i in range(self.data._count) if self.data[i] is not None and not np.isnan(self.data[i])]
-        if not values:
-            return float("nan")
-        return float(np.max(values))
+        return float(self._extremum(True).value)
 
     def get_min(self) -> float:
         """
@@ -279,10 +288,17 @@ class DataSeries:
         """
         if self.data._count == 0:
             return float("nan")
-        values = [float(self.data[i]) for i in range(self.data._count) if self.data[i] is not None and not np.isnan(self.data[i])]
-        if not values:
-            return float("nan")
-        return float(np.min(values))
+        return float(self._extremum(False).value)
+
+    def _extremum(self, maximum: bool) -> RollingExtremum:
+        """The rolling max/min tracker over the whole buffer, O(1) amortized per appended value"""
+        tracker = self._extrema.get(maximum)
+        if tracker is None:
+            tracker = self._extrema[maximum] = RollingExtremum(self, self._size, maximum)
+        elif tracker.period != self._size:  # resized: the window holds older values now
+            tracker.period = self._size
+            tracker.rebuild()
+        return tracker
 
     def __getitem__(self, index: int) -> float:
         """
@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+import time
+import queue
+import threading
+from datetime import datetime, timedelta
+from Api.TickDay import TickDay
+
+if TYPE_CHECKING:
+    from Api.QuoteProvider import QuoteProvider
+
+
+class DayPrefetcher:
+    """
+    Loads the days of a tick stream on a worker thread so that day N+1 is read and decompressed
+    while day N is being replayed. Up to `depth` loaded days wait in a bounded queue.
+
+    With depth 0 no thread is started and each day is loaded synchronously on request.
+    stall_seconds accumulates the time the caller spent waiting for a day in either mode.
+    """
+
+    _END = None  # queue marker: no more days
+
+    def __init__(self, quote_provider: QuoteProvider, start_day: datetime, end_day: datetime, depth: int):
+        self.quote_provider = quote_provider
+        self.next_load_day = start_day
+        self.end_day = end_day  # inclusive
+        self.depth = max(0, depth)
+        self.stall_seconds: float = 0.0
+        self.days_loaded: int = 0
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._ended = False  # the end marker has been handed out (the worker has exited)
+        if self.depth > 0:
+            self._queue: queue.Queue[Optional[tuple[str, TickDay]]] = queue.Queue(maxsize=self.depth)
+            self._worker = threading.Thread(target=self._run, name="DayPrefetcher", daemon=True)
+            self._worker.start()
+
+    def next_day(self) -> Optional[tuple[str, TickDay]]:
+        """Return (error, tick_day) of the next day or None after the end day"""
+        start = time.perf_counter()
+        if self._worker is None:
+            item = self._load_next()
+        elif self._ended:
+            item = self._END  # asked again after the end: the worker is gone, don't wait for the queue
+        else:
+            item = self._queue.get()
+            if item is self._END:
+                self._ended = True
+                if self._error is not None:
+                    raise self._error
+        self.stall_seconds += time.perf_counter() - start
+        return item
+
+    def close(self):
+        """Stop the worker; days still in the queue are dropped"""
+        if self._worker is None:
+            return
+        self._stop_event.set()
+        while self._worker.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._worker.join(timeout=0.01)
+        self._worker = None
+
+    def _load_next(self) -> Optional[tuple[str, TickDay]]:
+        if self.next_load_day > self.end_day:
+            return self._END
+
+        error, _, tick_day = self.quote_provider.get_day_at_utc(self.next_load_day)
+        if "" != error or tick_day is None:
+            tick_day = TickDay.empty()
+        self.next_load_day += timedelta(days=1)
+        self.days_loaded += 1
+        return error, tick_day
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                item = self._load_next()
+                if not self._put(item) or item is self._END:
+                    return
+        except BaseException as ex:  # handed over to the consumer by next_day()
+            self._error = ex
+            self._put(self._END)
+
+    def _put(self, item: Optional[tuple[str, TickDay]]) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+# end of file
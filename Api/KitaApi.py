@@ -3,7 +3,7 @@ import os
 import re
 import math
 import time
-from typing import TypeVar
+from typing import TypeVar, Callable
 from datetime import datetime, timedelta, date
 from typing import Optional
 import pytz
@@ -13,6 +13,8 @@ from Api.PyLogger import PyLogger
 from Api.LogParams import LogParams
 from Api.Account import Account
 from Api.Symbol import Symbol
+from Api.TickScheduler import TickScheduler
+from Api.TickDay import TickDay
 from Api.Position import Position
 from Api.KitaApiEnums import BidAsk, TradeType, ProfitMode
 from Api.QuoteProvider import QuoteProvider
@@ -53,6 +55,9 @@ class KitaApi:
     AccountInitialBalance: float = 10000.0
     AccountLeverage: int = 500
     AccountCurrency: str = "EUR"
+    TickPrefetchDepth: int = 2  # days loaded ahead on a worker thread; 0 = load synchronously
+    BarTickSynthesis: bool = False  # bar data: replay each bar as open/high/low/close ticks, not once at its open
+    TickPrefilter: bool = True  # skip repeated quotes per day with numpy; False = raw stream for parity checks
     # endregion
 
     # Members
@@ -65,7 +70,7 @@ class KitaApi:
     Indicators: Indicators = None  # type:ignore  # Central API for creating indicators
     MarketData: MarketData = None  
     _debug_log_file = None  # Debug log file handle
-    _last_ontick_date: Optional[str] = None  # Track last date printed for OnTick message
+    _last_ontick_date: Optional[int] = None  # Track last date (epoc day) printed for OnTick message
     # endregion
 
     def __init__(self):
@@ -98,6 +103,9 @@ class KitaApi:
 
     # API for robots
     # region
+    def on_bar(self, symbol: Symbol, timeframe: int):
+        pass  # a bar of a timeframe requested with on_bar=True has closed (called before on_tick); optional
+
     # close a position with logging; logger must be set up in the robot on_init or on_start
     def close_trade(
         self,
@@ -651,6 +659,7 @@ class KitaApi:
         self.is_train: bool = False
         self.initial_account_balance: float = self.AccountInitialBalance
         self.symbol_dictionary: dict[str, Symbol] = {}  # type: ignore
+        self._tick_scheduler: Optional[TickScheduler] = None  # built at the first do_tick()
         self.positions: list[Position] = []
         self.history: list[Position] = []
         self.max_margin: float = 0
@@ -744,215 +753,168 @@ class KitaApi:
         self.prepare_backtest()
 
     def do_tick(self):
-        # Update quote, bars, indicators, account, bot
-        # 1st tick must update all bars and Indicators which have been inized in on_init()
-        for symbol in self.symbol_dictionary.values():
-            # Track bar counts and bar times BEFORE symbol_on_tick() is called (to detect new bars)
-            if not hasattr(symbol, '_previous_bar_counts'):
-                symbol._previous_bar_counts = {}
-            if not hasattr(symbol, '_previous_bar_times'):
-                symbol._previous_bar_times = {}
-            previous_counts = {}
-            previous_bar_times = {}
-            for bars in symbol.bars_dictonary.values():
-                bars_id = id(bars)
-                previous_counts[bars_id] = bars.count
-                # Track the last bar time for each timeframe (to detect new bars when ring buffer is full)
-                if bars.count > 1:
-                    try:
-                        prev_bar = bars.Last(1)  # Previous closed bar
-                        if prev_bar:
-                            previous_bar_times[bars_id] = prev_bar.OpenTime
-                    except:
-                        previous_bar_times[bars_id] = None
-                else:
-                    previous_bar_times[bars_id] = None
-            
-            # Update quote, bars, indicators which are bound to this symbol
-            # This builds bars and updates indicators during warm-up phase
-            error = symbol.symbol_on_tick()
-            
-            # Compare symbol.time (UTC) directly with _BacktestEndUtc (UTC) to avoid timezone conversion issues
-            # symbol.time is in UTC from tick data, so compare with UTC end time
-            if "" != error or symbol.time > self._BacktestEndUtc or self._stop_requested:
+        """
+        Dispatch the next tick in time over all symbols (k-way merge on their next tick times, see
+        TickScheduler). Returns True when the end is reached.
+        """
+        if self._tick_scheduler is None:
+            self._tick_scheduler = TickScheduler(self.symbol_dictionary.values())
+
+        while len(self._tick_scheduler) > 0:
+            order, symbol, until_ms = self._tick_scheduler.pop()
+            error = self._symbol_tick(symbol, until_ms)
+            if "End reached" == error and (symbol.time_ms > symbol._backtest_end_ms or self._stop_requested):
                 return True  # end reached
+            if "" == error or "Tick pending" == error:
+                self._tick_scheduler.push(order, symbol)
+            if "" == error:
+                return False
+            # otherwise this symbol's stream has ended, the others go on
 
-            # Check if a new bar was created for any timeframe (compare with previous_counts tracked BEFORE symbol_on_tick)
-            new_bar_created = False
-            new_h4_bar_created = False  # Track if H4 bar (14400 seconds) was created
-            new_m1_bar_created = False  # Track if M1 bar (60 seconds) was created
-            new_h1_bar_created = False  # Track if H1 bar (3600 seconds) was created
-            if len(previous_counts) > 0:
-                for bars_id, prev_count in previous_counts.items():
-                    bars = None
-                    for symbol_bars in symbol.bars_dictonary.values():
-                        if id(symbol_bars) == bars_id:
-                            bars = symbol_bars
-                            break
-                    
-                    if bars:
-                        # Check if count increased OR bar time changed (for ring buffer when full)
-                        current_bar_time = None
-                        if bars.count > 1:
-                            try:
-                                prev_bar = bars.Last(1)  # Previous closed bar
-                                if prev_bar:
-                                    current_bar_time = prev_bar.OpenTime
-                            except:
-                                pass
-                        
-                        prev_bar_time = previous_bar_times.get(bars_id)
-                        
-                        if bars.count > prev_count:
-                            # Count increased - definitely a new bar
-                            new_bar_created = True
-                            # Track which timeframe created a new bar
-                            if bars.timeframe_seconds == 60:
-                                new_m1_bar_created = True
-                            elif bars.timeframe_seconds == 3600:
-                                new_h1_bar_created = True
-                            elif bars.timeframe_seconds == 14400:
-                                new_h4_bar_created = True
-                        elif prev_bar_time is not None and current_bar_time is not None and current_bar_time != prev_bar_time:
-                            # Ring buffer is full (count == size), but bar time changed - new bar overwrote oldest
-                            new_bar_created = True
-                            # Track which timeframe created a new bar
-                            if bars.timeframe_seconds == 60:
-                                new_m1_bar_created = True
-                            elif bars.timeframe_seconds == 3600:
-                                new_h1_bar_created = True
-                            elif bars.timeframe_seconds == 14400:
-                                new_h4_bar_created = True
-                        elif bars.count < prev_count:
-                            # Don't break here - we need to check all bars to find H4 bars
-                            pass
-                    else:
-                        pass
-
-            # During warm-up phase, only build bars and update indicators, skip OnTick
-            if symbol.is_warm_up:
-                symbol.prev_time = symbol.time
-                symbol.prev_bid = symbol.bid
-                symbol.prev_ask = symbol.ask
-                # Update tracked counts and bar times even during warm-up
-                for bars in symbol.bars_dictonary.values():
-                    bars_id = id(bars)
-                    symbol._previous_bar_counts[bars_id] = bars.count
-                    if bars.count > 1:
-                        try:
-                            prev_bar = bars.Last(1)
-                            if prev_bar:
-                                symbol._previous_bar_times[bars_id] = prev_bar.OpenTime
-                            else:
-                                symbol._previous_bar_times[bars_id] = None
-                        except:
-                            symbol._previous_bar_times[bars_id] = None
-                    else:
-                        symbol._previous_bar_times[bars_id] = None
-                continue  # Skip OnTick and account updates during warm-up
-
-            # Only call on_tick() when current time >= BacktestStart (not based on bar time)
-            # The user's on_tick() will handle logging after it's called
-            if symbol.time < self._BacktestStartUtc:
-                symbol.prev_time = symbol.time
-                symbol.prev_bid = symbol.bid
-                symbol.prev_ask = symbol.ask
-                # Update tracked counts and bar times
-                for bars in symbol.bars_dictonary.values():
-                    bars_id = id(bars)
-                    symbol._previous_bar_counts[bars_id] = bars.count
-                    if bars.count > 1:
-                        try:
-                            prev_bar = bars.Last(1)
-                            if prev_bar:
-                                symbol._previous_bar_times[bars_id] = prev_bar.OpenTime
-                            else:
-                                symbol._previous_bar_times[bars_id] = None
-                        except:
-                            symbol._previous_bar_times[bars_id] = None
-                    else:
-                        symbol._previous_bar_times[bars_id] = None
-                continue  # Skip OnTick if current time is before start date
-            
-            # Update tracked counts and bar times AFTER checking (so next tick can compare)
-            for bars in symbol.bars_dictonary.values():
-                bars_id = id(bars)
-                symbol._previous_bar_counts[bars_id] = bars.count
-                # Update the last bar time for each timeframe
-                if bars.count > 1:
-                    try:
-                        prev_bar = bars.Last(1)  # Previous closed bar
-                        if prev_bar:
-                            symbol._previous_bar_times[bars_id] = prev_bar.OpenTime
-                        else:
-                            symbol._previous_bar_times[bars_id] = None
-                    except:
-                        symbol._previous_bar_times[bars_id] = None
-                else:
-                    symbol._previous_bar_times[bars_id] = None
-
-            # Call OnTick based on mode:
-            # - For tick data (data_rate == 0): Call on_tick for every tick after BacktestStart
-            # - For bar data: Call on_tick only when a new bar is created
-            should_call_ontick = False
-            if symbol.quote_provider.data_rate == 0:
-                # Tick mode: call on_tick for every tick within BacktestStart/BacktestEnd range
-                # Note: Filtering for unchanged prices happens "under the hood" in symbol_on_tick
-                # Here we only check the timestamp range - user's on_tick is only called for ticks in range
-                if symbol.time >= self._BacktestStartUtc and symbol.time < self._BacktestEndUtc:
-                    should_call_ontick = True
-            elif (new_m1_bar_created or new_h1_bar_created or new_h4_bar_created) and symbol.time >= self._BacktestStartUtc:
-                # Bar mode: call on_tick only when a new bar is created
-                should_call_ontick = True
-            
-            if should_call_ontick:
-                # Update Account
-                if len(self.positions) >= 1:
-                    symbol.trade_provider.update_account()
-
-                # Print OnTick date message when new day arrives and measure per-day performance
-                import sys
-                current_date_str = symbol.time.strftime("%d.%m.%Y")
-                
-                if self._last_ontick_date is None or self._last_ontick_date != current_date_str:
-                    # OnTick date message goes to debug log, not stdout/stderr
-                    self._last_ontick_date = current_date_str
-
-                # call the robot
-                self.robot.on_tick(symbol)  # type: ignore
-            elif (new_m1_bar_created or new_h1_bar_created or new_h4_bar_created) and symbol.time < self._BacktestStartUtc:
-                pass
-            elif not new_bar_created:
-                # No new bar, but still update account if needed (for positions)
-                if len(self.positions) >= 1:
-                    symbol.trade_provider.update_account()
-
-            # do max/min calcs
-            # region
-            self.max_margin = max(self.max_margin, self.account.margin)
-            if len(self.positions) > self.same_time_open:
-                self.same_time_open = len(self.positions)
-                self.same_time_open_date_time = symbol.time
-                self.same_time_open_count = len(self.history)
-
-            self.max_balance = max(self.max_balance, self.account.balance)
-            if self.max_balance - self.account.balance > self.max_balance_drawdown_value:
-                self.max_balance_drawdown_value = self.max_balance - self.account.balance
-                self.max_balance_drawdown_time = symbol.time
-                self.max_balance_drawdown_count = len(self.history)
-
-            self.max_equity = max(self.max_equity, self.account.equity)
-            if self.max_equity - self.account.equity > self.max_equity_drawdown_value:
-                self.max_equity_drawdown_value = self.max_equity - self.account.equity
-                self.max_equity_drawdown_time = symbol.time
-                self.max_equity_drawdown_count = len(self.history)
-            # endregion
-
-            symbol.prev_time = symbol.time
+        return True  # all streams ended
+
+    def run(
+        self,
+        until: Optional[datetime] = None,
+        progress_cb: Optional[Callable[[int, int], None]] = None,
+        progress_every: int = 100_000,
+    ) -> tuple[bool, int]:
+        """
+        Process ticks in one loop, the same ticks in the same order as calling do_tick() until it returns
+        True; do_tick() stays available for stepwise use and can be mixed with run().
+        - until: stop before the first tick at or after this time (UTC, naive is taken as UTC); None = to the end
+        - progress_cb(ticks, time_ms): called every progress_every ticks processed by this call
+        Returns (end reached, ticks processed); (False, n) when stopped at until.
+        """
+        if self._tick_scheduler is None:
+            self._tick_scheduler = TickScheduler(self.symbol_dictionary.values())
+
+        # everything invariant is looked up once, not per tick
+        scheduler = self._tick_scheduler
+        pop = scheduler.pop
+        push = scheduler.push
+        next_ms = scheduler.next_ms
+        symbol_tick = self._symbol_tick
+        last_ms = None if until is None else TickDay.to_ms(until) - 1
+        next_progress = progress_every if progress_cb is not None and progress_every > 0 else -1
+        ticks = 0
+
+        while len(scheduler) > 0:
+            if last_ms is not None and next_ms() > last_ms:
+                return False, ticks
+
+            order, symbol, until_ms = pop()
+            if last_ms is not None and (until_ms is None or until_ms > last_ms):
+                until_ms = last_ms  # the symbol may not consume (filtered) ticks beyond until either
+
+            error = symbol_tick(symbol, until_ms)
+            if "" == error:
+                push(order, symbol)
+                ticks += 1
+                if ticks == next_progress:
+                    progress_cb(ticks, symbol.time_ms)  # type: ignore
+                    next_progress += progress_every
+                continue
+
+            if "End reached" == error and (symbol.time_ms > symbol._backtest_end_ms or self._stop_requested):
+                return True, ticks
+            if "Tick pending" == error:
+                push(order, symbol)
+            # otherwise this symbol's stream has ended, the others go on
+
+        return True, ticks  # all streams ended
+
+    def _symbol_tick(self, symbol: Symbol, until_ms: int | None) -> str:
+        """
+        Update quote, bars, indicators, account and bot for the next tick of one symbol.
+        Returns "" when a tick was processed, "Tick pending" when another symbol is due first (until_ms)
+        or the end reason.
+        """
+        # 1st tick must update all bars and Indicators which have been inized in on_init()
+        # Bars closed by this tick set their bit in new_bar_mask (Bars.subscribe_bar_closed), no diffing
+        symbol.new_bar_mask = 0
+
+        # Update quote, bars, indicators which are bound to this symbol
+        # This builds bars and updates indicators during warm-up phase
+        error = symbol.symbol_on_tick(until_ms)
+        if "Tick pending" == error:
+            return error  # another symbol is due first
+
+        # Compare the tick's epoc ms with _BacktestEndUtc as epoc ms (no datetime per tick)
+        if symbol.time_ms > symbol._backtest_end_ms or self._stop_requested:
+            return "End reached"
+        if "" != error:
+            return error  # end of this symbol's stream
+
+        new_bar_created = 0 != symbol.new_bar_mask
+
+        # During warm-up phase, only build bars and update indicators, skip OnTick
+        # (and before BacktestStart: on_tick() is called when current time >= BacktestStart, not bar time)
+        if symbol.is_warm_up or symbol.time_ms < symbol._backtest_start_ms:
+            symbol.prev_time_ms = symbol.time_ms
             symbol.prev_bid = symbol.bid
             symbol.prev_ask = symbol.ask
+            return ""  # Skip OnTick and account updates during warm-up
+
+        # Call on_tick for every tick within BacktestStart/BacktestEnd range
+        # - For tick data (data_rate == 0) a tick, filtering for unchanged prices happens in symbol_on_tick
+        # - For bar data a streamed bar at its open (or a synthesized bar tick with BarTickSynthesis)
+        should_call_ontick = False
+        if symbol._backtest_start_ms <= symbol.time_ms < symbol._backtest_end_ms:
+            should_call_ontick = True
+
+        if should_call_ontick:
+            # Update Account
+            if len(self.positions) >= 1:
+                symbol.trade_provider.update_account()
+
+            # Print OnTick date message when new day arrives and measure per-day performance
+            current_day = symbol.time_ms // 86_400_000
+
+            if self._last_ontick_date is None or self._last_ontick_date != current_day:
+                # OnTick date message goes to debug log, not stdout/stderr
+                self._last_ontick_date = current_day
+
+            # bars closed by this tick of timeframes with on_bar subscribers (shortest first), then the tick
+            closed = symbol.new_bar_mask & symbol._on_bar_mask
+            if 0 != closed:
+                for bit, timeframe in symbol._on_bar_dispatch:
+                    if closed & bit:
+                        self.robot.on_bar(symbol, timeframe)
+
+            # call the robot
+            self.robot.on_tick(symbol)  # type: ignore
+        elif not new_bar_created:
+            # No new bar, but still update account if needed (for positions)
+            if len(self.positions) >= 1:
+                symbol.trade_provider.update_account()
+
+        # do max/min calcs
+        # region
+        self.max_margin = max(self.max_margin, self.account.margin)
+        if len(self.positions) > self.same_time_open:
+            self.same_time_open = len(self.positions)
+            self.same_time_open_date_time = symbol.time
+            self.same_time_open_count = len(self.history)
+
+        self.max_balance = max(self.max_balance, self.account.balance)
+        if self.max_balance - self.account.balance > self.max_balance_drawdown_value:
+            self.max_balance_drawdown_value = self.max_balance - self.account.balance
+            self.max_balance_drawdown_time = symbol.time
+            self.max_balance_drawdown_count = len(self.history)
+
+        self.max_equity = max(self.max_equity, self.account.equity)
+        if self.max_equity - self.account.equity > self.max_equity_drawdown_value:
+            self.max_equity_drawdown_value = self.max_equity - self.account.equity
+            self.max_equity_drawdown_time = symbol.time
+            self.max_equity_drawdown_count = len(self.history)
+        # endregion
 
-        return False
+        symbol.prev_time_ms = symbol.time_ms
+        symbol.prev_bid = symbol.bid
+        symbol.prev_ask = symbol.ask
+
+        return ""
 
     def do_stop(self):
         """Stop the robot and close debug log file"""
@@ -961,6 +923,7 @@ class KitaApi:
             self._debug_log_file = None
         for symbol in self.symbol_dictionary.values():
             self.robot.on_stop(symbol)  # type: ignore
+            symbol.close_tick_stream()
 
         # calc performance numbers
         min_duration = timedelta.max
@@ -1099,6 +1062,8 @@ class KitaApi:
         log_text += "Winning Ratio: " + CoFu.double_to_string(winning_ratio_percent, 2) + "\n"
         log_text += "Trades Per Month: " + CoFu.double_to_string(trades_per_month, 2) + "\n"
         log_text += "Average Annual Profit Percent: " + CoFu.double_to_string(annual_profit_percent, 2) + "\n"
+        tick_io_stall = sum(symbol.tick_io_stall_seconds for symbol in self.symbol_dictionary.values())
+        log_text += "Tick I/O Stall Seconds: " + CoFu.double_to_string(tick_io_stall, 2) + "\n"
 
         # if avg_open_duration_sum != 0:
         #     log_text += (
@@ -7,7 +7,7 @@ import pytz
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from Api.KitaApiEnums import *
-from Api.Bars import Bars
+from Api.TickDay import TickDay
 
 if TYPE_CHECKING:
     from Api.KitaApi import KitaApi
@@ -97,7 +97,7 @@ class QuoteProvider(ABC):
     def init_symbol(self, api: KitaApi, symbol: Symbol): ...
 
     @abstractmethod
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]: ...
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]: ...
 
     @abstractmethod
     def get_first_datetime(self) -> tuple[str, datetime]: ...
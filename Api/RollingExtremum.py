@@ -0,0 +1,106 @@
+from __future__ import annotations
+from typing import Any, Callable, Optional
+from collections import deque
+
+
+class RollingExtremum:
+    """
+    Rolling maximum (or minimum) of the newest `period` values of a ring buffer (at most its _size),
+    O(1) amortized per value.
+
+    The source is anything Ringbuffer-like (Ringbuffer, NumpyRingbuffer, a BarRing column): relative []
+    (0 = newest), _size, _count and _add_count; for a DataSeries its current data buffer is used.
+    Nothing has to be hooked into the source's writes: values added since the last query are taken over
+    when the extremum is asked for. The values before the newest are kept in a monotonic deque, the newest
+    is read from the source on each query, so it may change (current bar, Ringbuffer.exchange) at no cost.
+    Values before the newest are taken as final; after changing one of them (or clear/remove_at) call rebuild().
+
+    key maps items to the compared value (e.g. lambda item: item[1] for (time, price) tuples);
+    NaN and None values are skipped. On ties the oldest item wins.
+    """
+
+    def __init__(
+        self, source: Any, period: int, maximum: bool = True, key: Optional[Callable[[Any], float]] = None
+    ):
+        # a DataSeries (has .data) is followed through its buffer, which resize() replaces
+        self._series = source if hasattr(source, "data") else None
+        self._source = source
+        self.period = max(1, period)
+        self.maximum = maximum
+        self._key = key
+        self._deque: deque[tuple[int, float, Any]] = deque()  # (absolute index, key value, item)
+        self._newest_index = -1  # absolute index of the source's newest value when last synced
+
+    @property
+    def value(self) -> float:
+        """The extremum of the window, NaN if it holds no (valid) value"""
+        return self.extremum()[0]
+
+    @property
+    def item(self) -> Any:
+        """The item holding the extremum (the value itself without key), None if there is none"""
+        return self.extremum()[1]
+
+    def extremum(self) -> tuple[float, Any]:
+        """(value, item) of the extremum of the window; (NaN, None) if there is none"""
+        source = self._sync()
+        candidate = self._deque[0] if self._deque else None
+        if source._count > 0:
+            item = source[0]
+            value = item if self._key is None or item is None else self._key(item)
+            if value is not None and value == value:
+                if (
+                    candidate is None
+                    or (self.maximum and value > candidate[1])
+                    or (not self.maximum and value < candidate[1])
+                ):
+                    return value, item
+        return (float("nan"), None) if candidate is None else (candidate[1], candidate[2])
+
+    def rebuild(self):
+        """Take over the window again from the source"""
+        self._deque.clear()
+        self._newest_index = -1
+        self._sync()
+
+    def _sync(self) -> Any:
+        """Take over the values added since the last sync; returns the ring buffer"""
+        source = self._source if self._series is None else self._series.data
+        newest_index = source._add_count - 1
+        missed = newest_index - self._newest_index
+        if 0 == missed:
+            return source
+
+        period = min(self.period, source._size)  # older values are overwritten in the source
+        window_length = min(period, source._count)
+        if missed < 0 or missed >= window_length:
+            # the former newest is out of the window (or the source is new): take over the whole window
+            self._deque.clear()
+            missed = window_length - 1
+        # the former newest and the values added after it, except the (new) newest, are final now
+        for rel_pos in range(missed, 0, -1):
+            self._push(newest_index - rel_pos, source[rel_pos])
+        self._newest_index = newest_index
+
+        oldest_index = newest_index - period + 1
+        while self._deque and self._deque[0][0] < oldest_index:
+            self._deque.popleft()
+        return source
+
+    def _push(self, index: int, item: Any):
+        if item is None:
+            return
+        value = item if self._key is None else self._key(item)
+        if value != value:  # NaN
+            return
+        window = self._deque
+        if self.maximum:
+            while window and window[-1][1] < value:
+                window.pop()
+        else:
+            while window and window[-1][1] > value:
+                window.pop()
+        window.append((index, value, item))
+
+
+# end of file
@@ -0,0 +1,66 @@
+from __future__ import annotations
+from bisect import bisect_right
+from datetime import datetime, timedelta
+import pytz
+from Api.TickDay import TickDay
+
+
+class SessionBoundaries:
+    """
+    Precomputed bar start times of session anchored timeframes as sorted UTC epoc ms, one table per
+    (timeframe, UTC year); DST transitions are part of the table, so no timezone math is done per tick.
+
+    - H4 (14400): every 4 hours from New York 17:00 of each day; the last bar before the next anchor is
+      shorter (3 hours on the spring DST day) or an extra 1 hour bar (autumn DST day)
+    - D1 and larger: UTC midnight
+    """
+
+    NY_TZ = pytz.timezone("America/New_York")
+    H4_SECONDS = 14400
+    _tables: dict[tuple[int, int], list[int]] = {}
+
+    @classmethod
+    def is_anchored(cls, timeframe_seconds: int) -> bool:
+        """True for the timeframes the tables cover"""
+        return cls.H4_SECONDS == timeframe_seconds or timeframe_seconds >= 86400
+
+    @classmethod
+    def bar_range(cls, timeframe_seconds: int, time_ms: int) -> tuple[int, int]:
+        """(start, next start) in epoc ms of the bar containing time_ms"""
+        year = TickDay.from_ms(time_ms).year
+        table = cls.table(timeframe_seconds, year)
+        ndx = bisect_right(table, time_ms) - 1
+        return table[ndx], table[ndx + 1]
+
+    @classmethod
+    def table(cls, timeframe_seconds: int, year: int) -> list[int]:
+        """Sorted boundaries covering the whole UTC year (one before its first and one after its last ms)"""
+        key = (timeframe_seconds, year)
+        table = cls._tables.get(key)
+        if table is None:
+            table = cls._build(timeframe_seconds, year)
+            cls._tables[key] = table
+        return table
+
+    @classmethod
+    def _build(cls, timeframe_seconds: int, year: int) -> list[int]:
+        # one day of margin on both sides of the year
+        first_day = datetime(year, 1, 1) - timedelta(days=2)
+        days = (datetime(year + 1, 1, 1) - first_day).days + 2
+
+        if cls.H4_SECONDS != timeframe_seconds:
+            return [TickDay.to_ms(pytz.UTC.localize(first_day + timedelta(days=ndx))) for ndx in range(days + 1)]
+
+        anchors = [
+            TickDay.to_ms(cls.NY_TZ.localize((first_day + timedelta(days=ndx)).replace(hour=17)))
+            for ndx in range(days + 1)
+        ]
+        step_ms = cls.H4_SECONDS * 1000
+        table = []
+        for anchor, next_anchor in zip(anchors, anchors[1:]):
+            table.extend(range(anchor, next_anchor, step_ms))
+        table.append(anchors[-1])
+        return table
+
+
+# end of file
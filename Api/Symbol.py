@@ -7,11 +7,12 @@ import csv
 import pandas as pd
 import numpy as np
 import re
+import zlib
 from pytz import UTC
 from pathlib import Path
 from datetime import datetime, timedelta, tzinfo
 from bisect import bisect_left
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZIP_DEFLATED, BadZipFile
 from io import StringIO, BytesIO
 from Api.KitaApiEnums import *
 from Api.KitaApi import RoundingMode
@@ -20,6 +21,9 @@ from Api.QuoteProvider import QuoteProvider
 from Api.Constants import Constants
 from Api.Bar import Bar
 from Api.Bars import Bars
+from Api.TickDay import TickDay
+from Api.DayPrefetcher import DayPrefetcher
+from Api.DataCatalog import DataCatalog
 from Api.LeverageTier import LeverageTier
 
 # from numba import jit
@@ -35,14 +39,20 @@ class Symbol:
     api: KitaApi
     name: str = ""
     bars_dictonary: dict[int, Bars] = {}
-    time: datetime = datetime.min
-    prev_time: datetime = datetime.min
+    time_ms: int | None = None  # epoc ms (UTC) of the current tick; symbol.time is created from it on access
+    prev_time_ms: int | None = None
+    _time_cache: tuple[int | None, datetime] = (None, datetime.min)
+    _prev_time_cache: tuple[int | None, datetime] = (None, datetime.min)
+    _backtest_start_ms: int = TickDay.to_ms(datetime.min)  # robot._BacktestStartUtc/EndUtc as epoc ms
+    _backtest_end_ms: int = TickDay.to_ms(datetime.max)
     start_tz_dt: datetime = datetime.min
     end_tz_dt: datetime = datetime.min
     bid: float = 0
     ask: float = 0
     prev_bid: float = 0
     prev_ask: float = 0
+    _prev_bid_points: int | None = None  # last accepted bid/ask in integer points (None: nothing accepted)
+    _prev_ask_points: int | None = None
     broker_symbol_name: str = ""
     min_volume: float = 0
     max_volume: float = 0
@@ -70,6 +80,43 @@ class Symbol:
     _indicator_cache: dict = None  # Cache for indicators by source type for fast lookup
     _last_high_prices: dict = None  # Track last high price per bars for optimization
     _last_low_prices: dict = None  # Track last low price per bars for optimization
+    _tick_prefetcher: DayPrefetcher | None = None
+    _tick_io_stall_closed: float = 0.0  # stall seconds of the prefetchers closed so far (stream restarts)
+    _bar_tick_phase: int = 0  # bar data with BarTickSynthesis: 0..3 = open, 1st extreme, 2nd extreme, close
+    _bar_rest: tuple[float, float, float, float, float, float] | None = None  # high/low/close of the last bar
+    new_bar_mask: int = 0  # Bars.dirty_bit of every bars closed since KitaApi reset it (once per tick)
+    _on_bar_timeframes: set[int] = set()  # timeframes with on_bar subscribers (request_bars(on_bar=True))
+    _on_bar_mask: int = 0  # their dirty bits
+    _on_bar_dispatch: list[tuple[int, int]] = []  # (dirty bit, timeframe) of them, shortest timeframe first
+    _tick_next_stop: np.ndarray | None = None  # prefiltered tick day: next tick the per-tick path must see
+
+    @property
+    def time(self) -> datetime:
+        """UTC time of the current tick (datetime.min before the first one); created lazily from time_ms"""
+        if self._time_cache[0] != self.time_ms:
+            self._time_cache = (
+                self.time_ms,
+                datetime.min if self.time_ms is None else TickDay.from_ms(self.time_ms),
+            )
+        return self._time_cache[1]
+
+    @time.setter
+    def time(self, value: datetime | None):
+        self.time_ms = None if value is None or datetime.min == value else TickDay.to_ms(value)
+
+    @property
+    def prev_time(self) -> datetime:
+        """UTC time of the previous tick; created lazily from prev_time_ms"""
+        if self._prev_time_cache[0] != self.prev_time_ms:
+            self._prev_time_cache = (
+                self.prev_time_ms,
+                datetime.min if self.prev_time_ms is None else TickDay.from_ms(self.prev_time_ms),
+            )
+        return self._prev_time_cache[1]
+
+    @prev_time.setter
+    def prev_time(self, value: datetime | None):
+        self.prev_time_ms = None if value is None or datetime.min == value else TickDay.to_ms(value)
 
     @property
     def point_size(self) -> float:
@@ -128,6 +175,8 @@ class Symbol:
     ):
         self.api = api
         self.name = symbol_name
+        self.bars_dictonary = {}  # per symbol (the class attribute would be shared by all symbols)
+        self._on_bar_timeframes = set()
         self.quote_provider = quote_provider
         self.trade_provider = trade_provider
         tz_split = str_time_zone.split(":")
@@ -167,7 +216,15 @@ class Symbol:
     def volume_in_units_to_quantity(self, volume: float) -> float:
         return volume / self.lot_size
 
-    def request_bars(self, timeframe: int, look_back: int = 0):
+    def request_bars(self, timeframe: int, look_back: int = 0, on_bar: bool = False):
+        """
+        Build bars of timeframe (seconds) from the ticks, keeping look_back bars.
+        on_bar: call robot.on_bar(symbol, timeframe) each time a bar of this timeframe closes
+        (after BacktestStart); timeframes nobody subscribed to are not looked at per tick.
+        """
+        if on_bar:
+            self._on_bar_timeframes.add(timeframe)
+
         if timeframe < Constants.SEC_PER_HOUR:
             if Constants.SEC_PER_MINUTE != timeframe:
                 minute_look_back = look_back * timeframe // Constants.SEC_PER_MINUTE
@@ -189,8 +246,8 @@ class Symbol:
             )
 
         if timeframe in self.bars_dictonary:
-            if look_back > self.bars_dictonary[timeframe].look_back:
-                self.bars_dictonary[timeframe].look_back = look_back
+            # grows the ring buffer too (setting look_back alone kept the former capacity)
+            self.bars_dictonary[timeframe].update_max_period_requirement(look_back)
         else:
             self.bars_dictonary[timeframe] = Bars(self.name, timeframe, look_back, symbol=self)
 
@@ -234,13 +291,16 @@ class Symbol:
             f"{self.name}",
         )
         os.makedirs(tick_folder, exist_ok=True)
+        catalog = DataCatalog(tick_folder, "_quote.zip")
+        # Zip files not written through the catalog (e.g. truncated by an interrupted run) are checked in
+        # parallel; broken ones are dropped from the catalog and so fetched again below
+        catalog.verify(self.api.AllDataStartUtc, self.api.AllDataEndUtc + timedelta(days=1), self._check_zip_file)
 
         # Check and load missing tick data from broker
         run_utc = self.api.AllDataStartUtc.replace(hour=0, minute=0, second=0, microsecond=0)
         while True:
-            # Check if tick file exists for this day
-            tick_file = os.path.join(tick_folder, run_utc.strftime("%Y%m%d_quote.zip"))
-            if not os.path.exists(tick_file):
+            # Check if tick file exists for this day (catalog lookup, no file system access)
+            if not catalog.has_day(run_utc):
                 # Load missing data from broker
                 error, quote_provider_dt, one_day_provider_data = self.quote_provider.get_day_at_utc(run_utc)
                 if "No data" == error:
@@ -249,49 +309,50 @@ class Symbol:
                 else:
                     assert "" == error, error
                 
-                # Resize bars if needed
-                self._resize_bars(one_day_provider_data)
-
                 # Write tick data to cache file
                 daily_tick_csv_buffer = StringIO()
                 daily_tick_csv_writer = csv.writer(daily_tick_csv_buffer)
 
+                # Bar days carry open prices in extra columns; tick days only have bid/ask
+                bids = one_day_provider_data.bids
+                if one_day_provider_data.open_bids is not None:
+                    bids = one_day_provider_data.open_bids
+                asks = one_day_provider_data.asks
+                if one_day_provider_data.open_asks is not None:
+                    asks = one_day_provider_data.open_asks
+                volumes = one_day_provider_data.volumes
+                if volumes is None:
+                    volumes = np.ones(one_day_provider_data.count)
+                run_ms = int((run_utc - TickDay.EPOCH).total_seconds()) * 1000
+
                 # Write ticks to CSV
-                for i in range(one_day_provider_data.count):
-                    if 0 == one_day_provider_data.timeframe_seconds:
-                        # Tick data: use lists
-                        time = one_day_provider_data.open_times_list[i]
-                        bid = round(one_day_provider_data.open_bids_list[i], ndigits=self.digits)
-                        ask = round(one_day_provider_data.open_asks_list[i], ndigits=self.digits)
-                        volume_bid = one_day_provider_data.volume_bids_list[i]
-                        volume_ask = one_day_provider_data.volume_asks_list[i]
-                    else:
-                        # Bar data: use Ringbuffer (shouldn't happen for tick data, but handle it)
-                        time = one_day_provider_data.open_times.data[i]  # type:ignore
-                        bid = round(one_day_provider_data.open_bids.data[i], ndigits=self.digits)
-                        ask = round(one_day_provider_data.open_asks.data[i], ndigits=self.digits)
-                        volume_bid = one_day_provider_data.volume_bids.data[i]
-                        volume_ask = one_day_provider_data.volume_asks.data[i]
-
-                    # Write tick to CSV
+                for time_ms, bid, ask, volume in zip(
+                    (one_day_provider_data.times - run_ms).tolist(),
+                    np.round(bids, self.digits).tolist(),
+                    np.round(asks, self.digits).tolist(),
+                    volumes.tolist(),
+                ):
                     daily_tick_csv_writer.writerow(
                         [
-                            round((time - run_utc).total_seconds() * 1_000.0, 3),  # type:ignore
+                            float(time_ms),
                             f"{bid:.{self.digits}f}",
                             f"{ask:.{self.digits}f}",
-                            f"{volume_bid}",
-                            f"{volume_ask}",
+                            f"{volume}",
+                            f"{volume}",
                         ]
                     )
 
                 # Write tick file to cache
                 self._write_zip_file(tick_folder, run_utc, daily_tick_csv_buffer, "tick")
+                checksum = f"{zlib.crc32(daily_tick_csv_buffer.getvalue().encode()):08x}"
+                catalog.update_day(run_utc, one_day_provider_data, checksum)
 
             run_utc += timedelta(days=1)
 
             # Check if end reached
             if run_utc >= self.api.AllDataEndUtc:
                 break
+        catalog.close()
         return
 
     def _local_time_of_day_to_utc(self, local_time_of_day: timedelta, local_tzinfo: tzinfo) -> timedelta:
@@ -325,15 +386,6 @@ class Symbol:
         )
         return utc_time_of_day
 
-    def _resize_bars(self, bars: Bars):
-        bars.open_times.data = np.delete(  # type:ignore
-            bars.open_times.data, np.s_[bars.count :]  # type:ignore
-        )
-        bars.open_bids.data = np.delete(bars.open_bids.data, np.s_[bars.count :])
-        bars.open_asks.data = np.delete(bars.open_asks.data, np.s_[bars.count :])
-        bars.volume_bids.data = np.delete(bars.volume_bids.data, np.s_[bars.count :])
-        bars.volume_asks.data = np.delete(bars.volume_asks.data, np.s_[bars.count :])
-
     def _resample(self, bars_or_df, new_timeframe_seconds: int):
         """
         Resample bars or DataFrame to a new timeframe for cache file writing only.
@@ -502,31 +554,17 @@ class Symbol:
         # check if tick data rate requested and load it first
         # This is needed to resample bars from ticks if bar files don't exist
         min_start = self.api.AllDataStartUtc
-        if 0 == self.quote_provider.data_rate:
-            # Initialize tick stream - ticks will be processed one at a time, not stored
-            self._init_tick_stream(min_start)
-            # Get first tick to determine min_start (peek at first tick without consuming it)
-            # Save current state
-            saved_day = self._tick_current_day
-            saved_day_bars = self._tick_day_bars
-            saved_day_index = self._tick_day_index
-            saved_day_count = self._tick_day_count
-            
-            # Get first tick
-            first_tick = self._get_next_tick()
-            if first_tick:
-                min_start = first_tick[0]  # time
-                # Restore stream state to start from beginning
-                self._tick_current_day = saved_day
-                self._tick_day_bars = saved_day_bars
-                self._tick_day_index = saved_day_index
-                self._tick_day_count = saved_day_count
-                self._tick_total_processed = 0
-            else:
-                min_start = self.api.robot._BacktestStartUtc.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            if min_start is not None and min_start.tzinfo is None:
-                min_start = min_start.replace(tzinfo=pytz.UTC)
+        # Initialize the stream - ticks (or the bars of a bar provider) are processed one at a time, not stored
+        self._init_tick_stream(min_start)
+        # Peek at the first tick without consuming it to determine min_start
+        first_ms = self.next_tick_ms()
+        if first_ms is not None:
+            min_start = TickDay.from_ms(first_ms)
+        else:
+            min_start = self.api.robot._BacktestStartUtc.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if min_start is not None and min_start.tzinfo is None:
+            min_start = min_start.replace(tzinfo=pytz.UTC)
         
         # Ensure min_start is not None before proceeding
         if min_start is None:
@@ -553,10 +591,6 @@ class Symbol:
 
         min_start = min_start.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        # If using bar data rate, set rate_data to that
-        if 0 != self.quote_provider.data_rate:
-            self.rate_data = self.bars_dictonary[self.quote_provider.data_rate]
-
         # Initialize indicator cache for fast lookup
         self._build_indicator_cache()
 
@@ -601,9 +635,19 @@ class Symbol:
                 csv_buffer.getvalue(),
             )
 
-        # Write the zip file to disk
-        with open(file, "wb") as f:
+        # Write the zip file to disk, renamed when complete so a crash cannot leave a truncated day
+        with open(file + ".tmp", "wb") as f:
             f.write(zip_buffer.getvalue())
+        os.replace(file + ".tmp", file)
+
+    @staticmethod
+    def _check_zip_file(path: str) -> str:
+        """Checksum (crc32 of the csv) of an intact day zip; raises if it is broken"""
+        with ZipFile(path) as zf:
+            bad_member = zf.testzip()
+            if bad_member is not None:
+                raise BadZipFile(f"{path}: {bad_member} is corrupt")
+            return f"{zf.infolist()[0].CRC:08x}"
 
     def _init_tick_stream(self, start: datetime) -> None:
         """
@@ -621,10 +665,33 @@ class Symbol:
         # This way, we'll process all ticks from 12/05 (the last day before the end date)
         # and stop when current_day becomes 2025-12-06 (which is the end date, so we don't process it)
         self._tick_end_day = self.api.robot._BacktestEndUtc.replace(hour=0, minute=0, second=0, microsecond=0)
-        self._tick_day_bars = None
+        self._backtest_start_ms = TickDay.to_ms(self.api.robot._BacktestStartUtc)
+        self._backtest_end_ms = TickDay.to_ms(self.api.robot._BacktestEndUtc)
+        self._tick_day = TickDay.empty()
+        self._tick_bid_points = self._tick_ask_points = np.zeros(0, np.int64)
         self._tick_day_index = 0
         self._tick_day_count = 0
         self._tick_total_processed = 0
+        self._bar_tick_phase = 0
+        self._bar_rest = None
+        self._tick_next_stop = None
+
+        # one bit per timeframe, set by the bars themselves when a bar closes
+        for ndx, bars in enumerate(self.bars_dictonary.values()):
+            bars.dirty_bit = 1 << ndx
+            bars.subscribe_bar_closed(self._on_bar_closed)
+        self._on_bar_dispatch = [
+            (self.bars_dictonary[timeframe].dirty_bit, timeframe) for timeframe in sorted(self._on_bar_timeframes)
+        ]
+        self._on_bar_mask = 0
+        for bit, _ in self._on_bar_dispatch:
+            self._on_bar_mask |= bit
+
+        # Days are loaded ahead on a worker thread (TickPrefetchDepth 0 loads them synchronously)
+        self.close_tick_stream()
+        self._tick_prefetcher = DayPrefetcher(
+            self.quote_provider, self._tick_current_day, self._tick_end_day, self.api.TickPrefetchDepth
+        )
         
         # Create a minimal rate_data object for compatibility (no storage, just for API)
         # For tick streaming, we don't need to store ticks - just track read_index
@@ -633,72 +700,188 @@ class Symbol:
         self.rate_data.count = 999999999  # Large number so read_index never exceeds it (not used for streaming)
         
     
-    def _get_next_tick(self) -> tuple[datetime, float, float, int] | None:
+    def next_tick_ms(self) -> int | None:
         """
-        Get the next tick from the stream.
-        Returns (time, bid, ask) or None if no more ticks.
+        Epoc ms of the next tick without consuming it, None at the end of the stream.
+        O(1) apart from taking the next day from the prefetcher; invalid (NaN) ticks are skipped here.
+        Bar data (TickDay.timeframe_seconds > 0) is streamed the same way, a bar at its open time or, with
+        BarTickSynthesis, as four ticks spread over the bar.
         """
-        # Load next day if current day is exhausted
-        while self._tick_day_index >= self._tick_day_count:
-            # Stop when current_day exceeds end_day (end_day is inclusive, so process all ticks from end_day)
-            # _BacktestEndUtc is exclusive (e.g., 2025-12-06 00:00:00 means process up to but not including 12/06)
-            # But _tick_end_day is set to 2025-12-06 00:00:00, so we want to process all ticks from 12/06
-            # and stop when current_day becomes 2025-12-07 00:00:00
-            if self._tick_current_day > self._tick_end_day:
-                return None  # No more ticks
-            
-            # Load next day
-            error, _, day_bars = self.quote_provider.get_day_at_utc(self._tick_current_day)
-            if error == "":
-                self._tick_day_bars = day_bars
-                # For tick data, count is length of list (NOT ringbuffer - ticks never go into ringbuffers)
-                if hasattr(day_bars, 'open_times_list'):
-                    self._tick_day_count = len(day_bars.open_times_list)
-                else:
-                    # Fallback: should not happen, but handle gracefully
-                    self._tick_day_count = 0
-                self._tick_day_index = 0
-            else:
-                pass
-                self._tick_day_bars = None
-                self._tick_day_count = 0
+        while True:
+            # Load next day if current day is exhausted
+            while self._tick_day_index >= self._tick_day_count:
+                # The prefetcher stops after _tick_end_day (end_day is inclusive, so process all ticks from end_day)
+                # _BacktestEndUtc is exclusive (e.g., 2025-12-06 00:00:00 means process up to but not including 12/06)
+                # But _tick_end_day is set to 2025-12-06 00:00:00, so we want to process all ticks from 12/06
+                # and stop when current_day becomes 2025-12-07 00:00:00
+                next_day = self._tick_prefetcher.next_day()
+                if next_day is None:
+                    return None  # No more ticks
+
+                _, self._tick_day = next_day
+                self._tick_day_count = self._tick_day.count
+                self._tick_next_stop = None
+                if 0 == self._tick_day.timeframe_seconds:
+                    # integer points of the whole day at once; the filter compares ints per tick
+                    self._tick_bid_points, self._tick_ask_points = self._tick_day.points(self._point_size)
+                    if self.api.TickPrefilter:
+                        self._prefilter_tick_day()
                 self._tick_day_index = 0
-            
-            self._tick_current_day += timedelta(days=1)
-        
-        # Get tick from current day
-        if self._tick_day_bars is None or self._tick_day_index >= self._tick_day_count:
+                self._tick_current_day += timedelta(days=1)
+
+            index = self._tick_day_index
+            if math.isnan(self._tick_day.bids.item(index)) or math.isnan(self._tick_day.asks.item(index)):
+                self._tick_day_index += 1  # Invalid tick - skip and try next
+                continue
+            # synthesized ticks of a bar are a quarter of the bar apart
+            return self._tick_day.times.item(index) + self._bar_tick_phase * self._tick_day.timeframe_seconds * 250
+
+    def _on_bar_closed(self, bars: Bars):
+        self.new_bar_mask |= bars.dirty_bit
+
+    def _prefilter_tick_day(self):
+        """
+        Vectorized part of the unchanged-quote filter, done once per loaded tick day.
+        A tick repeating bid and ask of the previous valid tick can neither pass the filter nor move a bar's
+        prices, it only adds volume unless it opens a new bar; _skip_repeated_ticks hands whole runs of such
+        ticks to the bars at once. All other ticks (always the first valid one of the day) are stops which
+        go through the per-tick path.
+        """
+        day = self._tick_day
+        count = day.count
+        valid = ~(np.isnan(day.bids) | np.isnan(day.asks))
+        valid_ndx = np.flatnonzero(valid)
+        repeat = np.zeros(count, dtype=bool)
+        repeat[valid_ndx[1:]] = (day.bids[valid_ndx[1:]] == day.bids[valid_ndx[:-1]]) & (
+            day.asks[valid_ndx[1:]] == day.asks[valid_ndx[:-1]]
+        )
+
+        # index of the next stop at or after each tick (count: none left); invalid ticks are never stops
+        stops = np.where(valid & ~repeat, np.arange(count), count)
+        self._tick_next_stop = np.minimum.accumulate(stops[::-1])[::-1]
+
+        # running tick count and TickVolume of the valid ticks, a run [i, j) is a difference of two items
+        volumes = np.ones(count, dtype=np.int64) if day.volumes is None else day.volumes.astype(np.int64)
+        self._tick_valid_cum = np.concatenate(([0], np.cumsum(valid)))
+        self._tick_volume_cum = np.concatenate(([0], np.cumsum(np.where(valid, volumes, 0))))
+
+    def _skip_repeated_ticks(self, until_ms: int | None) -> bool:
+        """
+        Feed the run of repeated ticks at the cursor to the bars as volume and move the cursor past it.
+        The run ends before the next stop, the first tick opening a bar and the first tick after until_ms;
+        returns False if there was nothing to skip.
+        """
+        index = self._tick_day_index
+        next_stop = self._tick_next_stop.item(index)
+        if next_stop == index:
+            return False
+
+        limit = TickDay.to_ms(datetime.max) if until_ms is None else until_ms + 1
+        for bars in self.bars_dictonary.values():
+            if bars.timeframe_seconds > 0:
+                if 0 == bars.count:
+                    return False
+                limit = min(limit, bars._next_bar_start_ms)
+        end = index + int(np.searchsorted(self._tick_day.times[index:next_stop], limit))
+        if end == index:
+            return False
+
+        tick_count = self._tick_valid_cum.item(end) - self._tick_valid_cum.item(index)
+        tick_volume = self._tick_volume_cum.item(end) - self._tick_volume_cum.item(index)
+        for bars in self.bars_dictonary.values():
+            bars.add_repeated_ticks(tick_count, tick_volume)
+        self._tick_total_processed += tick_count
+        self._tick_day_index = end
+        return True
+
+    def _get_next_tick(self) -> tuple[int, float, float, int, int, int] | None:
+        """
+        Get the next tick from the stream.
+        Returns (time_ms, bid, ask, vol_delta, bid_points, ask_points) or None if no more ticks;
+        the points are bid and ask as integer multiples of point_size.
+        """
+        time_ms = self.next_tick_ms()
+        if time_ms is None:
             return None
-        
-        # Validate indices before accessing (ticks use regular lists, not ringbuffers)
-        if (self._tick_day_bars is None or 
-            self._tick_day_index >= len(self._tick_day_bars.open_times_list) or
-            self._tick_day_index >= len(self._tick_day_bars.open_bids_list) or
-            self._tick_day_index >= len(self._tick_day_bars.open_asks_list)):
-            # Index out of range - move to next day
-            self._tick_day_index = self._tick_day_count  # Force load next day
-            return self._get_next_tick()  # Recursively get next tick
-        
-        # TICKS NEVER GO INTO RINGBUFFERS - use regular lists
-        time = self._tick_day_bars.open_times_list[self._tick_day_index]
-        bid = self._tick_day_bars.open_bids_list[self._tick_day_index]
-        ask = self._tick_day_bars.open_asks_list[self._tick_day_index]
-        # Retrieve volume delta stored in volume_bids_list
-        vol_delta = int(self._tick_day_bars.volume_bids_list[self._tick_day_index])
-        
-        # Validate tick data
-        import math
-        if (time is None or 
-            bid is None or math.isnan(bid) or 
-            ask is None or math.isnan(ask)):
-            # Invalid tick - skip and try next
-            self._tick_day_index += 1
-            return self._get_next_tick()  # Recursively get next tick
-        
-        self._tick_day_index += 1
+
+        # Read the tick at the cursor; columns are numpy arrays, item() hands out plain Python scalars
+        day = self._tick_day
+        index = self._tick_day_index
+        volumes = day.volumes
+        vol_delta = 1 if volumes is None else int(volumes.item(index))
         self._tick_total_processed += 1
-        
-        return (time, bid, ask, vol_delta)
+
+        if 0 == day.timeframe_seconds:
+            self._tick_day_index += 1
+            return (
+                time_ms,
+                day.bids.item(index),
+                day.asks.item(index),
+                vol_delta,
+                self._tick_bid_points.item(index),
+                self._tick_ask_points.item(index),
+            )
+
+        # Bar data: the bar's open, the rest of it is merged into the bars when the next bar opens
+        bar = self._bar_prices(day, index)
+        if not self.api.BarTickSynthesis:
+            self._tick_day_index += 1
+            self._bar_rest = bar[1:4] + bar[5:8]
+            return self._bar_tick(time_ms, bar[0], bar[4], vol_delta)
+
+        # BarTickSynthesis: open, low, high, close for a rising bar and open, high, low, close else
+        phase = self._bar_tick_phase
+        if 1 == phase or 2 == phase:
+            phase = 3 - phase if bar[3] >= bar[0] else phase
+        if 3 == self._bar_tick_phase:
+            self._tick_day_index += 1
+            self._bar_tick_phase = 0
+        else:
+            self._bar_tick_phase += 1
+        return self._bar_tick(time_ms, bar[phase], bar[4 + phase], vol_delta if 0 == phase else 0)
+
+    def _bar_tick(
+        self, time_ms: int, bid: float, ask: float, vol_delta: int
+    ) -> tuple[int, float, float, int, int, int]:
+        """Tick tuple of a bar step; bar rows are few, so their points are rounded one by one"""
+        point_size = self._point_size
+        return (time_ms, bid, ask, vol_delta, round(bid / point_size), round(ask / point_size))
+
+    @staticmethod
+    def _bar_prices(day: TickDay, index: int) -> tuple[float, float, float, float, float, float, float, float]:
+        """Bid open, high, low, close and ask open, high, low, close of a bar row (close only rows: all close)"""
+        bid = day.bids.item(index)
+        ask = day.asks.item(index)
+        return (
+            bid if day.open_bids is None else day.open_bids.item(index),
+            bid if day.high_bids is None else day.high_bids.item(index),
+            bid if day.low_bids is None else day.low_bids.item(index),
+            bid,
+            ask if day.open_asks is None else day.open_asks.item(index),
+            ask if day.high_asks is None else day.high_asks.item(index),
+            ask if day.low_asks is None else day.low_asks.item(index),
+            ask,
+        )
+
+    def _close_source_bar(self):
+        """Merge high/low/close of the last streamed bar (BarTickSynthesis off) into all bars"""
+        if self._bar_rest is not None:
+            for bars in self.bars_dictonary.values():
+                bars.merge_bar_rest(*self._bar_rest)
+            self._bar_rest = None
+
+    def close_tick_stream(self):
+        """Stop the day prefetcher of the tick stream (if any)"""
+        if self._tick_prefetcher is not None:
+            self._tick_prefetcher.close()
+            self._tick_io_stall_closed += self._tick_prefetcher.stall_seconds
+            self._tick_prefetcher = None
+
+    @property
+    def tick_io_stall_seconds(self) -> float:
+        """Time the tick streams of this symbol spent waiting for days to be loaded (all runs so far)"""
+        current = 0.0 if self._tick_prefetcher is None else self._tick_prefetcher.stall_seconds
+        return self._tick_io_stall_closed + current
 
     def _load_bars(self, timeframe: int, start: datetime) -> datetime:
         # Bars should NOT be preloaded - they will be built incrementally from ticks
@@ -811,7 +994,7 @@ class Symbol:
         return extracted_datetime
 
     # @jit()
-    def symbol_on_tick(self) -> str:
+    def symbol_on_tick(self, until_ms: int | None = None) -> str:
         """
         Internal tick processing workflow:
         1. Get next tick from stream (one at a time, not stored)
@@ -819,90 +1002,87 @@ class Symbol:
         3. Calculate dependent indicators first (e.g., SMA before Bollinger Bands)
         4. Calculate independent indicators
         5. When BacktestStart is reached, call user's OnTick
+
+        until_ms: when the next tick is later (another symbol is due first), "Tick pending" is returned
+        instead of consuming it; ticks filtered as unchanged before it have fed the bars already.
+        With KitaApi.TickPrefilter, runs of repeated quotes found per day by _prefilter_tick_day go to the bars
+        as volume in one step; only the other ticks pass the per-tick filter below.
+
+        Bar data (data_rate != 0) is replayed bar by bar: each bar opens all bars at its open time and open
+        prices, its high/low/close are merged when the next bar opens, so nothing is seen ahead of time.
+        With KitaApi.BarTickSynthesis each bar becomes four ticks (open, extremes, close) instead.
         """
-        # Get next tick from stream (one at a time, not stored)
-        if 0 == self.quote_provider.data_rate:
-            # Tick data: get from stream
+        # Get next tick from stream (one at a time, not stored), bar data the same way bar by bar
+        while True:
+            next_ms = self.next_tick_ms()
+            if self._tick_next_stop is not None and next_ms is not None and self._skip_repeated_ticks(until_ms):
+                continue  # a run of repeated quotes went to the bars as volume
+
+            if until_ms is not None and next_ms is not None and next_ms > until_ms:
+                return "Tick pending"
+
+            self._close_source_bar()
+            tick_data = self._get_next_tick()
+            if tick_data is None:
+                pass
+                return "End reached"
             
+            time_ms, bid, ask, vol_delta, bid_points, ask_points = tick_data
             
-            while True:
-                tick_data = self._get_next_tick()
-                if tick_data is None:
-                    pass
-                    return "End reached"
-                
-                time, bid, ask, vol_delta = tick_data
-                
-                # Reset stop flag before processing bars
-                self._should_stop_processing = False
-                
-                bars_changed = False
-                for bars in self.bars_dictonary.values():
-                    previous_count = bars.count
-                    previous_read_index = bars.read_index
-                    bars.bars_on_tick(time, bid, ask, vol_delta)
-                    if bars.count != previous_count or bars.read_index != previous_read_index or bars.is_new_bar:
-                        bars_changed = True
-                
-                # Check if any bar signaled to stop (because it would be >= BacktestEndUtc)
-                # This happens when bars_on_tick detects that a new bar would start at or after BacktestEndUtc
-                if hasattr(self, '_should_stop_processing') and self._should_stop_processing:
-                    return "End reached"  # Stop processing this tick and signal end
-
-                # FILTERING: Check if user's OnTick should be called
-                digits = self.digits
-                round_factor = 10 ** digits
-                bid_rounded = round(bid * round_factor) / round_factor
-                ask_rounded = round(ask * round_factor) / round_factor
-                prev_bid_rounded = round(self.prev_bid * round_factor) / round_factor if self.prev_bid != 0.0 else 0.0
-                prev_ask_rounded = round(self.prev_ask * round_factor) / round_factor if self.prev_ask != 0.0 else 0.0
-                
-                # Rule: Call OnTick if price changed OR a bar closed
-                price_changed = (self.prev_bid == 0.0 and self.prev_ask == 0.0) or \
-                                bid_rounded != prev_bid_rounded or ask_rounded != prev_ask_rounded
-                
-                if not price_changed and not bars_changed:
-                    
-                    continue
-                
-                # Tick accepted
-                self.time = time
-                self.bid = bid
-                self.ask = ask
-                self.prev_bid = bid
-                self.prev_ask = ask
-                self.rate_data.read_index += 1
-                
-                # Log progress
-                if self._tick_total_processed % 10000 == 0:
-                    pass
-                break
-        else:
-            # Bar data: use DataSeries (not implemented for streaming yet)
+            # Reset stop flag before processing bars
+            self._should_stop_processing = False
+            
+            bars_changed = False
+            for bars in self.bars_dictonary.values():
+                previous_count = bars.count
+                previous_read_index = bars.read_index
+                bars.bars_on_tick(time_ms, bid, ask, vol_delta)
+                if bars.count != previous_count or bars.read_index != previous_read_index or bars.is_new_bar:
+                    bars_changed = True
+            
+            # Check if any bar signaled to stop (because it would be >= BacktestEndUtc)
+            # This happens when bars_on_tick detects that a new bar would start at or after BacktestEndUtc
+            if hasattr(self, '_should_stop_processing') and self._should_stop_processing:
+                return "End reached"  # Stop processing this tick and signal end
+
+            # FILTERING: Check if user's OnTick should be called
+            # Rule: Call OnTick if price changed at the symbol's resolution (integer points) OR a bar closed
+            price_changed = bid_points != self._prev_bid_points or ask_points != self._prev_ask_points
+            
+            # every streamed bar is accepted (_bar_rest set), synthesized bar ticks are filtered like ticks
+            if not price_changed and not bars_changed and self._bar_rest is None:
+                continue
+            
+            # Tick accepted
+            self.time_ms = time_ms
+            self.bid = bid
+            self.ask = ask
+            self.prev_bid = bid
+            self.prev_ask = ask
+            self._prev_bid_points = bid_points
+            self._prev_ask_points = ask_points
             self.rate_data.read_index += 1
-            if self.rate_data.read_index >= self.rate_data.count:
-                return "End reached"
-            self.time = self.rate_data.open_times.last(0)
-            self.bid = self.rate_data.open_bids.last(0)
-            self.ask = self.rate_data.open_asks.last(0)
-            bars_changed = True # Always count as change for bars data
+            
+            # Log progress
+            if self._tick_total_processed % 10000 == 0:
+                pass
+            break
 
         # Debug first few ticks
         # Safety check: ensure time is not None
-        if self.time is None:
+        if self.time_ms is None:
             pass
             return "End reached"
 
-        # Compare symbol.time (UTC) directly with _BacktestStartUtc (UTC) to avoid timezone conversion issues
-        # symbol.time is in UTC from tick data, so compare with UTC start time
-        self.is_warm_up = self.time < self.api.robot._BacktestStartUtc
+        # Compare epoc ms (UTC) with _BacktestStartUtc as epoc ms, no datetime is needed per tick
+        self.is_warm_up = self.time_ms < self._backtest_start_ms
 
         # Step 2: Calculate indicators in dependency order
         # IMPORTANT: Indicators are ALWAYS calculated, regardless of warmup status
         # Warmup only affects whether OnTick/OnBar callbacks are called, not indicator calculation
         if bars_changed or self._has_close_indicators():
             # Debug: Log when indicators are being calculated (only for first few or periodically)
-            if hasattr(self, 'api') and hasattr(self.api, 'robot') and hasattr(self.api.robot, '_debug_log'):
+            if getattr(self.api.robot, '_debug_log_file', None) is not None:
                 if not self.is_warm_up or (hasattr(self, '_tick_total_processed') and self._tick_total_processed < 100):
                     self.api.robot._debug_log(f"[Symbol] _calculate_indicators_optimized called: bars_changed={bars_changed}, time={self.time}, is_warm_up={self.is_warm_up}")
             self._calculate_indicators_optimized(bars_changed)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Optional
+from datetime import datetime, timedelta
+import math
+import pytz
+import numpy as np
+
+
+class TickDay:
+    """
+    One day of quotes as returned by QuoteProvider.get_day_at_utc().
+    All columns are contiguous numpy arrays of equal length:
+    - times: int64 epoc milliseconds (UTC)
+    - bids, asks: float64 prices
+    - volumes: optional float64 TickVolume delta per quote (None means 1 per quote)
+    - bid_points, ask_points: optional int64 prices in multiples of point_size, as decoded by providers
+      which store integer prices (cTrader, Dukascopy); exact compares need no float rounding
+
+    Bar providers (timeframe_seconds > 0) store one row per bar; bids/asks are then the close prices
+    and the optional open/high/low columns carry the rest of the bar.
+    """
+
+    EPOCH: datetime = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+    MS: timedelta = timedelta(milliseconds=1)
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        bids: np.ndarray,
+        asks: np.ndarray,
+        volumes: Optional[np.ndarray] = None,
+        timeframe_seconds: int = 0,
+        open_bids: Optional[np.ndarray] = None,
+        high_bids: Optional[np.ndarray] = None,
+        low_bids: Optional[np.ndarray] = None,
+        open_asks: Optional[np.ndarray] = None,
+        high_asks: Optional[np.ndarray] = None,
+        low_asks: Optional[np.ndarray] = None,
+        bid_points: Optional[np.ndarray] = None,
+        ask_points: Optional[np.ndarray] = None,
+        point_size: float = 0.0,
+    ):
+        self.times = np.ascontiguousarray(times, dtype=np.int64)
+        self.bids = np.ascontiguousarray(bids, dtype=np.float64)
+        self.asks = np.ascontiguousarray(asks, dtype=np.float64)
+        self.volumes = None if volumes is None else np.ascontiguousarray(volumes, dtype=np.float64)
+        self.timeframe_seconds = timeframe_seconds
+        self.open_bids = self._optional(open_bids)
+        self.high_bids = self._optional(high_bids)
+        self.low_bids = self._optional(low_bids)
+        self.open_asks = self._optional(open_asks)
+        self.high_asks = self._optional(high_asks)
+        self.low_asks = self._optional(low_asks)
+        self.bid_points = None if bid_points is None else np.ascontiguousarray(bid_points, dtype=np.int64)
+        self.ask_points = None if ask_points is None else np.ascontiguousarray(ask_points, dtype=np.int64)
+        self.point_size = point_size
+        assert len(self.times) == len(self.bids) == len(self.asks), "TickDay columns differ in length"
+
+    @staticmethod
+    def _optional(column: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        return None if column is None else np.ascontiguousarray(column, dtype=np.float64)
+
+    @classmethod
+    def empty(cls, timeframe_seconds: int = 0) -> TickDay:
+        return cls(np.zeros(0, np.int64), np.zeros(0), np.zeros(0), timeframe_seconds=timeframe_seconds)
+
+    @classmethod
+    def concatenate(cls, parts: list[TickDay]) -> TickDay:
+        """Join consecutive pieces (e.g. the hours of a day) into one TickDay"""
+        parts = [part for part in parts if part.count > 0]
+        if not parts:
+            return cls.empty()
+        if 1 == len(parts):
+            return parts[0]
+
+        volumes = None
+        if all(part.volumes is not None for part in parts):
+            volumes = np.concatenate([part.volumes for part in parts])  # type: ignore
+        bid_points = ask_points = None
+        point_size = parts[0].point_size
+        if all(part.bid_points is not None and part.point_size == point_size for part in parts):
+            bid_points = np.concatenate([part.bid_points for part in parts])  # type: ignore
+            ask_points = np.concatenate([part.ask_points for part in parts])  # type: ignore
+        return cls(
+            np.concatenate([part.times for part in parts]),
+            np.concatenate([part.bids for part in parts]),
+            np.concatenate([part.asks for part in parts]),
+            volumes,
+            parts[0].timeframe_seconds,
+            bid_points=bid_points,
+            ask_points=ask_points,
+            point_size=point_size if bid_points is not None else 0.0,
+        )
+
+    @property
+    def count(self) -> int:
+        return len(self.times)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns"""
+        columns = [
+            self.times,
+            self.bids,
+            self.asks,
+            self.volumes,
+            self.open_bids,
+            self.high_bids,
+            self.low_bids,
+            self.open_asks,
+            self.high_asks,
+            self.low_asks,
+            self.bid_points,
+            self.ask_points,
+        ]
+        return sum(column.nbytes for column in columns if column is not None)
+
+    def time_at(self, index: int) -> datetime:
+        """UTC datetime of the quote at index"""
+        return self.EPOCH + timedelta(milliseconds=int(self.times[index]))
+
+    def points(self, point_size: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Bid and ask as int64 multiples of point_size (e.g. a symbol's point size), for the whole day at once.
+        Taken from the integer columns when their point size divides or equals point_size, else rounded
+        from the float prices.
+        """
+        if self.bid_points is not None and self.ask_points is not None and self.point_size > 0:
+            factor = round(point_size / self.point_size)
+            if factor >= 1 and math.isclose(factor * self.point_size, point_size, rel_tol=1e-9):
+                if 1 == factor:
+                    return self.bid_points, self.ask_points
+                half = factor // 2  # integer rounding to the coarser point
+                return (self.bid_points + half) // factor, (self.ask_points + half) // factor
+
+        with np.errstate(invalid="ignore"):  # NaN quotes are skipped by the stream anyway
+            return (
+                np.rint(self.bids / point_size).astype(np.int64),
+                np.rint(self.asks / point_size).astype(np.int64),
+            )
+
+    @classmethod
+    def to_ms(cls, time: datetime) -> int:
+        """Epoc ms of a datetime; naive datetimes are taken as UTC"""
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=pytz.UTC)
+        return (time - cls.EPOCH) // cls.MS
+
+    @classmethod
+    def from_ms(cls, time_ms: int) -> datetime:
+        """UTC datetime of epoc ms"""
+        return cls.EPOCH + timedelta(milliseconds=time_ms)
+
+
+# end of file
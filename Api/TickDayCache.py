@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Optional
+import os
+import json
+import numpy as np
+from Api.TickDay import TickDay
+
+
+class TickDayCache:
+    """
+    Persistent uncompressed copy of decoded days, one folder per day holding an .npy file per
+    TickDay column plus header.json. Days are opened as read-only memmaps, so loading
+    is zero-copy and the OS page cache is shared by all processes reading the same day
+    (e.g. optimizer workers).
+
+    The header records size and mtime of the source file; a changed source invalidates the day.
+    """
+
+    VERSION = 2
+    HEADER_NAME = "header.json"
+    COLUMNS = ("times", "bids", "asks", "volumes", "bid_points", "ask_points")
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+
+    def load(self, day_name: str, source_path: str) -> Optional[TickDay]:
+        """Return the cached day or None if it is missing or stale"""
+        folder = os.path.join(self.root_path, day_name)
+        try:
+            with open(os.path.join(folder, self.HEADER_NAME), "r", encoding="utf-8") as file:
+                header = json.load(file)
+            if header != self._make_header(source_path, header["count"], header["columns"], header["point_size"]):
+                return None
+
+            # open_memmap only takes the .npy format (np.load would also open a foreign file as .npz)
+            columns = {
+                name: np.lib.format.open_memmap(os.path.join(folder, name + ".npy"), mode="r")
+                for name in header["columns"]
+            }
+        except (OSError, ValueError, KeyError):
+            return None
+
+        if any(len(column) != header["count"] for column in columns.values()):
+            return None
+        if 0 == header["count"]:
+            return TickDay.empty()
+        return TickDay(
+            columns["times"],
+            columns["bids"],
+            columns["asks"],
+            columns.get("volumes"),
+            bid_points=columns.get("bid_points"),
+            ask_points=columns.get("ask_points"),
+            point_size=header["point_size"],
+        )
+
+    def store(self, day_name: str, source_path: str, tick_day: TickDay):
+        """Write a decoded day; the header is written last so readers never accept a partial day"""
+        folder = os.path.join(self.root_path, day_name)
+        os.makedirs(folder, exist_ok=True)
+        columns = [name for name in self.COLUMNS if getattr(tick_day, name) is not None]
+        suffix = f".{os.getpid()}.tmp"
+
+        for name in columns:
+            target = os.path.join(folder, name + ".npy")
+            with open(target + suffix, "wb") as file:
+                np.save(file, getattr(tick_day, name))
+            os.replace(target + suffix, target)
+
+        target = os.path.join(folder, self.HEADER_NAME)
+        with open(target + suffix, "w", encoding="utf-8") as file:
+            json.dump(self._make_header(source_path, tick_day.count, columns, tick_day.point_size), file)
+        os.replace(target + suffix, target)
+
+    def _make_header(self, source_path: str, count: int, columns: list[str], point_size: float) -> dict:
+        stat = os.stat(source_path)
+        return {
+            "version": self.VERSION,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "count": count,
+            "columns": columns,
+            "point_size": point_size,
+        }
+
+
+# end of file
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Optional
+import heapq
+
+if TYPE_CHECKING:
+    from Api.Symbol import Symbol
+
+
+class TickScheduler:
+    """
+    Chronological k-way merge of the tick streams of several symbols.
+
+    A heap holds (next tick epoc ms, symbol order, symbol) for every symbol with ticks left, the next tick
+    time is peeked from the symbol's stream without consuming it (Symbol.next_tick_ms). The earliest entry
+    is dispatched next; on equal times the symbol requested first goes first.
+    """
+
+    def __init__(self, symbols: Iterable[Symbol]):
+        self._heap: list[tuple[int, int, Symbol]] = []
+        for order, symbol in enumerate(symbols):
+            self.push(order, symbol)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def next_ms(self) -> Optional[int]:
+        """Epoc ms of the earliest pending tick over all symbols, None when all streams have ended"""
+        return self._heap[0][0] if self._heap else None
+
+    def push(self, order: int, symbol: Symbol):
+        """(Re)insert a symbol at its next tick time; a symbol at the end of its stream is dropped"""
+        time_ms = symbol.next_tick_ms()
+        if time_ms is not None:
+            heapq.heappush(self._heap, (time_ms, order, symbol))
+
+    def pop(self) -> tuple[int, Symbol, Optional[int]]:
+        """
+        Remove the earliest symbol and return (order, symbol, until_ms).
+        The symbol may consume its ticks up to until_ms before another symbol is due (None: no other symbol).
+        """
+        _, order, symbol = heapq.heappop(self._heap)
+        if not self._heap:
+            return order, symbol, None
+
+        next_ms, next_order, _ = self._heap[0]
+        return order, symbol, next_ms if order < next_order else next_ms - 1
+
+
+# end of file
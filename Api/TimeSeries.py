@@ -1,34 +1,42 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Iterator, Any
+from typing import TYPE_CHECKING, Iterator, Any, Optional
 from datetime import datetime
 import numpy as np
 from Api.ring_buffer import Ringbuffer
+from Api.BarRing import TimeColumn
 
 if TYPE_CHECKING:
     from Api.Bars import Bars
 
 
 class TimeSeries:
-    data: Ringbuffer[datetime]
+    data: Ringbuffer[datetime] | TimeColumn
     _parent: Bars
     _size: int
-    _add_count: int  # Total number of values added (linear count, for mapping absolute indices)
 
-    def __init__(self, _parent: Bars, _size: int):
+    def __init__(self, _parent: Bars, _size: int, data: Optional[TimeColumn] = None):
         """
-        Initialize a TimeSeries with a ring buffer.
+        Initialize a TimeSeries with a ring buffer (or the time column of the parent's BarRing).
         """
         self._parent = _parent
         self._size = _size
-        self._add_count = 0  # Track total number of values added (linear count)
-        self.data = Ringbuffer[datetime](_size)  # Use true ringbuffer
+        self.data = Ringbuffer[datetime](_size) if data is None else data  # Use true ringbuffer
+
+    @property
+    def _add_count(self) -> int:
+        """Total number of values added (linear count, for mapping absolute indices)"""
+        return self.data._add_count
+
     def resize(self, new_size: int) -> None:
         """
         Resize the underlying Ringbuffer while preserving existing data.
         """
         if new_size <= self._size:
             return
-            
+        if isinstance(self.data, TimeColumn):
+            self._size = new_size  # the parent Bars resizes the shared BarRing
+            return
+
         old_buffer = self.data
         self._size = new_size
         self.data = Ringbuffer[datetime](new_size)
@@ -37,7 +45,7 @@ class TimeSeries:
         for i in range(old_buffer._count - 1, -1, -1):
             self.data.add(old_buffer[i])
         
-        # _add_count remains the same (total added since start)
+        self.data._add_count = old_buffer._add_count  # remains the same (total added since start)
 
 
     def __iter__(self) -> Iterator[datetime]:
@@ -61,7 +69,6 @@ class TimeSeries:
         """
         # Simply add to ringbuffer - it will overwrite oldest when full (circular behavior)
         self.data.add(value)
-        self._add_count += 1
     
     def append_ring(self, value: datetime, position: int):
         """
@@ -75,7 +82,6 @@ class TimeSeries:
         # If we need to set at a specific position, we need to use __setitem__
         # But append_ring is legacy - for new code, use add() directly
         self.data.add(value)
-        self._add_count += 1  # Increment linear count
 
     def last(self, index: int) -> datetime:
         """
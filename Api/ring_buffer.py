@@ -1,4 +1,5 @@
 from typing import Generic, TypeVar, Optional, Iterator, Any
+import numpy as np
 
 T = TypeVar("T")  # Generic type for the _buffer
 
@@ -216,3 +217,166 @@ class Ringbuffer(Generic[T]):
         if not self._count:
             return None
         return self[0]
+
+
+class NumpyRingbuffer(Ringbuffer[float]):
+    """
+    Float ring buffer on a preallocated numpy float64 array, API as Ringbuffer (NaN marks empty slots).
+    Every value is written twice, at slot i and i + _size (mirror), so the newest n <= _size values are
+    always a contiguous slice: window(n) returns them without copying, ready for numpy/talib.
+    """
+
+    def __init__(self, _size: int):
+        """
+        Initializes a ring _buffer with the specified _size (2 * _size float64 for the mirror).
+        """
+        Ringbuffer.__init__(self, _size)
+        self._buffer = np.full(2 * _size, np.nan)  # type: ignore
+        # windows are sliced from a read-only alias: writes must go to both copies (_write)
+        self._read_only = self._buffer.view()
+        self._read_only.flags.writeable = False
+
+    def __getitem__(self, rel_pos: int) -> float:
+        if self._count < 1:
+            raise IndexError("Must add a ring _buffer slot after initialization")
+        if rel_pos < 0 or rel_pos >= self._size:
+            raise IndexError("Index out of range")
+        # newest value (rel_pos=0) is at slot (_position - 1)
+        return self._buffer.item((self._position - 1 - rel_pos) % self._size)  # type: ignore
+
+    def __setitem__(self, rel_pos: int, value: float):
+        if self._count < 1:
+            raise IndexError("Must add a ring _buffer slot after initialization")
+        slot = (self._position - 1 - rel_pos) % self._size
+        buffer = self._buffer
+        buffer[slot] = buffer[slot + self._size] = value  # type: ignore
+
+    def _write(self, slot: int, value: Any):
+        buffer = self._buffer
+        buffer[slot] = buffer[slot + self._size] = value  # type: ignore
+
+    def window(self, length: int) -> np.ndarray:
+        """
+        The newest min(length, _count) values, oldest first, as a read-only view into the buffer (no copy).
+        The view is only valid until the next add: it shows the slots, not the values at the time of the call.
+        """
+        length = min(length, self._count)
+        end = self._position + self._size
+        return self._read_only[end - length : end]
+
+    def add(self, item: float):
+        """
+        Adds a new item to the _buffer.
+        """
+        slot = self._position
+        buffer = self._buffer
+        buffer[slot] = buffer[slot + self._size] = item  # type: ignore
+        self._position = (slot + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+        self._version += 1
+        self._add_count += 1
+        if not self._is_fallout_valid and self._add_count > self._size:
+            self._is_fallout_valid = True
+
+    def add_with_details(self, item: float, out_ndx: bool = False, out_fallout: bool = False) -> Any:
+        """
+        Adds a new item to the _buffer and returns details (index, fallout; NaN if the slot was empty).
+        """
+        ndx = self._position
+        fall_out = self._buffer.item(ndx)  # type: ignore
+
+        self._write(ndx, item)
+        self._position = (ndx + 1) % self._size
+
+        if self._count < self._size:
+            self._count += 1
+
+        self._version += 1
+        self._add_count += 1
+
+        if not self._is_fallout_valid and self._add_count > self._size:
+            self._is_fallout_valid = True
+
+        if out_ndx and out_fallout:
+            return ndx, fall_out
+        elif out_ndx:
+            return ndx
+        elif out_fallout:
+            return fall_out
+
+    def exchange(self, item: float):
+        """
+        Replaces the most recent item in the buffer with a new one.
+        """
+        if self._count == 0:
+            self.add(item)
+            return
+
+        slot = (self._position - 1) % self._size
+        buffer = self._buffer
+        buffer[slot] = buffer[slot + self._size] = item  # type: ignore
+        self._version += 1
+
+    def clear(self):
+        """
+        Clears the _buffer.
+        """
+        self._buffer.fill(np.nan)  # type: ignore
+        self._position = 0
+        self._count = 0
+        self._version += 1
+
+    def resize(self, new_size: int):
+        """
+        Grows the _buffer in place: the values are block copied oldest first to slot 0 (and its mirror),
+        _add_count stays. Windows taken before are not updated.
+        """
+        if new_size <= self._size:
+            return
+        count = self._count
+        values = self.window(count)
+        buffer = np.full(2 * new_size, np.nan)
+        buffer[:count] = buffer[new_size : new_size + count] = values
+        self._buffer = buffer  # type: ignore
+        self._read_only = buffer.view()
+        self._read_only.flags.writeable = False
+        self._size = new_size
+        self._position = count % new_size
+        self._is_fallout_valid = False  # the next slots are empty
+        self._version += 1
+
+    def remove_at(self, index: int):
+        """
+        Removes the item at the specified index (0 = oldest).
+        """
+        if index < 0 or index >= self._count:
+            raise IndexError("Index out of range")
+        for i in range(index, self._count - 1):
+            self._write(
+                (self._position - self._count + i) % self._size,
+                self._buffer.item((self._position - self._count + i + 1) % self._size),  # type: ignore
+            )
+        self._position = (self._position - 1) % self._size
+        self._write(self._position, np.nan)
+        self._count -= 1
+        self._version += 1
+
+    def lowest(self) -> Optional[float]:
+        """
+        Returns the lowest value in the _buffer.
+        """
+        if not self._count:
+            return None
+        return min(self._buffer[: self._count].tolist())  # type: ignore
+
+    def highest(self) -> Optional[float]:
+        """
+        Returns the highest value in the _buffer.
+        """
+        if not self._count:
+            return None
+        return max(self._buffer[: self._count].tolist())  # type: ignore
+
+
+# end of file
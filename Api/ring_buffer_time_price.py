@@ -1,5 +1,6 @@
 from datetime import datetime
-from ring_buffer import Ringbuffer
+from Api.ring_buffer import Ringbuffer
+from Api.RollingExtremum import RollingExtremum
 import math
 
 
@@ -11,26 +12,34 @@ class RingbufferTimePrice(Ringbuffer[tuple[datetime, float]]):
     def __init__(self, period: int, high_low: int = BOTH):
         """
         Initialize the RingbufferTimePrice with the given period and mode (High, Low, or Both).
+        Only the extrema of the mode are maintained; the other one stays at its empty value.
         """
         super().__init__(period)
         self._quote_sum: float = 0.0
-        self._highest: tuple[datetime, float] = (datetime.min, -math.inf)
-        self._lowest: tuple[datetime, float] = (datetime.min, math.inf)
         self._high_low: int = high_low
+        # monotonic deque trackers: an extremum falling out of the window costs no rescan
+        self._highest_tracker = (
+            None if self.LOW == high_low else RollingExtremum(self, period, True, key=lambda item: item[1])
+        )
+        self._lowest_tracker = (
+            None if self.HIGH == high_low else RollingExtremum(self, period, False, key=lambda item: item[1])
+        )
 
     @property
     def lowest_value(self) -> tuple[datetime, float]:
         """
-        Get the lowest value in the buffer.
+        Get the lowest value in the buffer ((datetime.min, inf) if empty or not maintained (HIGH mode)).
         """
-        return self._lowest
+        lowest = None if self._lowest_tracker is None else self._lowest_tracker.item
+        return (datetime.min, math.inf) if lowest is None else lowest
 
     @property
     def highest_value(self) -> tuple[datetime, float]:
         """
-        Get the highest value in the buffer.
+        Get the highest value in the buffer ((datetime.min, -inf) if empty or not maintained (LOW mode)).
         """
-        return self._highest
+        highest = None if self._highest_tracker is None else self._highest_tracker.item
+        return (datetime.min, -math.inf) if highest is None else highest
 
     def add(self, item: tuple[datetime, float]):
         """
@@ -45,24 +54,6 @@ class RingbufferTimePrice(Ringbuffer[tuple[datetime, float]]):
         if self._is_fallout_valid:
             self._quote_sum -= fallout[1]
 
-            # If old extremum has fallen out, find a new one
-            extrema = None
-            if self._high_low != self.LOW and fallout[1] == self._highest[1]:
-                extrema = self.get_extrema()
-                self._highest = extrema[self.HIGH]
-
-            if self._high_low != self.HIGH and fallout[1] == self._lowest[1]:
-                if extrema is None:
-                    extrema = self.get_extrema()
-                self._lowest = extrema[self.LOW]
-
-        # Update extrema
-        if item[1] > self._highest[1]:
-            self._highest = item
-
-        if item[1] < self._lowest[1]:
-            self._lowest = item
-
     def get_average(self) -> float:
         """
         Get the average value of the prices in the buffer.
@@ -73,7 +64,7 @@ class RingbufferTimePrice(Ringbuffer[tuple[datetime, float]]):
         """
         Get the extrema (highest and lowest values) over the specified range.
         """
-        if count is 0:
+        if 0 == count:
             count = self._count
 
         extrema = [self._buffer[(self._position - count) % self._size]] * 2  # Start with the first value
@@ -0,0 +1,4 @@
+"""
+KitaTrader Benchmarks Package
+Run a benchmark from the repository root, e.g. python -m Benchmarks.bench_zticks_decoder
+"""
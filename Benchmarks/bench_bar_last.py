@@ -0,0 +1,97 @@
+"""
+Benchmark: allocations and time of Bars.Last(n) with a read of Open/High/Low/Close as robots do per tick.
+- dict Bar: a new Bar with 17 instance attributes in a __dict__ per call (Bar before __slots__)
+- slots Bar: a new Bar snapshot with __slots__ per call (BarRing[n])
+- view: Bars.Last(n), the cached BarView of the bar's ring slot
+Allocations are measured with tracemalloc while the returned objects are kept alive, so each call's
+allocation shows (the float values read are not kept).
+Usage: python -m Benchmarks.bench_bar_last [calls]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.TickDay import TickDay
+
+
+class DictBar:
+    """Bar as it was before __slots__"""
+
+    def __init__(self, open_time, open, high, low, close, tick_volume):
+        self.OpenTime = open_time
+        self.Open = open
+        self.High = high
+        self.Low = low
+        self.Close = close
+        self.TickVolume = tick_volume
+        self.open_time = open_time
+        self.open_bid = open
+        self.high_bid = high
+        self.low_bid = low
+        self.close_bid = close
+        self.volume_bid = tick_volume
+        self.open_ask = open
+        self.high_ask = high
+        self.low_ask = low
+        self.close_ask = close
+        self.volume_ask = tick_volume
+
+
+def make_bars() -> Bars:
+    bars = Bars("EURUSD", 60, 99)
+    first_ms = TickDay.to_ms(datetime(2024, 3, 4))
+    for ndx in range(150):
+        bid = 1.08 + ndx * 0.00001
+        open_time = TickDay.from_ms(first_ms + ndx * 60_000)
+        bars.append(open_time, bid, bid + 2e-4, bid - 2e-4, bid, 10.0, bid, bid + 2e-4, bid - 2e-4, bid, 10.0)
+    return bars
+
+
+def last_dict_bar(bars: Bars, index: int) -> DictBar:
+    bar = bars._bar_buffer[index]  # the values as the former Last() read them
+    return DictBar(bar.OpenTime, bar.Open, bar.High, bar.Low, bar.Close, bar.TickVolume)
+
+
+def last_slots_bar(bars: Bars, index: int):
+    return bars._bar_buffer[index]
+
+
+def last_view(bars: Bars, index: int):
+    return bars.Last(index)
+
+
+def read(bar) -> float:
+    return bar.Open + bar.High + bar.Low + bar.Close
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bars = make_bars()
+    for name, last in (("dict Bar", last_dict_bar), ("slots Bar", last_slots_bar), ("view", last_view)):
+        kept = [None] * calls
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for ndx in range(calls):
+            bar = last(bars, ndx % 3)
+            read(bar)
+            kept[ndx] = bar
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del kept
+
+        elapsed = []
+        for _ in range(3):  # best of three
+            start = time.perf_counter()
+            for ndx in range(calls):
+                read(last(bars, ndx % 3))
+            elapsed.append(time.perf_counter() - start)
+        print(f"{name:<10}{allocated / calls:8.1f} bytes/call  {min(elapsed) / calls * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,122 @@
+"""
+Benchmark: memory and append throughput of the bar storage of one Bars object (capacity = bar count).
+- legacy: a Ringbuffer[Bar] plus eleven Ringbuffer-backed DataSeries/TimeSeries fed by append_ring
+  (the layout before BarRing, condensed from the former Bars.append)
+- bar ring: Bars as it is now, one numpy struct-of-arrays BarRing with DataSeries column views
+Memory is the tracemalloc peak while filling, reported per 100k bars.
+Usage: python -m Benchmarks.bench_bar_storage [bars]
+"""
+import sys
+import math
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.Bar import Bar
+from Api.DataSeries import DataSeries
+from Api.TimeSeries import TimeSeries
+from Api.ring_buffer import Ringbuffer
+from Api.TickDay import TickDay
+
+FIRST_MS = TickDay.to_ms(datetime(2024, 3, 4))
+SERIES = (
+    "open_bids",
+    "high_bids",
+    "low_bids",
+    "close_bids",
+    "volume_bids",
+    "open_asks",
+    "high_asks",
+    "low_asks",
+    "close_asks",
+    "volume_asks",
+)
+
+
+class LegacyBars:
+    """The former layout: every bar once as a Bar object and once across eleven parallel ring buffers"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.read_index = -1
+        self._bar_buffer: Ringbuffer[Bar] = Ringbuffer[Bar](size)
+        self.open_times = TimeSeries(self, size)
+        for name in SERIES:
+            setattr(self, name, DataSeries(self, size))
+
+    def append(self, time, open_bid, high_bid, low_bid, close_bid, volume_bid, open_ask, high_ask, low_ask,
+               close_ask, volume_ask):  # fmt: skip
+        vol = volume_bid if not math.isnan(volume_bid) else 0.0
+        bar = Bar(open_time=time, open=open_bid, high=high_bid, low=low_bid, close=close_bid, tick_volume=int(vol))
+        self._bar_buffer.add(bar)
+        self.count = self._bar_buffer._count
+        write_pos = self.count - 1 if self.count < self.size else (self._bar_buffer._position - 1) % self.size
+        self.read_index = write_pos
+        self.open_times.append_ring(time, write_pos)
+        self.open_bids.append_ring(open_bid, write_pos)
+        self.open_asks.append_ring(open_ask, write_pos)
+        self.volume_bids.append_ring(volume_bid, write_pos)
+        self.volume_asks.append_ring(volume_ask, write_pos)
+        self.high_bids.append_ring(high_bid, write_pos)
+        self.low_bids.append_ring(low_bid, write_pos)
+        self.close_bids.append_ring(close_bid, write_pos)
+        self.high_asks.append_ring(high_ask, write_pos)
+        self.low_asks.append_ring(low_ask, write_pos)
+        self.close_asks.append_ring(close_ask, write_pos)
+
+
+def make_bars(count: int) -> list[tuple]:
+    rng = np.random.default_rng(0)
+    closes = (1.08 + np.cumsum(rng.integers(-20, 21, count)) * 0.00001).tolist()
+    volumes = rng.integers(1, 200, count).astype(float).tolist()
+    bars = []
+    for ndx in range(count):
+        bid = closes[ndx]
+        bars.append((FIRST_MS + ndx * 60_000, bid, bid + 0.0002, bid - 0.0002, bid, volumes[ndx]))
+    return bars
+
+
+def fill_legacy(data: list[tuple]) -> LegacyBars:
+    bars = LegacyBars(len(data))
+    for time_ms, bid, high, low, close, volume in data:
+        open_time = TickDay.from_ms(time_ms)  # the former append took datetimes
+        bars.append(open_time, bid, high, low, close, volume, bid, high, low, close, volume)
+    return bars
+
+
+def fill_bar_ring(data: list[tuple]) -> Bars:
+    bars = Bars("EURUSD", 60, len(data))
+    for time_ms, bid, high, low, close, volume in data:
+        open_time = TickDay.from_ms(time_ms)
+        bars.append(open_time, bid, high, low, close, volume, bid, high, low, close, volume)
+    return bars
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    data = make_bars(count)
+    for name, fill in (("legacy", fill_legacy), ("bar ring", fill_bar_ring)):
+        tracemalloc.start()
+        bars = fill(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert bars.count == count and bars.close_bids.last(0) == data[-1][4]
+        del bars
+
+        elapsed = []
+        for _ in range(3):  # best of three
+            start = time.perf_counter()
+            fill(data)
+            elapsed.append(time.perf_counter() - start)
+        per_100k = peak * 100_000 / count / 2**20
+        print(f"{name:<10}{per_100k:8.1f} MiB/100k bars  {count / min(elapsed):>10,.0f} appends/s")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
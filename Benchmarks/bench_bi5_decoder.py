@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: Dukascopy bi5 hour decoding, per-record struct loop vs. numpy view
+Usage: python -m Benchmarks.bench_bi5_decoder [ticks_per_hour]
+"""
+import sys
+import time
+import struct
+import numpy as np
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from pytz import UTC
+from BrokerProvider.QuoteDukascopy import Dukascopy
+from Benchmarks.dukascopy_stand_in import make_hour_records
+
+POINT_SIZE = 0.00001
+HOUR = datetime(2025, 12, 1, 14, tzinfo=UTC)
+
+
+def loop_decode(data: bytes) -> int:
+    """The former _get_hour loop (struct and datetime per record)"""
+    times: list[datetime] = []
+    bids: list[float] = []
+    asks: list[float] = []
+    volume_bids: list[float] = []
+    volume_asks: list[float] = []
+    current_index = 0
+    while current_index < len(data):
+        timestamp = struct.unpack_from(">I", data, current_index)[0]
+        ask = struct.unpack_from(">I", data, current_index + 4)[0] * POINT_SIZE
+        bid = struct.unpack_from(">I", data, current_index + 8)[0] * POINT_SIZE
+        volume_ask = struct.unpack_from(">f", data, current_index + 12)[0]
+        volume_bid = struct.unpack_from(">f", data, current_index + 16)[0]
+        times.append(HOUR + timedelta(milliseconds=timestamp))
+        bids.append(bid)
+        asks.append(ask)
+        volume_bids.append(volume_bid)
+        volume_asks.append(volume_ask)
+        current_index += 20
+    return len(times)
+
+
+def make_numpy_decode():
+    provider = Dukascopy(0, max_workers=1)
+    provider.symbol = SimpleNamespace(point_size=POINT_SIZE)  # type: ignore
+    return lambda data: provider._get_hour(HOUR, data).count
+
+
+def measure(name: str, decode, data: bytes) -> float:
+    start = time.perf_counter()
+    count = decode(data)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14}{count:>12,} ticks  {elapsed:8.4f} s  {count / elapsed:>14,.0f} ticks/s")
+    return elapsed
+
+
+def main():
+    tick_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = make_hour_records(tick_count).tobytes()
+    print(f"Decoding one synthetic busy hour with {tick_count:,} ticks ({len(data) / 1e6:.1f} MB uncompressed)")
+    loop_time = measure("struct loop", loop_decode, data)
+    numpy_time = measure("numpy", make_numpy_decode(), data)
+    print(f"Speedup: {loop_time / numpy_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,71 @@
+"""
+Benchmark: cTrader tick download from the local Open API stand-in, serial vs. pipelined requests
+Runs on a simulated clock, the stand-in sends 5 messages per second like ctrader_open_api.TcpProtocol.
+Usage: python -m Benchmarks.bench_ctrader_download [days] [ticks_per_day] [latency_ms]
+"""
+from __future__ import annotations
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pytz import UTC
+import Api.KitaApi  # noqa: F401 (import order, Symbol needs KitaApi first)
+from BrokerProvider.QuoteCtraderCache import QuoteCtraderCache
+from twisted.internet import task
+from Benchmarks.ctrader_stand_in import CtraderStandIn, make_ticks
+
+FIRST_DAY = datetime(2025, 12, 1, tzinfo=UTC)
+ENV = {"app_id": "app", "app_secret": "secret", "refresh_token": "refresh", "account_id": "1234567"}
+
+
+def download(
+    ticks: dict, days: int, latency_seconds: float, target_dir: str, stand_in_options: dict | None = None, **kwargs
+):
+    """Run the downloader until it is done; returns (simulated seconds, stand-in)"""
+    clock = task.Clock()
+    stand_in = CtraderStandIn(clock, ticks, latency_seconds=latency_seconds, **(stand_in_options or {}))
+    downloader = QuoteCtraderCache.InternalDataDownloader(
+        env=dict(ENV),
+        symbol_name=stand_in.symbol_name,
+        symbol_id=0,
+        target_dir=target_dir,
+        missing_ranges=[(FIRST_DAY, FIRST_DAY + timedelta(days=days))],
+        logger=lambda text: None,
+        client_factory=lambda: stand_in,
+        clock=clock,
+        **kwargs,
+    )
+    d = downloader.run()
+    while not d.called:
+        clock.advance(min(call.getTime() for call in clock.getDelayedCalls()) - clock.seconds())
+    return clock.seconds(), stand_in
+
+
+def measure(name: str, ticks: dict, days: int, latency_seconds: float, **kwargs) -> float:
+    with tempfile.TemporaryDirectory() as target_dir:
+        elapsed, stand_in = download(ticks, days, latency_seconds, target_dir, **kwargs)
+        files = len(os.listdir(target_dir))
+    print(
+        f"{name:<12}{files:>4} days  {stand_in.tick_request_count:>5} tick requests  "
+        f"{elapsed:8.1f} simulated s  (violations {stand_in.violations}, in flight up to "
+        f"{stand_in.max_in_flight_seen} requests of {stand_in.max_days_in_flight_seen} days)"
+    )
+    return elapsed
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    ticks_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 100
+    ticks = make_ticks(FIRST_DAY, days, ticks_per_day)
+    print(f"{days} days x {ticks_per_day:,} ticks per side, {latency_ms:.0f} ms round trip")
+    serial = measure("serial", ticks, days, latency_ms / 1000, max_in_flight=1, max_parallel_days=1)
+    pipelined = measure("pipelined", ticks, days, latency_ms / 1000)
+    print(f"Speedup: {serial / pipelined:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,54 @@
+"""
+Benchmark: one Dukascopy day from the local stand-in server, sequential vs. concurrent hour downloads
+Usage: python -m Benchmarks.bench_dukascopy_download [latency_ms] [ticks_per_hour]
+"""
+import sys
+import time
+import tempfile
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+from pytz import UTC
+from BrokerProvider.QuoteDukascopy import Dukascopy
+from Benchmarks.dukascopy_stand_in import DukascopyStandIn, make_hour_records, write_fixture_hour
+
+SYMBOL = "EURUSD"
+DAY = datetime(2025, 12, 1, tzinfo=UTC)
+
+
+def make_provider(web_root: str, cache_path: str, max_workers: int) -> Dukascopy:
+    provider = Dukascopy(0, web_root=web_root, max_workers=max_workers)
+    provider.symbol = SimpleNamespace(name=SYMBOL, broker_symbol_name=SYMBOL, point_size=0.00001)  # type: ignore
+    provider.cache_path = cache_path
+    return provider
+
+
+def measure(name: str, web_root: str, max_workers: int) -> float:
+    with tempfile.TemporaryDirectory() as cache_path:  # empty cache, so every hour is downloaded
+        provider = make_provider(web_root, cache_path, max_workers)
+        start = time.perf_counter()
+        error, _, day = provider.get_day_at_utc(DAY)
+        elapsed = time.perf_counter() - start
+    assert "" == error, error
+    print(f"{name:<14}{day.count:>10,} ticks  {elapsed:8.3f} s")
+    return elapsed
+
+
+def main():
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    ticks_per_hour = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    with tempfile.TemporaryDirectory() as fixture_path:
+        for hour in range(24):
+            write_fixture_hour(fixture_path, SYMBOL, DAY + timedelta(hours=hour), make_hour_records(ticks_per_hour, hour))
+
+        with DukascopyStandIn(fixture_path, latency_seconds=latency_ms / 1000) as stand_in:
+            print(f"24 hours x {ticks_per_hour:,} ticks, {latency_ms:.0f} ms simulated latency per request")
+            sequential = measure("1 worker", stand_in.web_root, 1)
+            concurrent = measure("8 workers", stand_in.web_root, 8)
+    print(f"Speedup: {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,111 @@
+"""
+Benchmark: per-tick cost of detecting new bars over four timeframes (M1, M5, H1, H4).
+- legacy: count and Last(1).OpenTime of every Bars snapshotted into dicts before the tick, diffed after
+- mask: Symbol.new_bar_mask reset before the tick, set by Bars.subscribe_bar_closed callbacks, read after
+Both are measured against feeding the bars alone; the difference is the detection overhead.
+legacy also counts the first bar of each timeframe, mask only bars that closed.
+Usage: python -m Benchmarks.bench_new_bar_detection [ticks]
+"""
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.TickDay import TickDay
+from datetime import datetime
+
+TIMEFRAMES = (60, 300, 3600, 14400)
+FIRST_MS = TickDay.to_ms(datetime(2024, 3, 4))
+
+
+def make_ticks(count: int) -> list[tuple[int, float, float]]:
+    rng = np.random.default_rng(0)
+    times = FIRST_MS + np.cumsum(rng.integers(50, 1500, count))  # ~1.3 ticks per second
+    bids = 1.08 + np.cumsum(rng.integers(-1, 2, count)) * 0.00001
+    return list(zip(times.tolist(), bids.tolist(), (bids + 0.0001).tolist()))
+
+
+def make_symbol() -> SimpleNamespace:
+    symbol = SimpleNamespace(_backtest_end_ms=TickDay.to_ms(datetime(2100, 1, 1)), is_warm_up=True, new_bar_mask=0)
+    symbol.bars_dictonary = {tf: Bars("EURUSD", tf, 100, symbol=symbol) for tf in TIMEFRAMES}
+    return symbol
+
+
+def feed(symbol: SimpleNamespace, tick: tuple[int, float, float]):
+    for bars in symbol.bars_dictonary.values():
+        bars.bars_on_tick(tick[0], tick[1], tick[2], 1)
+
+
+def run_baseline(ticks: list) -> int:
+    symbol = make_symbol()
+    for tick in ticks:
+        feed(symbol, tick)
+    return 0
+
+
+def run_legacy(ticks: list) -> int:
+    """The detection KitaApi.do_tick did before new_bar_mask (condensed, same allocations)"""
+    symbol = make_symbol()
+    new_bars = 0
+    for tick in ticks:
+        previous_counts = {}
+        previous_bar_times = {}
+        for bars in symbol.bars_dictonary.values():
+            previous_counts[id(bars)] = bars.count
+            previous_bar_times[id(bars)] = bars.Last(1).OpenTime if bars.count > 1 else None
+
+        feed(symbol, tick)
+
+        for bars_id, prev_count in previous_counts.items():
+            for bars in symbol.bars_dictonary.values():
+                if id(bars) == bars_id:
+                    break
+            current_bar_time = bars.Last(1).OpenTime if bars.count > 1 else None
+            prev_bar_time = previous_bar_times.get(bars_id)
+            if bars.count > prev_count or (
+                prev_bar_time is not None and current_bar_time is not None and current_bar_time != prev_bar_time
+            ):
+                new_bars += 1
+    return new_bars
+
+
+def run_mask(ticks: list) -> int:
+    symbol = make_symbol()
+
+    def on_bar_closed(bars: Bars):
+        symbol.new_bar_mask |= bars.dirty_bit
+
+    for ndx, bars in enumerate(symbol.bars_dictonary.values()):
+        bars.dirty_bit = 1 << ndx
+        bars.subscribe_bar_closed(on_bar_closed)
+
+    new_bars = 0
+    for tick in ticks:
+        symbol.new_bar_mask = 0
+        feed(symbol, tick)
+        if 0 != symbol.new_bar_mask:
+            new_bars += bin(symbol.new_bar_mask).count("1")
+    return new_bars
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    ticks = make_ticks(count)
+    results = {}
+    for name, run in (("feed only", run_baseline), ("legacy", run_legacy), ("mask", run_mask)):
+        elapsed = []
+        for _ in range(3):  # best of three
+            start = time.perf_counter()
+            new_bars = run(ticks)
+            elapsed.append(time.perf_counter() - start)
+        results[name] = min(elapsed)
+        overhead = (results[name] - results["feed only"]) / count * 1e6
+        print(f"{name:<10}{results[name]:8.2f} s  {new_bars:>7,} new bars  detection {overhead:6.2f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
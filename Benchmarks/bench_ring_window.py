@@ -0,0 +1,52 @@
+"""
+Benchmark: extracting the newest 200 values of a float ring buffer as a numpy array (oldest first),
+plus the cost of add() and of a numpy reduction (mean) over the window.
+- Ringbuffer: list with modulo indexing, the window is copied element by element
+- NumpyRingbuffer: mirrored numpy buffer, window(200) is a zero-copy slice
+Usage: python -m Benchmarks.bench_ring_window [capacity] [window]
+"""
+import sys
+import time
+import numpy as np
+from Api.ring_buffer import Ringbuffer, NumpyRingbuffer
+
+
+def list_window(ring: Ringbuffer, length: int) -> np.ndarray:
+    return np.array([ring[rel_pos] for rel_pos in range(length - 1, -1, -1)])
+
+
+def best_ns(action, repeat: int) -> float:
+    elapsed = []
+    for _ in range(3):  # best of three
+        start = time.perf_counter()
+        for _ in range(repeat):
+            action()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed) / repeat * 1e9
+
+
+def main():
+    capacity = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    values = np.random.default_rng(0).normal(1.08, 0.001, capacity + 123).tolist()
+
+    rings = {"Ringbuffer": Ringbuffer[float](capacity), "NumpyRingbuffer": NumpyRingbuffer(capacity)}
+    for name, ring in rings.items():
+        for value in values:  # wrapped around, so the window crosses the physical end for the list
+            ring.add(value)
+        window = ring.window if isinstance(ring, NumpyRingbuffer) else lambda n, ring=ring: list_window(ring, n)
+        assert window(length).tolist() == values[-length:]
+
+        add_ns = best_ns(lambda: ring.add(1.08), 100_000)
+        window_ns = best_ns(lambda: window(length), 10_000)
+        mean_ns = best_ns(lambda: window(length).mean(), 10_000)
+        print(
+            f"{name:<17}window({length}) {window_ns:9,.0f} ns   +mean {mean_ns:9,.0f} ns   add {add_ns:6,.0f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,121 @@
+"""
+Benchmark: ticks/s through KitaApi.do_tick in a Kanga2 like configuration (EURUSD ticks, H4 bars with
+Bollinger Bands 25/2.0 on the close, M1 bars for filtering, an on_tick that reads bands, prices and time).
+The second run leaves the bands unread, which shows the cost of the tick path itself.
+The time the tick stream waited for days to be loaded (DayPrefetcher stall) is shown per run.
+Usage: python -m Benchmarks.bench_tick_hot_path [days] [ticks_per_day]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from pytz import UTC
+from Api.KitaApi import KitaApi, Symbol
+from Api.Constants import Constants
+from Api.KitaApiEnums import MovingAverageType
+from Api.QuoteProvider import QuoteProvider
+from Api.TickDay import TickDay
+from BrokerProvider.TradePaper import TradePaper
+
+SYMBOL = "EURUSD"
+FIRST_DAY = datetime(2024, 3, 6)  # Wednesday; the run includes the weekend of the DST switch
+
+
+class SyntheticTicks(QuoteProvider):
+    """Random walk EURUSD ticks from memory, weekends closed"""
+
+    provider_name = "Synthetic"
+
+    def __init__(self, ticks_per_day: int):
+        QuoteProvider.__init__(self, "", os.path.join("Files", "Assets_Pepperstone_Live.csv"), 0)
+        self.ticks_per_day = ticks_per_day
+
+    def init_symbol(self, api: KitaApi, symbol: Symbol):
+        self.api = api
+        self.symbol = symbol
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        day = utc.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=UTC)
+        if day.weekday() >= 5:
+            return "", day, TickDay.empty()
+        rng = np.random.default_rng(day.toordinal())
+        day_ms = int((day - TickDay.EPOCH).total_seconds()) * 1000
+        times = day_ms + np.sort(rng.integers(0, 86_400_000, self.ticks_per_day))
+        # half pip steps, so a share of the ticks repeats the previous quote as in real feeds
+        bids = 1.08 + np.round(np.cumsum(rng.integers(-1, 2, self.ticks_per_day)) * 0.00005, 5)
+        return "", day, TickDay(times, bids, bids + 0.0001)
+
+    def get_first_datetime(self) -> tuple[str, datetime]:
+        return "", FIRST_DAY
+
+    def get_highest_data_rate(self) -> int:
+        return 0
+
+
+class Kanga2Like(KitaApi):
+    def __init__(self, days: int, ticks_per_day: int, read_bands: bool):
+        self.BacktestStart = FIRST_DAY + timedelta(days=1)
+        self.BacktestEnd = FIRST_DAY + timedelta(days=days - 1)
+        self.WarmupStart = FIRST_DAY
+        self.ticks_per_day = ticks_per_day
+        self.read_bands = read_bands
+        self.on_tick_count = 0
+        super().__init__()
+
+    def _init_debug_log(self):
+        self._debug_log_file = None  # no log file for the benchmark
+
+    def on_init(self) -> None:
+        _, self.eurusd = self.request_symbol(SYMBOL, SyntheticTicks(self.ticks_per_day), TradePaper(), "utc")
+        self.eurusd.request_bars(4 * Constants.SEC_PER_HOUR, 25 + 10)
+        self.eurusd.request_bars(Constants.SEC_PER_MINUTE, 100)
+        _, self.h4_bars = self.eurusd.get_bars(4 * Constants.SEC_PER_HOUR)
+
+    def on_start(self, symbol: Symbol) -> None:
+        _, self.bollinger = self.Indicators.bollinger_bands(
+            source=self.h4_bars.close_bids, periods=25, standard_deviations=2.0, ma_type=MovingAverageType.Simple
+        )
+
+    def on_tick(self, symbol: Symbol):
+        self.on_tick_count += 1
+        if not self.read_bands:
+            return
+        top = self.bollinger.top.last(0)
+        bottom = self.bollinger.bottom.last(0)
+        if symbol.bid > top or symbol.ask < bottom:
+            self.last_signal_time = symbol.time  # signal: time is read like Kanga2's gap/rollover checks
+
+    def on_stop(self, symbol: Symbol = None):
+        pass
+
+
+def measure(days: int, ticks_per_day: int, read_bands: bool) -> tuple[float, int, int, float]:
+    robot = Kanga2Like(days, ticks_per_day, read_bands)
+    robot.do_init()
+    robot.do_start()
+    start = time.perf_counter()
+    while not robot.do_tick():
+        pass
+    elapsed = time.perf_counter() - start
+    ticks = robot.eurusd._tick_total_processed
+    robot.eurusd.close_tick_stream()
+    return elapsed, ticks, robot.on_tick_count, robot.eurusd.tick_io_stall_seconds
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    ticks_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    for name, read_bands in (("Kanga2 like", True), ("bands unread", False)):
+        elapsed, ticks, on_ticks, stall = measure(days, ticks_per_day, read_bands)
+        print(
+            f"{name:<14}{ticks:>10,} ticks ({on_ticks:,} on_tick calls) {elapsed:8.2f} s"
+            f"  {ticks / elapsed:>10,.0f} ticks/s  (waiting for days {stall:.3f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
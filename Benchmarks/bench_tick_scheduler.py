@@ -0,0 +1,100 @@
+"""
+Benchmark: chronological merge of the tick streams of 28 FX pairs, heapq TickScheduler vs. a linear scan
+for the earliest symbol at every tick
+Usage: python -m Benchmarks.bench_tick_scheduler [ticks_per_symbol] [symbols]
+"""
+import sys
+import time
+import numpy as np
+from Api.TickScheduler import TickScheduler
+
+FX_PAIRS = [
+    base + quote
+    for base, quotes in (
+        ("EUR", ("USD", "GBP", "JPY", "CHF", "AUD", "CAD", "NZD")),
+        ("GBP", ("USD", "JPY", "CHF", "AUD", "CAD", "NZD")),
+        ("AUD", ("USD", "JPY", "CHF", "CAD", "NZD")),
+        ("NZD", ("USD", "JPY", "CHF", "CAD")),
+        ("USD", ("JPY", "CHF", "CAD")),
+        ("CAD", ("JPY", "CHF")),
+        ("CHF", ("JPY",)),
+    )
+    for quote in quotes
+]
+
+
+class SyntheticSymbol:
+    """Tick stream with the part of the Symbol interface the scheduler uses"""
+
+    def __init__(self, name: str, times: np.ndarray):
+        self.name = name
+        self.times = times.tolist()
+        self.index = 0
+
+    def next_tick_ms(self):
+        return self.times[self.index] if self.index < len(self.times) else None
+
+    def consume(self, until_ms=None) -> int:
+        """Like Symbol.symbol_on_tick for an accepted tick: take one tick"""
+        self.index += 1
+        return self.times[self.index - 1]
+
+
+def make_symbols(ticks_per_symbol: int, symbol_count: int, seed: int = 0) -> list[SyntheticSymbol]:
+    """Busy and quiet pairs: tick counts vary by 10x over one day"""
+    rng = np.random.default_rng(seed)
+    symbols = []
+    for ndx, name in enumerate(FX_PAIRS[:symbol_count]):
+        count = max(1, int(ticks_per_symbol * (0.2 + 1.8 * ndx / max(1, symbol_count - 1))))
+        symbols.append(SyntheticSymbol(name, np.sort(rng.integers(0, 86_400_000, count))))
+    return symbols
+
+
+def heap_merge(symbols: list[SyntheticSymbol]) -> list[int]:
+    scheduler = TickScheduler(symbols)
+    merged = []
+    while len(scheduler) > 0:
+        order, symbol, until_ms = scheduler.pop()
+        merged.append(symbol.consume(until_ms))
+        scheduler.push(order, symbol)
+    return merged
+
+
+def scan_merge(symbols: list[SyntheticSymbol]) -> list[int]:
+    merged = []
+    while True:
+        earliest = None
+        earliest_ms = None
+        for symbol in symbols:
+            time_ms = symbol.next_tick_ms()
+            if time_ms is not None and (earliest_ms is None or time_ms < earliest_ms):
+                earliest, earliest_ms = symbol, time_ms
+        if earliest is None:
+            return merged
+        merged.append(earliest.consume())
+
+
+def measure(name: str, merge, ticks_per_symbol: int, symbol_count: int) -> tuple[float, list[int]]:
+    symbols = make_symbols(ticks_per_symbol, symbol_count)
+    start = time.perf_counter()
+    merged = merge(symbols)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14}{len(merged):>12,} ticks  {elapsed:8.3f} s  {len(merged) / elapsed:>14,.0f} ticks/s")
+    return elapsed, merged
+
+
+def main():
+    ticks_per_symbol = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    symbol_count = int(sys.argv[2]) if len(sys.argv) > 2 else len(FX_PAIRS)
+    print(f"Merging {symbol_count} symbols, about {ticks_per_symbol:,} ticks each")
+    scan_time, scan_merged = measure("linear scan", scan_merge, ticks_per_symbol, symbol_count)
+    heap_time, heap_merged = measure("heapq", heap_merge, ticks_per_symbol, symbol_count)
+    assert heap_merged == scan_merged == sorted(heap_merged)
+    print(f"Speedup: {scan_time / heap_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: .zticks day decoding, per-record struct loop vs. numpy decoder
+Usage: python -m Benchmarks.bench_zticks_decoder [ticks]
+"""
+import sys
+import time
+import struct
+import pytz
+import numpy as np
+from datetime import datetime
+from BrokerProvider.QuoteCtraderCache import QuoteCtraderCache
+
+
+def make_day(tick_count: int) -> bytes:
+    """Synthetic decompressed .zticks day; about 30% of the records carry only one side (0 on the other)"""
+    rng = np.random.default_rng(42)
+    day_start_ms = int(datetime(2025, 12, 1, tzinfo=pytz.UTC).timestamp() * 1000)
+    times = day_start_ms + np.sort(rng.integers(0, 86_400_000, tick_count))
+    bids = 65_000 + np.cumsum(rng.integers(-2, 3, tick_count))
+    asks = bids + rng.integers(1, 20, tick_count)
+    bids[rng.random(tick_count) < 0.15] = 0
+    asks[rng.random(tick_count) < 0.15] = 0
+    return np.stack([times, bids, asks], axis=1).astype("<i8").tobytes()
+
+
+def loop_decode(ba: bytes) -> int:
+    """The former get_day_at_utc loop (struct, datetime and carry-forward per record)"""
+    tick_bids: list[int] = []
+    tick_asks: list[int] = []
+    tick_times: list[tuple[datetime, int]] = []
+    source_ndx = 0
+    target_ndx = 0
+    while source_ndx < len(ba):
+        timestamp_ms = struct.unpack_from("<q", ba, source_ndx)[0]
+        source_ndx += 8
+        append_datetime = datetime.fromtimestamp(timestamp_ms / 1000.0, tz=pytz.UTC)
+        bid_int = int(struct.unpack_from("<q", ba, source_ndx)[0])
+        source_ndx += 8
+        ask_int = int(struct.unpack_from("<q", ba, source_ndx)[0])
+        source_ndx += 8
+        vol_delta = 2 if (bid_int > 0 and ask_int > 0) else 1
+        if bid_int == 0:
+            bid_int = ask_int if target_ndx == 0 else tick_bids[target_ndx - 1]
+        if ask_int == 0:
+            ask_int = bid_int if target_ndx == 0 else tick_asks[target_ndx - 1]
+        tick_bids.append(bid_int)
+        tick_asks.append(ask_int)
+        tick_times.append((append_datetime, vol_delta))
+        target_ndx += 1
+    return target_ndx
+
+
+def numpy_decode(ba: bytes) -> int:
+    times_ms, _, _, _ = QuoteCtraderCache.decode_zticks(ba)
+    return len(times_ms)
+
+
+def measure(name: str, decode, ba: bytes) -> float:
+    start = time.perf_counter()
+    count = decode(ba)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<14}{count:>12,} ticks  {elapsed:8.3f} s  {count / elapsed:>14,.0f} ticks/s")
+    return elapsed
+
+
+def main():
+    tick_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000_000
+    ba = make_day(tick_count)
+    print(f"Decoding one synthetic day with {tick_count:,} ticks ({len(ba) / 1e6:.1f} MB uncompressed)")
+    loop_time = measure("struct loop", loop_decode, ba)
+    numpy_time = measure("numpy", numpy_decode, ba)
+    print(f"Speedup: {loop_time / numpy_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# end of file
@@ -0,0 +1,216 @@
+"""
+Local stand-in for the cTrader Open API endpoint
+
+Replaces ctrader_open_api.Client (pass `lambda: stand_in` as client_factory of
+QuoteCtraderCache.InternalDataDownloader) so the downloader can be exercised offline.
+Answers authentication, account list, symbol list and tick data requests like the server does.
+Time is taken from a twisted clock, so a task.Clock gives reproducible simulated seconds.
+"""
+
+from __future__ import annotations
+import numpy as np
+from collections import deque
+from datetime import datetime
+from twisted.internet import task
+from twisted.internet.defer import Deferred
+from OpenApiCommonMessages_pb2 import ProtoMessage
+from OpenApiMessages_pb2 import (
+    ProtoOAApplicationAuthReq,
+    ProtoOAApplicationAuthRes,
+    ProtoOARefreshTokenReq,
+    ProtoOARefreshTokenRes,
+    ProtoOAGetAccountListByAccessTokenReq,
+    ProtoOAGetAccountListByAccessTokenRes,
+    ProtoOAAccountAuthReq,
+    ProtoOAAccountAuthRes,
+    ProtoOASymbolsListReq,
+    ProtoOASymbolsListRes,
+    ProtoOAGetTickDataReq,
+    ProtoOAGetTickDataRes,
+    ProtoOAErrorRes,
+)
+from OpenApiModelMessages_pb2 import ProtoOAQuoteType
+
+TICK_PAGE_SIZE = 1000  # ticks per ProtoOAGetTickDataRes
+DAY_MS = 86_400_000
+
+
+def make_ticks(first_day: datetime, days: int, ticks_per_day: int, seed: int = 0) -> dict[int, tuple]:
+    """
+    Synthetic bid and ask ticks: quote type -> (epoc ms, price in 1e-5 units), sorted by time.
+    Times are unique per side because the downloader pages backward with `oldest time - 1`.
+    """
+    rng = np.random.default_rng(seed)
+    first_ms = int(first_day.timestamp()) * 1000
+    ticks = {}
+    for quote_type in (ProtoOAQuoteType.BID, ProtoOAQuoteType.ASK):
+        times = np.concatenate(
+            [first_ms + day * DAY_MS + np.unique(rng.integers(0, DAY_MS, ticks_per_day)) for day in range(days)]
+        )
+        prices = 110_000 + np.cumsum(rng.integers(-2, 3, len(times))) + (ProtoOAQuoteType.ASK == quote_type) * 10
+        ticks[quote_type] = (times.astype(np.int64), prices.astype(np.int64))
+    return ticks
+
+
+class CtraderStandIn:
+    """
+    Client-side object with the ctrader_open_api.Client methods used by the downloader.
+    - latency_seconds: round trip of every request
+    - max_per_second: requests within one second above this are answered with REQUEST_FREQUENCY_EXCEEDED
+      (counted in `violations`)
+    - flush_interval_seconds, messages_per_flush: like ctrader_open_api.TcpProtocol, sends are queued and
+      written by a looping call (5 messages per second); 0 sends immediately
+    - fail_after_tick_requests: tick data requests after this many are answered with an error
+      (simulates a connection lost in the middle of a download)
+    max_in_flight_seen and max_days_in_flight_seen record the peak of outstanding requests and of days
+    with outstanding tick data requests (pipelining and overlap of days).
+    """
+
+    def __init__(
+        self,
+        clock,
+        ticks: dict[int, tuple],
+        symbol_name: str = "EURUSD",
+        symbol_id: int = 1,
+        trader_login: int = 1234567,
+        ctid_trader_account_id: int = 42,
+        latency_seconds: float = 0.05,
+        max_per_second: int = 5,
+        flush_interval_seconds: float = 1.0,
+        messages_per_flush: int = 5,
+        fail_after_tick_requests: int | None = None,
+    ):
+        self.clock = clock
+        self.ticks = ticks
+        self.symbol_name = symbol_name
+        self.symbol_id = symbol_id
+        self.trader_login = trader_login
+        self.ctid_trader_account_id = ctid_trader_account_id
+        self.latency_seconds = latency_seconds
+        self.max_per_second = max_per_second
+        self.flush_interval_seconds = flush_interval_seconds
+        self.messages_per_flush = messages_per_flush
+        self.fail_after_tick_requests = fail_after_tick_requests
+        self.request_count = 0
+        self.tick_request_count = 0
+        self.violations = 0
+        self.max_in_flight_seen = 0
+        self.max_days_in_flight_seen = 0
+        self._in_flight = 0
+        self._tick_days_in_flight: dict[int, int] = {}  # fromTimestamp of the day -> outstanding requests
+        self._received_times: deque = deque()
+        self._send_queue: deque = deque()
+        self._flush_loop: task.LoopingCall | None = None
+        self._connected_callback = None
+        self._disconnected_callback = None
+
+    # ctrader_open_api.Client interface
+    # region
+    def setConnectedCallback(self, callback):
+        self._connected_callback = callback
+
+    def setDisconnectedCallback(self, callback):
+        self._disconnected_callback = callback
+
+    def startService(self):
+        if self.flush_interval_seconds > 0:
+            self._flush_loop = task.LoopingCall(self._flush)
+            self._flush_loop.clock = self.clock
+            self._flush_loop.start(self.flush_interval_seconds, now=True)
+        if self._connected_callback is not None:
+            self.clock.callLater(self.latency_seconds, self._connected_callback, self)
+
+    def stopService(self):
+        if self._flush_loop is not None and self._flush_loop.running:
+            self._flush_loop.stop()
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self, "stopped")
+
+    def send(self, message, clientMsgId=None, responseTimeoutInSeconds=5) -> Deferred:
+        d = Deferred()
+        self._in_flight += 1
+        self.max_in_flight_seen = max(self.max_in_flight_seen, self._in_flight)
+        if isinstance(message, ProtoOAGetTickDataReq):
+            days = self._tick_days_in_flight
+            days[message.fromTimestamp] = days.get(message.fromTimestamp, 0) + 1
+            self.max_days_in_flight_seen = max(self.max_days_in_flight_seen, len(days))
+        self._send_queue.append((message, d))
+        if self.flush_interval_seconds <= 0:
+            self._flush()
+        return d
+
+    # endregion
+
+    def _flush(self):
+        count = len(self._send_queue) if self.flush_interval_seconds <= 0 else self.messages_per_flush
+        for _ in range(min(count, len(self._send_queue))):
+            message, d = self._send_queue.popleft()
+            response = self._answer(message)
+            self.clock.callLater(self.latency_seconds, self._respond, d, response, message)
+
+    def _respond(self, d: Deferred, response: ProtoMessage, message):
+        self._in_flight -= 1
+        if isinstance(message, ProtoOAGetTickDataReq):
+            days = self._tick_days_in_flight
+            days[message.fromTimestamp] -= 1
+            if 0 == days[message.fromTimestamp]:
+                del days[message.fromTimestamp]
+        d.callback(response)
+
+    def _answer(self, message) -> ProtoMessage:
+        self.request_count += 1
+        now = self.clock.seconds()
+        while self._received_times and self._received_times[0] + 1.0 <= now:
+            self._received_times.popleft()
+        self._received_times.append(now)
+        if len(self._received_times) > self.max_per_second:
+            self.violations += 1
+            return self._message(ProtoOAErrorRes(errorCode="REQUEST_FREQUENCY_EXCEEDED"))
+
+        if isinstance(message, ProtoOAApplicationAuthReq):
+            return self._message(ProtoOAApplicationAuthRes())
+        if isinstance(message, ProtoOARefreshTokenReq):
+            return self._message(
+                ProtoOARefreshTokenRes(
+                    accessToken="access", tokenType="bearer", expiresIn=2_628_000, refreshToken="refresh"
+                )
+            )
+        if isinstance(message, ProtoOAGetAccountListByAccessTokenReq):
+            res = ProtoOAGetAccountListByAccessTokenRes(accessToken=message.accessToken)
+            res.ctidTraderAccount.add(ctidTraderAccountId=self.ctid_trader_account_id, traderLogin=self.trader_login)
+            return self._message(res)
+        if isinstance(message, ProtoOAAccountAuthReq):
+            return self._message(ProtoOAAccountAuthRes(ctidTraderAccountId=message.ctidTraderAccountId))
+        if isinstance(message, ProtoOASymbolsListReq):
+            res = ProtoOASymbolsListRes(ctidTraderAccountId=message.ctidTraderAccountId)
+            res.symbol.add(symbolId=self.symbol_id, symbolName=self.symbol_name)
+            return self._message(res)
+        if isinstance(message, ProtoOAGetTickDataReq):
+            if self.fail_after_tick_requests is not None and self.tick_request_count >= self.fail_after_tick_requests:
+                return self._message(ProtoOAErrorRes(errorCode="CONNECTION_LOST"))
+            self.tick_request_count += 1
+            return self._message(self._tick_page(message))
+        return self._message(ProtoOAErrorRes(errorCode="UNSUPPORTED_MESSAGE"))
+
+    def _tick_page(self, req: ProtoOAGetTickDataReq) -> ProtoOAGetTickDataRes:
+        """Newest TICK_PAGE_SIZE ticks in [from, to]; newest first, the first absolute, then deltas"""
+        times, prices = self.ticks[req.type]
+        low = int(np.searchsorted(times, req.fromTimestamp, "left"))
+        high = int(np.searchsorted(times, req.toTimestamp, "right"))
+        start = max(low, high - TICK_PAGE_SIZE)
+        page_times = times[start:high][::-1]
+        page_prices = prices[start:high][::-1]
+        res = ProtoOAGetTickDataRes(ctidTraderAccountId=req.ctidTraderAccountId, hasMore=start > low)
+        if len(page_times) > 0:
+            delta_times = np.concatenate((page_times[:1], np.diff(page_times)))
+            delta_prices = np.concatenate((page_prices[:1], np.diff(page_prices)))
+            for timestamp, tick in zip(delta_times.tolist(), delta_prices.tolist()):
+                res.tickData.add(timestamp=timestamp, tick=tick)
+        return res
+
+    @staticmethod
+    def _message(res) -> ProtoMessage:
+        return ProtoMessage(payloadType=res.payloadType, payload=res.SerializeToString())
+
+
+# end of file
@@ -0,0 +1,141 @@
+"""
+Local stand-in for the Dukascopy datafeed
+
+Serves bi5 fixture files over HTTP with the same URL layout as
+http://www.dukascopy.com/datafeed so QuoteDukascopy can be exercised offline.
+Latency and transient failures can be injected per request.
+"""
+
+from __future__ import annotations
+import os
+import lzma
+import time
+import threading
+import numpy as np
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# One bi5 record: ms since hour start, ask, bid (points), ask volume, bid volume
+BI5_DTYPE = np.dtype([("ms", ">u4"), ("ask", ">u4"), ("bid", ">u4"), ("volume_ask", ">f4"), ("volume_bid", ">f4")])
+
+
+def hour_url_path(symbol_name: str, hour_utc: datetime) -> str:
+    """URL path of one hour, Dukascopy months are 0 based"""
+    return (
+        f"/{symbol_name}/{hour_utc.year}/{hour_utc.month - 1:02}/{hour_utc.day:02}/{hour_utc.hour:02}h_ticks.bi5"
+    )
+
+
+def make_hour_records(ticks: int, seed: int = 0) -> np.ndarray:
+    """Synthetic busy hour: sorted ms offsets and a random walk around 1.10000"""
+    rng = np.random.default_rng(seed)
+    records = np.zeros(ticks, dtype=BI5_DTYPE)
+    records["ms"] = np.sort(rng.integers(0, 3_600_000, ticks))
+    bid = 110_000 + np.cumsum(rng.integers(-2, 3, ticks))
+    records["bid"] = bid
+    records["ask"] = bid + rng.integers(1, 20, ticks)
+    records["volume_ask"] = rng.random(ticks).astype(np.float32)
+    records["volume_bid"] = rng.random(ticks).astype(np.float32)
+    return records
+
+
+def write_fixture_hour(root_path: str, symbol_name: str, hour_utc: datetime, records: np.ndarray):
+    """Store records LZMA compressed like a downloaded bi5 file; an empty hour is a 0 byte file"""
+    path = root_path + hour_url_path(symbol_name, hour_utc)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = records.tobytes()
+    with open(path, "wb") as file:
+        file.write(lzma.compress(payload, format=lzma.FORMAT_ALONE) if len(payload) > 0 else b"")
+
+
+class DukascopyStandIn:
+    """
+    Threaded HTTP server answering datafeed requests from root_path.
+    - latency_seconds: sleep before every answer (simulates the round trip)
+    - failures: url path -> number of 503 answers before the file is served
+    Missing files are answered with 404.
+    max_in_flight_seen records the peak number of requests served at the same time.
+    """
+
+    def __init__(self, root_path: str, latency_seconds: float = 0.0, failures: dict[str, int] | None = None):
+        self.root_path = root_path
+        self.latency_seconds = latency_seconds
+        self.failures = dict(failures or {})
+        self.request_count = 0
+        self.max_in_flight_seen = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def web_root(self) -> str:
+        assert self._server is not None, "stand-in not started"
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> DukascopyStandIn:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                stand_in._answer(self)
+
+            def log_message(self, format, *args):  # keep test output quiet
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> DukascopyStandIn:
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _answer(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.request_count += 1
+            self._in_flight += 1
+            self.max_in_flight_seen = max(self.max_in_flight_seen, self._in_flight)
+            failing = self.failures.get(handler.path, 0) > 0
+            if failing:
+                self.failures[handler.path] -= 1
+
+        try:
+            self._serve(handler, failing)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _serve(self, handler: BaseHTTPRequestHandler, failing: bool):
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        path = self.root_path + handler.path
+        if failing:
+            status, body = 503, b""
+        elif os.path.isfile(path):
+            with open(path, "rb") as file:
+                status, body = 200, file.read()
+        else:
+            status, body = 404, b""
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/octet-stream")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+# end of file
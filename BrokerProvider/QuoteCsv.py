@@ -2,6 +2,7 @@ import os
 from datetime import datetime
 from Api.KitaApi import KitaApi, Symbol
 from Api.Bars import Bars
+from Api.TickDay import TickDay
 from Api.QuoteProvider import QuoteProvider
 
 
@@ -24,7 +25,7 @@ class QuoteCsv(QuoteProvider):
         self.symbol_path = os.path.join(self.parameter, self.symbol.name)
         pass
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
         return None  # type: ignore
         pass
 
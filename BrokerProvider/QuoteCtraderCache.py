@@ -1,19 +1,26 @@
 import os
 import sys
 import gzip
-import struct
+import json
 import pytz
 import hashlib
 import time
+import zlib
+import numpy as np
+from collections import deque
+from typing import Optional
 from datetime import datetime, timedelta
 from lzma import LZMADecompressor, FORMAT_AUTO  # type: ignore
 from Api.KitaApi import KitaApi, Symbol
-from Api.Bars import Bars
+from Api.TickDay import TickDay
+from Api.TickDayCache import TickDayCache
+from Api.DataCatalog import DataCatalog
 from Api.KitaApiEnums import BidAsk
 from Api.QuoteProvider import QuoteProvider
 from Api.KitaApiEnums import *
 from twisted.internet import reactor, ssl, protocol, task
-from twisted.internet.defer import Deferred, inlineCallbacks, ensureDeferred
+from twisted.internet.defer import Deferred, DeferredSemaphore, gatherResults, inlineCallbacks, ensureDeferred
+from twisted.python.failure import Failure
 from ctrader_open_api import Client, Protobuf, TcpProtocol, Auth
 
 # Add PyDownload messages directory to path for protobuf imports
@@ -30,6 +37,7 @@ from OpenApiMessages_pb2 import (
     ProtoOAGetTickDataReq, ProtoOAGetTickDataRes,
     ProtoOASymbolsListReq, ProtoOASymbolsListRes,
     ProtoOARefreshTokenReq, ProtoOARefreshTokenRes,
+    ProtoOAErrorRes,
 )
 from OpenApiModelMessages_pb2 import ProtoOAPayloadType, ProtoOAQuoteType
 
@@ -40,17 +48,26 @@ class QuoteCtraderCache(QuoteProvider):
     _last_hour_base_timestamp: float = 0
     _prev_bid: float = 0
     _prev_ask: float = 0
+    _loader_tick_size: float = 10e-6  # Same as C# const double loaderTickSize = 10e-6;
+    _epoch: datetime = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+    # One .zticks record: epoc milliseconds, bid and ask as 8 byte little endian longs
+    _zticks_dtype = np.dtype([("time", "<i8"), ("bid", "<i8"), ("ask", "<i8")])
 
-    def __init__(self, data_rate: int, parameter: str = "", credentials: str = ""):
+    def __init__(self, data_rate: int, parameter: str = "", credentials: str = "", memmap_cache: bool = False):
         assets_path = os.path.join("Files", self._assets_file_name)
         QuoteProvider.__init__(self, parameter, assets_path, data_rate)
         self.credentials_path = credentials
+        self.memmap_cache = memmap_cache  # keep decoded days as memory mapped .npy files next to t1
+        self.day_cache: Optional[TickDayCache] = None
 
     def init_symbol(self, api: KitaApi, symbol: Symbol):
         self.api = api
         self.symbol = symbol
         ctrader_path = api.resolve_env_variables(self.parameter)
         self.cache_path = os.path.join(ctrader_path, self.symbol.name, "t1")
+        self.catalog = DataCatalog(self.cache_path, ".zticks")
+        if self.memmap_cache:
+            self.day_cache = TickDayCache(os.path.join(ctrader_path, self.symbol.name, "t1_npy"))
         
         # Check and download missing data if credentials are provided
         if self.credentials_path and os.path.exists(self.credentials_path):
@@ -70,18 +87,18 @@ class QuoteCtraderCache(QuoteProvider):
             
     def ensure_data_range(self, start_utc: datetime, end_utc: datetime):
         """Check if data exists for the full range. If days are missing, download them."""
-        missing_days = []
-        current = start_utc.replace(hour=0, minute=0, second=0, microsecond=0)
         end_date = end_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Identify missing days
-        while current < end_date:
-            path = os.path.join(self.cache_path, current.strftime("%Y%m%d") + ".zticks")
-            if not os.path.exists(path):
-                self.api._debug_log(f"Missing data file: {path}")
-                missing_days.append(current)
-            current += timedelta(days=1)
-            
+
+        # Files without checksum (e.g. truncated by an interrupted writer) are checked in parallel first;
+        # broken ones are dropped from the catalog and so downloaded again
+        for day in self.catalog.verify(start_utc, end_date, self._check_zticks):
+            self.api._debug_log(f"Corrupt data file: {day.strftime('%Y%m%d')}.zticks")
+
+        # Identify missing days (from the catalog, no file system access per day)
+        missing_days = self.catalog.missing_days(start_utc, end_date)
+        for day in missing_days:
+            self.api._debug_log(f"Missing data file: {day.strftime('%Y%m%d')}.zticks")
+
         if not missing_days:
             return
 
@@ -102,7 +119,8 @@ class QuoteCtraderCache(QuoteProvider):
                  symbol_id=0, # Will be resolved
                  target_dir=self.cache_path,
                  missing_ranges=missing_ranges,
-                 logger=self.api._debug_log
+                 logger=self.api._debug_log,
+                 catalog=self.catalog,
              )
              return ensureDeferred(downloader.run())
 
@@ -160,15 +178,154 @@ class QuoteCtraderCache(QuoteProvider):
             'app_secret': config.get('QUANTROSOFT_CTRADER_APP_SECRET', app_secret),
         }
 
+    class RequestScheduler:
+        """
+        Pipelines Open API requests instead of waiting for each answer before sending the next one.
+        At most max_in_flight requests are outstanding and at most max_per_second are sent within
+        any one second (more are answered with REQUEST_FREQUENCY_EXCEEDED by the server).
+        send() queues the request and returns a Deferred firing with the response.
+        """
+
+        def __init__(self, client, clock, max_in_flight: int = 5, max_per_second: int = 5):
+            self.client = client
+            self.clock = clock
+            self.max_in_flight = max_in_flight
+            self.max_per_second = max_per_second
+            self.in_flight = 0
+            self.sent_count = 0
+            self._queue: deque = deque()  # (message, kwargs, caller's deferred)
+            self._sent_times: deque = deque()  # clock.seconds() of the sends within the last second
+            self._wakeup = None
+
+        def send(self, message, **kwargs) -> Deferred:
+            d = Deferred()
+            self._queue.append((message, kwargs, d))
+            self._pump()
+            return d
+
+        def _pump(self):
+            while self._queue and self.in_flight < self.max_in_flight:
+                now = self.clock.seconds()
+                while self._sent_times and self._sent_times[0] + 1.0 <= now:
+                    self._sent_times.popleft()
+                if len(self._sent_times) >= self.max_per_second:
+                    # rate limited: continue when the oldest send leaves the one second window
+                    if self._wakeup is None or not self._wakeup.active():
+                        self._wakeup = self.clock.callLater(self._sent_times[0] + 1.0 - now, self._pump)
+                    return
+
+                message, kwargs, d = self._queue.popleft()
+                self._sent_times.append(now)
+                self.in_flight += 1
+                self.sent_count += 1
+                self.client.send(message, **kwargs).addBoth(self._done, d)
+
+        def _done(self, result, d: Deferred):
+            self.in_flight -= 1
+            if isinstance(result, Failure):
+                d.errback(result)
+            else:
+                d.callback(result)
+            self._pump()
+
+    class DownloadCheckpoint:
+        """
+        Page cursors of the days being downloaded, kept in <target_dir>/download_checkpoint.json as
+        {"YYYYMMDD": {"<quote type>": [to timestamp of the next page, part file bytes, complete]}}.
+        The ticks of each confirmed page are appended to YYYYMMDD_<quote type>.part before its cursor is
+        stored, so an interrupted download resumes after the last confirmed page instead of restarting the day.
+        """
+
+        _tick_dtype = np.dtype("<i8")  # part files hold (epoc ms, price) pairs
+
+        def __init__(self, target_dir: str):
+            self.target_dir = target_dir
+            self.path = os.path.join(target_dir, "download_checkpoint.json")
+            self.days: dict[str, dict[str, list]] = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        self.days = json.load(file)
+                except ValueError:
+                    self.days = {}  # unreadable checkpoint, days start over
+
+        def resume(self, day_name: str, quote_type: int, end_ms: int) -> tuple[int, list, bool]:
+            """(page cursor, ticks of the confirmed pages, complete) of one side of a day"""
+            entry = self.days.get(day_name, {}).get(str(quote_type))
+            part_path = self._part_path(day_name, quote_type)
+            if entry is None or not os.path.exists(part_path) or os.path.getsize(part_path) < entry[1]:
+                # start over: ticks of a part file without (matching) cursor were never confirmed
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                return end_ms, [], False
+
+            current_to, part_bytes, complete = entry
+            with open(part_path, "r+b") as file:
+                file.truncate(part_bytes)  # drop a page written after the last stored cursor
+                data = file.read()
+            return current_to, np.frombuffer(data, dtype=self._tick_dtype).reshape(-1, 2).tolist(), complete
+
+        def confirm_page(self, day_name: str, quote_type: int, ticks: list, current_to: int, complete: bool):
+            part_path = self._part_path(day_name, quote_type)
+            with open(part_path, "ab") as file:
+                file.write(np.array(ticks, dtype=self._tick_dtype).tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+                part_bytes = file.tell()
+            self.days.setdefault(day_name, {})[str(quote_type)] = [int(current_to), part_bytes, complete]
+            self._save()
+
+        def finish_day(self, day_name: str):
+            """The day file has been written, its cursors and part files are not needed any more"""
+            for quote_type in self.days.pop(day_name, {}):
+                part_path = self._part_path(day_name, int(quote_type))
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+            self._save()
+
+        def _part_path(self, day_name: str, quote_type: int) -> str:
+            return os.path.join(self.target_dir, f"{day_name}_{quote_type}.part")
+
+        def _save(self):
+            if not self.days:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            with open(self.path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump(self.days, file)
+            os.replace(self.path + ".tmp", self.path)
+
     class InternalDataDownloader:
-         def __init__(self, env, symbol_name, symbol_id, target_dir, missing_ranges, logger):
+         def __init__(
+             self,
+             env,
+             symbol_name,
+             symbol_id,
+             target_dir,
+             missing_ranges,
+             logger,
+             catalog=None,
+             max_in_flight=5,
+             max_per_second=5,
+             max_parallel_days=4,
+             client_factory=None,
+             clock=None,
+         ):
              self.env = env
              self.symbol = symbol_name
              self.symbol_id = symbol_id
              self.target_dir = target_dir
              self.ranges = missing_ranges
              self.log = logger
+             self.catalog = catalog
+             self.max_in_flight = max_in_flight  # outstanding tick data requests
+             self.max_per_second = max_per_second  # Open API limit for historical data requests
+             self.max_parallel_days = max_parallel_days  # days downloaded at the same time
+             self.client_factory = client_factory  # None: Open API demo endpoint
+             self.clock = clock if clock is not None else reactor
              self.client = None
+             self.scheduler = None
+             self.checkpoint = None
 
          @inlineCallbacks
          def run(self):
@@ -179,7 +336,10 @@ class QuoteCtraderCache(QuoteProvider):
                  import ctrader_open_api.tcpProtocol
                  import ctrader_open_api.protobuf
                  
-                 self.client = Client("demo.ctraderapi.com", 5035, TcpProtocol)
+                 if self.client_factory is not None:
+                     self.client = self.client_factory()
+                 else:
+                     self.client = Client("demo.ctraderapi.com", 5035, TcpProtocol)
                  
                  # Connection setup
                  connected_d = Deferred()
@@ -337,17 +497,24 @@ class QuoteCtraderCache(QuoteProvider):
                  # 5. Download Ranges
                  if not os.path.exists(self.target_dir):
                      os.makedirs(self.target_dir)
+                 self.checkpoint = QuoteCtraderCache.DownloadCheckpoint(self.target_dir)
 
+                 # Days are fanned out, their requests share the scheduler's in-flight and rate limits
+                 self.scheduler = QuoteCtraderCache.RequestScheduler(
+                     self.client, self.clock, self.max_in_flight, self.max_per_second
+                 )
+                 days = []
                  for start_dt, end_dt in self.ranges:
                      self.log(f"[InternalDownloader] Downloading range {start_dt} to {end_dt}")
                      current = start_dt
                      while current < end_dt:
                          day_end = current + timedelta(days=1)
-                         req_end = min(day_end, end_dt)
-                         
-                         yield self.download_day(current, req_end)
+                         days.append((current, min(day_end, end_dt)))
                          current += timedelta(days=1)
 
+                 semaphore = DeferredSemaphore(self.max_parallel_days)
+                 yield gatherResults([semaphore.run(self.download_day, start, end) for start, end in days])
+
              except Exception as e:
                  self.log(f"[InternalDownloader] Error: {e}")
              finally:
@@ -365,7 +532,11 @@ class QuoteCtraderCache(QuoteProvider):
                  path = os.path.join(self.target_dir, filename)
                  
                  # Always write, even if empty (creates cache entry)
-                 self.write_ticks(path, ticks)
+                 payload = self.write_ticks(path, ticks)
+                 if self.catalog is not None:
+                     tick_day = QuoteCtraderCache.payload_to_tick_day(payload)
+                     self.catalog.update_day(start_dt, tick_day, QuoteCtraderCache.checksum(payload))
+                 self.checkpoint.finish_day(start_dt.strftime("%Y%m%d"))
                  self.log(f"Saved {filename} ({len(ticks)} ticks)")
              except Exception as e:
                  self.log(f"Failed to download day {start_dt}: {e}")
@@ -375,22 +546,28 @@ class QuoteCtraderCache(QuoteProvider):
              start_ms = int(start_time.timestamp() * 1000)
              end_ms = int(end_time.timestamp() * 1000) - 1 # Exclusive of next day start usually
              
+             day_name = start_time.strftime("%Y%m%d")
              all_bid_ticks = []
              all_ask_ticks = []
              
-             # Bids
-             yield self._fetch_ticks(start_ms, end_ms, ProtoOAQuoteType.BID, all_bid_ticks)
-             # Asks
-             yield self._fetch_ticks(start_ms, end_ms, ProtoOAQuoteType.ASK, all_ask_ticks)
-             
-             all_bid_ticks.sort(key=lambda x: x[0])
-             all_ask_ticks.sort(key=lambda x: x[0])
-             return self.merge_ticks(all_bid_ticks, all_ask_ticks)
+             # Bids and asks at the same time
+             yield gatherResults(
+                 [
+                     self._fetch_ticks(start_ms, end_ms, ProtoOAQuoteType.BID, all_bid_ticks, day_name),
+                     self._fetch_ticks(start_ms, end_ms, ProtoOAQuoteType.ASK, all_ask_ticks, day_name),
+                 ],
+                 consumeErrors=True,
+             )
+
+             return self.merge_ticks(self.sort_ticks(all_bid_ticks), self.sort_ticks(all_ask_ticks))
 
          @inlineCallbacks
-         def _fetch_ticks(self, start_ms, end_ms, quote_type, result_list):
-             current_to = end_ms
-             while current_to > start_ms:
+         def _fetch_ticks(self, start_ms, end_ms, quote_type, result_list, day_name):
+             # Continue after the last confirmed page if this day was interrupted before
+             current_to, confirmed, complete = self.checkpoint.resume(day_name, quote_type, end_ms)
+             result_list.extend(confirmed)
+             throttled = 0
+             while not complete and current_to > start_ms:
                  req = ProtoOAGetTickDataReq()
                  req.ctidTraderAccountId = int(self.env.get('account_id'))
                  req.symbolId = self.symbol_id
@@ -398,21 +575,31 @@ class QuoteCtraderCache(QuoteProvider):
                  req.fromTimestamp = start_ms
                  req.toTimestamp = int(current_to)
                  
-                 res = yield self.client.send(req)
-                 if res.payloadType != ProtoOAPayloadType.PROTO_OA_GET_TICKDATA_RES: break
+                 res = yield self.scheduler.send(req)
+                 if res.payloadType == ProtoOAPayloadType.PROTO_OA_ERROR_RES:
+                     err = ProtoOAErrorRes()
+                     err.ParseFromString(res.payload)
+                     if "REQUEST_FREQUENCY_EXCEEDED" == err.errorCode and throttled < 5:
+                         throttled += 1
+                         yield task.deferLater(self.clock, 1.0, lambda: None)
+                         continue
+                     # Incomplete day: not written, the checkpoint keeps the pages received so far
+                     raise RuntimeError(f"Tick data error: {err.errorCode} - {err.description}")
+                 if res.payloadType != ProtoOAPayloadType.PROTO_OA_GET_TICKDATA_RES:
+                     raise RuntimeError(f"Unexpected tick data response type {res.payloadType}")
                  
                  resp = ProtoOAGetTickDataRes()
                  resp.ParseFromString(res.payload)
-                 ticks = resp.tickData
-                 if not ticks: break
-                 
-                 decoded = self.decode_ticks(ticks, start_ms)
+                 decoded = self.decode_ticks(resp.tickData, start_ms)
+                 complete = 0 == len(decoded)
+                 if not complete:
+                     min_ts = min(t[0] for t in decoded)
+                     current_to = min_ts - 1
+                     complete = min_ts <= start_ms or (
+                         len(decoded) < 1000 and not resp.hasMore and (current_to - start_ms < 1000)
+                     )
                  result_list.extend(decoded)
-                 
-                 min_ts = min(t[0] for t in decoded)
-                 if min_ts <= start_ms: break
-                 current_to = min_ts - 1
-                 if len(ticks) < 1000 and not resp.hasMore and (current_to - start_ms < 1000): break
+                 self.checkpoint.confirm_page(day_name, quote_type, decoded, current_to, complete)
 
          def decode_ticks(self, raw_ticks, base_ms):
              decoded = []
@@ -429,178 +616,197 @@ class QuoteCtraderCache(QuoteProvider):
                  decoded.append((abs_ts, acc_price))
              return decoded
 
-         def merge_ticks(self, bids, asks):
-             quotes = []
-             b_idx = a_idx = 0
-             last_b = last_a = None
-             while b_idx < len(bids) or a_idx < len(asks):
-                 ts_b = bids[b_idx][0] if b_idx < len(bids) else float('inf')
-                 ts_a = asks[a_idx][0] if a_idx < len(asks) else float('inf')
-                 
-                 if ts_b <= ts_a:
-                     curr_ts = ts_b
-                     last_b = bids[b_idx][1]
-                     b_idx += 1
-                 else:
-                     curr_ts = ts_a
-                     last_a = asks[a_idx][1]
-                     a_idx += 1
-                 
-                 if last_b is not None and last_a is not None:
-                     quotes.append((curr_ts, last_b, last_a))
+         @staticmethod
+         def sort_ticks(ticks) -> np.ndarray:
+             """(epoc ms, price) ticks as (n, 2) int64 array sorted by time (stable, like list.sort)"""
+             ticks = np.array(ticks, dtype=np.int64).reshape(-1, 2)
+             return ticks[np.argsort(ticks[:, 0], kind="stable")]
+
+         @staticmethod
+         def merge_ticks(bids, asks) -> np.ndarray:
+             """
+             Join time sorted (epoc ms, price) bid and ask ticks into (epoc ms, bid, ask) quotes.
+             Every tick gives one quote with the latest bid and ask, a bid goes before an ask of the same
+             millisecond and quotes start once both sides have been seen.
+             """
+             bids = np.asarray(bids, dtype=np.int64).reshape(-1, 2)
+             asks = np.asarray(asks, dtype=np.int64).reshape(-1, 2)
+
+             # Slot of every tick in the merged stream
+             bid_slots = np.arange(len(bids)) + np.searchsorted(asks[:, 0], bids[:, 0], "left")
+             ask_slots = np.arange(len(asks)) + np.searchsorted(bids[:, 0], asks[:, 0], "right")
+             times = np.empty(len(bids) + len(asks), dtype=np.int64)
+             times[bid_slots] = bids[:, 0]
+             times[ask_slots] = asks[:, 0]
+             is_bid = np.zeros(len(times), dtype=bool)
+             is_bid[bid_slots] = True
+
+             # Forward fill: index of the latest bid and ask at every slot (-1 before the first one)
+             bid_ndx = np.cumsum(is_bid) - 1
+             ask_ndx = np.cumsum(~is_bid) - 1
+             both = (bid_ndx >= 0) & (ask_ndx >= 0)
+
+             quotes = np.empty((np.count_nonzero(both), 3), dtype=np.int64)
+             quotes[:, 0] = times[both]
+             quotes[:, 1] = bids[bid_ndx[both], 1]
+             quotes[:, 2] = asks[ask_ndx[both], 1]
              return quotes
 
-         def write_ticks(self, path, quotes):
-             with gzip.open(path, 'wb') as f:
-                 for q in quotes:
-                     f.write(struct.pack('<qqq', int(q[0]), int(q[1]), int(q[2])))
+         @staticmethod
+         def write_ticks(path, quotes) -> bytes:
+             """
+             Write the (epoc ms, bid, ask) quotes as .zticks and return the uncompressed payload.
+             Written to a temp file first and renamed, so a .zticks file is always complete.
+             """
+             payload = np.ascontiguousarray(quotes, dtype="<i8").tobytes()
+             with gzip.open(path + ".tmp", "wb") as f:
+                 f.write(payload)
+             os.replace(path + ".tmp", path)
+             return payload
+
+    @staticmethod
+    def decode_zticks(ba: bytes) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decode a decompressed .zticks day into columnar arrays.
+        Matches C# ReadCtDayV2 logic exactly, but without a per-record loop.
+
+        Returns:
+            (epoc milliseconds, bid points, ask points, TickVolume delta) as int64 arrays
+        """
+        itemsize = QuoteCtraderCache._zticks_dtype.itemsize
+        records = np.frombuffer(ba, dtype=QuoteCtraderCache._zticks_dtype, count=len(ba) // itemsize)
+        times_ms = records["time"].copy()
+        bids = records["bid"].copy()
+        asks = records["ask"].copy()
+        if 0 == len(records):
+            return times_ms, bids, asks, np.zeros(0, dtype=np.int64)
+
+        # Calculate TickVolume delta using cTrader's logic:
+        # if both Bid and Ask are updated (non-zero in zticks), volume delta is 2, else 1.
+        # In cTrader source: return (!backtestingQuote.IsAskHit || !backtestingQuote.IsBidHit) ? 1 : 2;
+        vol_deltas = np.where((bids > 0) & (asks > 0), 2, 1).astype(np.int64)
+
+        # Match C# zero handling logic exactly (from ReadCtDayV2):
+        # sa.Tick2Bid[targetNdx] = 0 == bid ? (0 == targetNdx ? ask : sa.Tick2Bid[targetNdx - 1]) : bid;
+        # sa.Tick2Ask[targetNdx] = 0 == ask ? (0 == targetNdx ? bid : sa.Tick2Ask[targetNdx - 1]) : ask;
+        # Note: C# evaluates bid first, then ask, so ask can use the updated bid value
+        if 0 == bids[0]:
+            bids[0] = asks[0]  # First tick: use ask if bid is 0
+        if 0 == asks[0]:
+            asks[0] = bids[0]  # First tick: use bid if ask is 0
+        QuoteCtraderCache._carry_forward(bids)
+        QuoteCtraderCache._carry_forward(asks)
+        return times_ms, bids, asks, vol_deltas
+
+    @staticmethod
+    def _carry_forward(values: np.ndarray) -> None:
+        """
+        Replace zeros by the previous value in place (index 0 is always kept).
+        Each slot takes the index of the last non-zero slot via a running maximum.
+        """
+        source_ndx = np.where(values != 0, np.arange(len(values)), 0)
+        np.maximum.accumulate(source_ndx, out=source_ndx)
+        values[:] = values[source_ndx]
+
+    @staticmethod
+    def payload_to_tick_day(ba: bytes) -> TickDay:
+        """Decompressed .zticks payload -> TickDay"""
+        times_ms, bids_int, asks_int, vol_deltas = QuoteCtraderCache.decode_zticks(ba)
+
+        # Convert integers to doubles using loaderTickSize (like C# dPrice function)
+        # dPrice(int iPrice, double tickSize) = tickSize * iPrice
+        # TickVolume delta goes into the volume column, the integer prices are kept for exact compares
+        return TickDay(
+            times_ms,
+            bids_int * QuoteCtraderCache._loader_tick_size,
+            asks_int * QuoteCtraderCache._loader_tick_size,
+            vol_deltas.astype(np.float64),
+            bid_points=bids_int,
+            ask_points=asks_int,
+            point_size=QuoteCtraderCache._loader_tick_size,
+        )
+
+    @staticmethod
+    def checksum(ba: bytes) -> str:
+        return f"{zlib.crc32(ba):08x}"
+
+    @staticmethod
+    def _check_zticks(path: str) -> str:
+        """Checksum of a complete .zticks file; raises if the gzip stream or the last record is truncated"""
+        with gzip.open(path, "rb") as decompressor:
+            ba = decompressor.read()
+        if len(ba) % QuoteCtraderCache._zticks_dtype.itemsize:
+            raise ValueError(f"{path} ends with a partial record")
+        return QuoteCtraderCache.checksum(ba)
 
 
 # ... (Rest of existing file)
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
-        day_data: Bars = Bars(self.symbol.name, 0, 0)  # 0 = tick timeframe
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
         self.last_utc = run_utc = utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        if not self.catalog.has_day(run_utc):
+            return "No data", self.last_utc, TickDay.empty()
 
         path = os.path.join(self.cache_path, run_utc.strftime("%Y%m%d") + ".zticks")
-        if os.path.exists(path):
-            date_str = run_utc.strftime("%d.%m.%Y")
-            # Loading message goes to debug log, not stdout/stderr
-            if hasattr(self, 'api') and self.api:
-                self.api._debug_log(f"Loading {date_str}")
-            # Read the compressed file into a byte array
+        day_name = run_utc.strftime("%Y%m%d")
+        # a summary of a file replaced in place since (other size or mtime) is taken again
+        is_summarized = self.catalog.get_summary(run_utc) is not None
+        if self.day_cache is not None and is_summarized:
+            day_data = self.day_cache.load(day_name, path)
+            if day_data is not None:
+                return "", self.last_utc, day_data
+
+        date_str = run_utc.strftime("%d.%m.%Y")
+        # Loading message goes to debug log, not stdout/stderr
+        if hasattr(self, 'api') and self.api:
+            self.api._debug_log(f"Loading {date_str}")
+        # Read the compressed file into a byte array
+        try:
             with gzip.open(path, "rb") as decompressor:
                 ba = decompressor.read()
-
-            # Process the byte array to extract data
-            # Match C# ReadCtDayV2 logic exactly
-            source_ndx = 0
-            target_ndx = 0  # Track index in day_data (like targetNdx in C#)
-            # Use loaderTickSize = 10e-6 (0.00001) like C#
-            loader_tick_size = 10e-6  # Same as C# const double loaderTickSize = 10e-6;
-            
-            # Store bid/ask as integers (like C# Tick2Bid/Tick2Ask arrays)
-            tick_bids = []
-            tick_asks = []
-            tick_times = []
-            
-            while source_ndx < len(ba):
-                # Read epoc milliseconds timestamp (8 bytes long) - same as C#
-                timestamp_ms = struct.unpack_from("<q", ba, source_ndx)[0]
-                source_ndx += 8
-                
-                append_datetime = datetime.fromtimestamp(timestamp_ms / 1000.0, tz=pytz.UTC)
-                
-                # Read bid as int (8 bytes, cast to int like C#: var bid = (int)BitConverter.ToInt64(...))
-                bid_int = int(struct.unpack_from("<q", ba, source_ndx)[0])
-                source_ndx += 8
-                
-                # Read ask as int (8 bytes, cast to int like C#: var ask = (int)BitConverter.ToInt64(...))
-                ask_int = int(struct.unpack_from("<q", ba, source_ndx)[0])
-                source_ndx += 8
-                
-                # Calculate TickVolume delta using cTrader's logic: 
-                # if both Bid and Ask are updated (non-zero in zticks), volume delta is 2, else 1.
-                # In cTrader source: return (!backtestingQuote.IsAskHit || !backtestingQuote.IsBidHit) ? 1 : 2;
-                vol_delta = 2 if (bid_int > 0 and ask_int > 0) else 1
-                
-                # Match C# zero handling logic exactly (from ReadCtDayV2):
-                # sa.Tick2Bid[targetNdx] = 0 == bid ? (0 == targetNdx ? ask : sa.Tick2Bid[targetNdx - 1]) : bid;
-                # sa.Tick2Ask[targetNdx] = 0 == ask ? (0 == targetNdx ? bid : sa.Tick2Ask[targetNdx - 1]) : ask;
-                # Note: C# evaluates bid first, then ask, so ask can use the updated bid value
-                actual_bid_int = bid_int
-                actual_ask_int = ask_int
-                
-                if actual_bid_int == 0:
-                    if target_ndx == 0:
-                        actual_bid_int = actual_ask_int  # First tick: use ask if bid is 0
-                    else:
-                        actual_bid_int = tick_bids[target_ndx - 1]  # Use previous bid from array
-                
-                if actual_ask_int == 0:
-                    if target_ndx == 0:
-                        actual_ask_int = actual_bid_int  # First tick: use bid if ask is 0
-                    else:
-                        actual_ask_int = tick_asks[target_ndx - 1]  # Use previous ask from array
-                
-                # Store resolved integers
-                tick_bids.append(actual_bid_int)
-                tick_asks.append(actual_ask_int)
-                # Store volume delta in bids list temporarily, we will use it in append loop below
-                tick_times.append((append_datetime, vol_delta))
-                
-                # Duplicate Filtering - REMOVED to match C# TickVolume
-                # C# MarketData.GetBars() counts every tick line for volume even if prices are identical
-                # Filtering for OnTick is handled in symbol_on_tick instead
-                # if target_ndx > 0 and bid_int == tick_bids[-1] and ask_int == tick_asks[-1]:
-                #     continue
-
-                # Store as integers (like C# Tick2Bid/Tick2Ask arrays)
-                # tick_bids.append(bid_int)
-                # tick_asks.append(ask_int)
-                # tick_times.append(append_datetime)
-                target_ndx += 1
-            
-            # Now convert integers to doubles using loaderTickSize (like C# dPrice function)
-            # dPrice(int iPrice, double tickSize) = tickSize * iPrice
-            # Store both integers (for filtering) and floats (for API)
-            for i in range(len(tick_times)):
-                dt, v_delta = tick_times[i]
-                append_bid = tick_bids[i] * loader_tick_size
-                append_ask = tick_asks[i] * loader_tick_size
-                
-                day_data.append(
-                    dt,
-                    append_bid,
-                    0, 0, 0,
-                    float(v_delta),  # Store TickVolume delta in volume_bid field
-                    append_ask,
-                    0, 0, 0,
-                    float(v_delta),  # Store TickVolume delta in volume_ask field
-                )
-        else:
-            return "No data", self.last_utc, day_data
-
+        except FileNotFoundError:
+            self.catalog.remove_day(run_utc)  # deleted behind the catalog's back
+            return "No data", self.last_utc, TickDay.empty()
+
+        # Decode the whole day at once (columnar, see decode_zticks)
+        day_data = self.payload_to_tick_day(ba)
+        if not is_summarized:
+            # first decode of this day (file): record its day-tail summary (last bid/ask etc.) in the catalog
+            self.catalog.update_day(run_utc, day_data, self.checksum(ba))
+        if self.day_cache is not None:
+            self.day_cache.store(day_name, path, day_data)
         return "", self.last_utc, day_data
 
     def get_first_datetime(self) -> tuple[str, datetime]:
-        # List all files in the given path with the specific extension
-        files = [file for file in os.listdir(self.cache_path) if file.endswith(".zticks")]
-
-        # Sort the files in ascending order
-        files.sort()
-        if len(files) == 0:
+        first_day = self.catalog.first_day()
+        if first_day is None:
             return "No files found at " + self.cache_path, datetime.min.replace(tzinfo=pytz.UTC)
 
-        return "", datetime.strptime(files[0].split(".")[0], "%Y%m%d").replace(tzinfo=pytz.UTC)
+        return "", first_day
 
     def get_highest_data_rate(self) -> int:
         return 0  # we can do ticks
 
     def _get_prevs_(self, utc: datetime, bid_ask: BidAsk, not_0: int) -> float:
+        """
+        Closing bid or ask of the latest day before utc which has ticks.
+        Taken from the day-tail summary in the catalog; a day without summary (or whose file changed since)
+        is decoded once to create it.
+        """
+        day = utc.replace(hour=0, minute=0, second=0, microsecond=0)
         while True:
-            utc -= timedelta(days=1)
-
-            path = os.path.join(self.cache_path, utc.strftime("%Y%m%d") + ".zticks")
-            assert os.path.exists(path), path + " does not exist"
-            # Read the compressed file into a byte array
-            with gzip.open(path, "rb") as decompressor:
-                ba = decompressor.read()
-
-            # Get the last value of the previous day
-            if BidAsk.Bid == bid_ask:
-                index = -16
-            else:
-                index = -8
-
-            source_ndx = len(ba) + index
-            while True:
-                ret_val = struct.unpack_from("<q", ba, source_ndx)[0] * self.symbol.point_size
-                if 0 != ret_val:
-                    return ret_val
-                source_ndx -= 24
-                if source_ndx < 0:
-                    assert False, "No non zero " + str(bid_ask)
+            entry = self.catalog.previous_entry(day)
+            assert entry is not None, "No non zero " + str(bid_ask)
+            day = entry["day"]
+            entry = self.catalog.get_summary(day)
+            if entry is None:
+                self.get_day_at_utc(day)
+                entry = self.catalog.get_summary(day)
+                if entry is None:
+                    continue  # the file is gone, get_day_at_utc removed the day
+
+            if entry["tick_count"]:
+                return entry["last_bid"] if BidAsk.Bid == bid_ask else entry["last_ask"]
 
 
 # end of file
@@ -1,10 +1,14 @@
 import os
-import struct
 import requests
+import numpy as np
+from pytz import UTC
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from lzma import LZMADecompressor, FORMAT_AUTO  # type: ignore
 from Api.KitaApi import KitaApi, Symbol
-from Api.Bars import Bars
+from Api.TickDay import TickDay
 from Api.QuoteProvider import QuoteProvider
 
 
@@ -18,54 +22,81 @@ class Dukascopy(QuoteProvider):
 		Gecko) Chrome/102.0.5005.61 Safari/537.36"
     }
     _last_hour_base_timestamp: float = 0
-
-    def __init__(self, data_rate: int, parameter: str = ""):
+    # One bi5 record (big endian): ms since hour start, ask, bid (points), ask volume, bid volume
+    _bi5_dtype = np.dtype(
+        [("ms", ">u4"), ("ask", ">u4"), ("bid", ">u4"), ("volume_ask", ">f4"), ("volume_bid", ">f4")]
+    )
+
+    def __init__(
+        self,
+        data_rate: int,
+        parameter: str = "",
+        web_root: str = "",
+        max_workers: int = 8,
+        retries: int = 3,
+        backoff_seconds: float = 0.5,
+        timeout_seconds: float = 30,
+    ):
         assets_path = os.path.join("Files", self._assets_file_name)
         QuoteProvider.__init__(self, parameter, assets_path, data_rate)
+        self.web_root = web_root if "" != web_root else self._web_root
+        self.max_workers = max(1, max_workers)
+        self.timeout_seconds = timeout_seconds
+
+        # One keep-alive session shared by all download threads; transient errors are retried with backoff
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_seconds,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
         self.requests = requests.Session()
         self.requests.headers.update(self._headers)
+        self.requests.mount("http://", adapter)
+        self.requests.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Dukascopy")
 
     def init_symbol(self, api: KitaApi, symbol: Symbol):
         self.api = api
         self.symbol = symbol
         self.cache_path = os.path.join(api.DataPath, self.provider_name, "cache")
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
-        day_data: Bars = Bars(self.symbol.name, 0, 0)  # 0 = tick timeframe
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
         self.last_utc = run_utc = utc.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        while True:
-            url = self._get_url(self._web_root, run_utc, self.symbol.broker_symbol_name)
-            path = self._get_file_name(self.cache_path, run_utc, self.symbol.broker_symbol_name)
-            if os.path.exists(path):
-                with open(path, "rb") as file:
-                    data = file.read()
-            else:
-                try:
-                    response = self.requests.get(url, stream=True)
-                    response.raise_for_status()
-                    decompressor = LZMADecompressor()
-                    raw_data = response.content
-                    data = decompressor.decompress(raw_data)
-                    os.makedirs(os.path.dirname(path), exist_ok=True)
-                    with open(path, "wb") as new_file:
-                        new_file.write(data)
-                except Exception as e:
-                    return str(e), self.last_utc, None  # type: ignore
-
-            if len(data) > 0:
-                hour_data = self._get_hour(run_utc, data)
-                day_data.open_times.data += hour_data.open_times.data
-                day_data.open_bids.data += hour_data.open_bids.data
-                day_data.open_asks.data += hour_data.open_asks.data
-                day_data.volume_bids.data += hour_data.volume_bids.data
-                day_data.volume_asks.data += hour_data.volume_asks.data
-
-            run_utc += timedelta(hours=1)
-            if run_utc.date() > utc.date():
-                break
-
-        return "", self.last_utc, day_data
+        # Download, decompress and decode the 24 hours concurrently, then join them in order
+        hour_utcs = [run_utc + timedelta(hours=hour) for hour in range(24)]
+        hours: list[TickDay] = []
+        for error, hour_data in self._pool.map(self._load_hour, hour_utcs):
+            if "" != error:
+                return error, self.last_utc, TickDay.empty()
+            hours.append(hour_data)
+
+        return "", self.last_utc, TickDay.concatenate(hours)
+
+    def _load_hour(self, hour_utc: datetime) -> tuple[str, TickDay]:
+        url = self._get_url(self.web_root, hour_utc, self.symbol.broker_symbol_name)
+        path = self._get_file_name(self.cache_path, hour_utc, self.symbol.broker_symbol_name)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                data = file.read()
+        else:
+            try:
+                response = self.requests.get(url, timeout=self.timeout_seconds)
+                response.raise_for_status()
+                decompressor = LZMADecompressor()
+                data = decompressor.decompress(response.content)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as new_file:
+                    new_file.write(data)
+                os.replace(path + ".tmp", path)
+            except Exception as e:
+                return str(e), TickDay.empty()
+
+        if 0 == len(data):
+            return "", TickDay.empty()
+        return "", self._get_hour(hour_utc, data)
 
     def get_first_datetime(self) -> tuple[str, datetime]:
         start_date = datetime(2000, 1, 1)
@@ -73,9 +104,9 @@ class Dukascopy(QuoteProvider):
         error = self.symbol.name + " not found"
         while (end_date - start_date).days > 1:
             mid_date = start_date + (end_date - start_date) / 2
-            url = self._get_url(Dukascopy._web_root, mid_date, self.symbol.broker_symbol_name)
+            url = self._get_url(self.web_root, mid_date, self.symbol.broker_symbol_name)
             try:
-                response = self.requests.get(url, stream=True)
+                response = self.requests.get(url, timeout=self.timeout_seconds)
                 response.raise_for_status()
                 end_date = mid_date
                 error = ""
@@ -87,33 +118,23 @@ class Dukascopy(QuoteProvider):
     def get_highest_data_rate(self) -> int:
         return 0  # we can do ticks
 
-    def _get_hour(self, hour_base_time: datetime, data: bytes) -> Bars:
-        hour: Bars = Bars(self.symbol.name, 0, 0)
-
-        current_index: int = 0
-
-        while True:
-            # Python timestamp is microseconds since 1.1.1970
-            # Ducascopy timedelta is milliseconds since hour start
-            timestamp: float = struct.unpack_from(">I", data, current_index)[0]
-
-            # rounding will be done by the caller
-            ask = struct.unpack_from(">I", data, current_index + 4)[0] * self.symbol.point_size
-            bid = struct.unpack_from(">I", data, current_index + 8)[0] * self.symbol.point_size
-            volume_ask = struct.unpack_from(">f", data, current_index + 12)[0]
-            volume_bid = struct.unpack_from(">f", data, current_index + 16)[0]
-
-            hour.open_times.data.append(hour_base_time + timedelta(milliseconds=timestamp))
-            hour.open_bids.data.append(bid)
-            hour.open_asks.data.append(ask)
-            hour.volume_bids.data.append(volume_bid)
-            hour.volume_asks.data.append(volume_ask)
-
-            current_index += 20
-            if current_index >= len(data):
-                break
-
-        return hour
+    def _get_hour(self, hour_base_time: datetime, data: bytes) -> TickDay:
+        """
+        Decode one decompressed bi5 hour with a single structured view.
+        Dukascopy timedelta is milliseconds since hour start, prices are integer points (rounding will be
+        done by the caller). Dukascopy volumes are traded volumes, not TickVolume, so the volume column stays empty
+        """
+        usable = len(data) - len(data) % self._bi5_dtype.itemsize
+        records = np.frombuffer(data, dtype=self._bi5_dtype, count=usable // self._bi5_dtype.itemsize)
+        hour_base_ms = int((hour_base_time.replace(tzinfo=UTC) - TickDay.EPOCH).total_seconds()) * 1000
+        return TickDay(
+            hour_base_ms + records["ms"].astype(np.int64),
+            records["bid"] * self.symbol.point_size,
+            records["ask"] * self.symbol.point_size,
+            bid_points=records["bid"],
+            ask_points=records["ask"],
+            point_size=self.symbol.point_size,
+        )
 
     def _get_url(self, base_url: str, utc: datetime, symbol_name: str) -> str:
         return f"{base_url}/{symbol_name}/{utc.year}/{utc.month - 1:02}/{utc.day:02}/{utc.hour:02}h_ticks.bi5"
@@ -4,6 +4,7 @@ import clr
 from datetime import datetime, timedelta
 from lzma import LZMADecompressor, FORMAT_AUTO  # type: ignore
 from Api.KitaApi import KitaApi, Symbol, Bars
+from Api.TickDay import TickDay
 from Api.QuoteProvider import QuoteProvider
 
 
@@ -41,8 +42,8 @@ class NinjaFiles(QuoteProvider):
          }
         """
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
-        day_data: Bars = []
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        day_data: TickDay = TickDay.empty()
 
         return "", self.last_utc, day_data
 
@@ -6,9 +6,11 @@ Handles second-based OHLCV data with bid/ask from zipped daily files
 import os
 import zipfile
 import csv
-from datetime import datetime, timedelta
+import numpy as np
+import pytz
+from datetime import datetime
 from Api.KitaApi import KitaApi, Symbol
-from Api.Bars import Bars
+from Api.TickDay import TickDay
 from Api.QuoteProvider import QuoteProvider
 
 
@@ -57,7 +59,7 @@ class QuoteQuantConnect(QuoteProvider):
                 self.api._debug_log(f"WARNING: Data path does not exist: {self.symbol_path}")
                 self.api._debug_log(f"Expected path: {self.symbol_path}")
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
         """
         Load one day of data (aggregated to minute bars)
         
@@ -65,12 +67,12 @@ class QuoteQuantConnect(QuoteProvider):
             utc: The date to load
             
         Returns:
-            tuple of (error_message, last_datetime, bars_data)
+            tuple of (error_message, last_datetime, minute bars as TickDay)
         """
-        from Api.KitaApiEnums import Constants
         # Create minute-level bars (60 seconds) instead of tick data
-        day_data: Bars = Bars(self.symbol.name, 60, 0)
+        day_data: TickDay = TickDay.empty(60)
         self.last_utc = utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_ms = int((self.last_utc.replace(tzinfo=pytz.UTC) - TickDay.EPOCH).total_seconds()) * 1000
         
         # WEEKEND HANDLING: Check if this is a weekend day (Saturday=5, Sunday=6)
         weekday = utc.weekday()
@@ -106,7 +108,7 @@ class QuoteQuantConnect(QuoteProvider):
                 # Get first CSV file in zip
                 csv_files = [f for f in zip_ref.namelist() if f.endswith('.csv')]
                 if not csv_files:
-                    return f"No CSV file found in {zip_path}", self.last_utc, None  # type: ignore
+                    return f"No CSV file found in {zip_path}", self.last_utc, day_data
                 
                 # Read CSV data
                 with zip_ref.open(csv_files[0]) as csv_file:
@@ -120,6 +122,8 @@ class QuoteQuantConnect(QuoteProvider):
                     # 9 columns total: [0]=timestamp, [1-4]=bid OHLC, [5-8]=ask OHLC
                     # Aggregate second data into 1-minute bars
                     
+                    # One row per minute: [open time ms, bid OHLC, ask OHLC]
+                    minutes: list[list[float]] = []
                     current_minute_data = None
                     current_minute = None
                     
@@ -131,9 +135,8 @@ class QuoteQuantConnect(QuoteProvider):
                             # Column 0: Milliseconds since midnight
                             timestamp_ms = int(row[0])
                             
-                            # Convert milliseconds since midnight to datetime
-                            timestamp = self.last_utc + timedelta(milliseconds=timestamp_ms)
-                            minute_timestamp = timestamp.replace(second=0, microsecond=0)
+                            # Convert milliseconds since midnight to the epoc ms of the minute start
+                            minute_timestamp = day_ms + timestamp_ms // 60_000 * 60_000
                             
                             # Columns 1-4: Bid OHLC
                             bid_open = float(row[1])
@@ -151,19 +154,7 @@ class QuoteQuantConnect(QuoteProvider):
                             if current_minute is None or minute_timestamp != current_minute:
                                 # New minute - save previous minute bar
                                 if current_minute_data is not None:
-                                    day_data.append(
-                                        current_minute,
-                                        current_minute_data['bid_open'],
-                                        current_minute_data['bid_high'],
-                                        current_minute_data['bid_low'],
-                                        current_minute_data['bid_close'],
-                                        0.0,  # volume_bid
-                                        current_minute_data['ask_open'],
-                                        current_minute_data['ask_high'],
-                                        current_minute_data['ask_low'],
-                                        current_minute_data['ask_close'],
-                                        0.0   # volume_ask
-                                    )
+                                    minutes.append(self._minute_row(current_minute, current_minute_data))
                                 
                                 # Start new minute
                                 current_minute = minute_timestamp
@@ -194,19 +185,10 @@ class QuoteQuantConnect(QuoteProvider):
                     
                     # Don't forget the last minute
                     if current_minute_data is not None:
-                        day_data.append(
-                            current_minute,
-                            current_minute_data['bid_open'],
-                            current_minute_data['bid_high'],
-                            current_minute_data['bid_low'],
-                            current_minute_data['bid_close'],
-                            0.0,  # volume_bid
-                            current_minute_data['ask_open'],
-                            current_minute_data['ask_high'],
-                            current_minute_data['ask_low'],
-                            current_minute_data['ask_close'],
-                            0.0   # volume_ask
-                        )
+                        minutes.append(self._minute_row(current_minute, current_minute_data))
+
+                    if minutes:
+                        day_data = self._minutes_to_day(minutes)
             
             if day_data.count == 0:
                 if hasattr(self, 'api') and self.api:
@@ -225,6 +207,36 @@ class QuoteQuantConnect(QuoteProvider):
             # Return empty data with error message
             return error_msg, self.last_utc, day_data
 
+    def _minute_row(self, minute_ms: int, minute_data: dict[str, float]) -> list[float]:
+        return [
+            minute_ms,
+            minute_data['bid_open'],
+            minute_data['bid_high'],
+            minute_data['bid_low'],
+            minute_data['bid_close'],
+            minute_data['ask_open'],
+            minute_data['ask_high'],
+            minute_data['ask_low'],
+            minute_data['ask_close'],
+        ]
+
+    def _minutes_to_day(self, minutes: list[list[float]]) -> TickDay:
+        """Turn the collected minute rows into a TickDay (close prices plus open/high/low columns)"""
+        rows = np.array(minutes, dtype=np.float64)
+        return TickDay(
+            rows[:, 0].astype(np.int64),
+            rows[:, 4],
+            rows[:, 8],
+            np.zeros(len(rows)),  # no volume in QuantConnect quote files
+            60,
+            open_bids=rows[:, 1],
+            high_bids=rows[:, 2],
+            low_bids=rows[:, 3],
+            open_asks=rows[:, 5],
+            high_asks=rows[:, 6],
+            low_asks=rows[:, 7],
+        )
+
     def get_first_datetime(self) -> tuple[str, datetime]:
         """
         Find the first available date in the data
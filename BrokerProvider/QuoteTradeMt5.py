@@ -3,6 +3,7 @@ import MetaTrader5 as mt5 # type: ignore
 from datetime import datetime
 from Api.KitaApi import TradeProvider, KitaApi, Symbol
 from Api.Bars import Bars
+from Api.TickDay import TickDay
 from Api.QuoteProvider import QuoteProvider
 
 
@@ -24,7 +25,7 @@ class BrokerMt5(QuoteProvider, TradeProvider):
         self.cache_path = cache_path
         pass
 
-    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, Bars]:
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
         return None  # type: ignore
 
     def get_first_datetime(self) -> tuple[str, datetime]:
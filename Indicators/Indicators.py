@@ -5,7 +5,16 @@ class Indicators:
     def __init__(self, api=None, bot=None):
         self._api = api or bot
         self._created_indicators = []
-    
+
+    def reserve(self, source, periods):
+        """
+        Declare up front (e.g. in on_init) that indicators of up to periods will be created on source
+        (a DataSeries or Bars): its Bars get the ring buffer capacity once, so registering them later
+        never resizes (copies) the bars.
+        """
+        bars = source if hasattr(source, "reserve") else source._parent
+        bars.reserve(periods + 1)  # ring buffer size = max(period) + 1 bar
+
     def simple_moving_average(self, source, periods):
         from Indicators.SimpleMovingAverage import SimpleMovingAverage
         indicator = SimpleMovingAverage(source, periods)
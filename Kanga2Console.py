@@ -73,16 +73,12 @@ class MainConsole:
         # region
         import time
         start_time = time.time()
-        tick_count = 0
         self.robot._debug_log("[DEBUG] Starting tick loop...")
-        while True:
-            tick_count += 1
-            if tick_count % 100000 == 0:
-                self.robot._debug_log(f"[DEBUG] Processed {tick_count:,} ticks...")
-            result = self.robot.do_tick()
-            if result:
-                self.robot._debug_log(f"[DEBUG] Tick loop ended after {tick_count:,} ticks")
-                break
+        _, tick_count = self.robot.run(
+            progress_cb=lambda ticks, _: self.robot._debug_log(f"[DEBUG] Processed {ticks:,} ticks..."),
+            progress_every=100000,
+        )
+        self.robot._debug_log(f"[DEBUG] Tick loop ended after {tick_count:,} ticks")
         elapsed_time = time.time() - start_time
         self.robot._debug_log(f"Backtest completed: {tick_count:,} ticks processed in {elapsed_time:.2f} seconds ({elapsed_time/60:.2f} minutes)")
         self.robot._debug_log(f"Performance: {tick_count/elapsed_time:.0f} ticks/second")
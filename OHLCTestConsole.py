@@ -69,21 +69,19 @@ class OHLCTestConsole:
         # region
         import time
         start_time = time.time()
-        tick_count = 0
         last_log_time = start_time
+
+        def log_progress(tick_count: int, _: int):
+            # Log progress every 5 seconds (the clock is read once per progress batch, not per tick)
+            nonlocal last_log_time
+            current_time = time.time()
+            if current_time - last_log_time >= 5.0:
+                elapsed = current_time - start_time
+                self.robot._debug_log(f"Console: Processed {tick_count} ticks in {elapsed:.1f}s ({tick_count/elapsed:.0f} ticks/sec)")
+                last_log_time = current_time
+
         try:
-            while True:
-                tick_count += 1
-                result = self.robot.do_tick()
-                if result:
-                    break
-                
-                # Log progress every 5 seconds
-                current_time = time.time()
-                if current_time - last_log_time >= 5.0:
-                    elapsed = current_time - start_time
-                    self.robot._debug_log(f"Console: Processed {tick_count} ticks in {elapsed:.1f}s ({tick_count/elapsed:.0f} ticks/sec)")
-                    last_log_time = current_time
+            self.robot.run(progress_cb=log_progress, progress_every=10000)
         except KeyboardInterrupt:
              pass       
         
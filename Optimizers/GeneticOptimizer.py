@@ -116,8 +116,7 @@ class GeneticOptimizer:
             robot.do_init()
             robot.do_start()
             
-            while not robot.do_tick():
-                pass
+            robot.run()
             
             robot.do_stop()
             
@@ -317,8 +316,7 @@ class GeneticOptimizer:
         
         robot.do_init()
         robot.do_start()
-        while not robot.do_tick():
-            pass
+        robot.run()
         robot.do_stop()
         
         # Test results
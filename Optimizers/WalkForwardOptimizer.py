@@ -157,8 +157,7 @@ class WalkForwardOptimizer:
             robot.do_init()
             robot.do_start()
             
-            while not robot.do_tick():
-                pass
+            robot.run()
             
             robot.do_stop()
             
@@ -58,6 +58,7 @@ class Template(KitaApi):
         # 4. Define one or more bars (optional)
         self.sma_period = 2
         # request_bars(timeframe in seconds, look back number of bars so indicators can warm up
+        # on_bar=True calls on_bar(symbol, timeframe) below each time a bar of that timeframe closes
         # error, self.h1_bars = self.gbpusd_symbol.request_bars(Constants.SEC_PER_HOUR, self.sma_period)
         # error, self.d1_bars = self.gbpusd_symbol.request_bars(Constants.SEC_PER_DAY, self.sma_period)
         error, self.m5_bars = self.gbpusd_symbol.request_bars(5 * Constants.SEC_PER_MINUTE, self.sma_period)
@@ -96,6 +97,10 @@ class Template(KitaApi):
 
         print("")
 
+    ###################################
+    def on_bar(self, symbol: Symbol, timeframe: int):
+        pass  # a bar of a timeframe requested with on_bar=True has closed (called before on_tick)
+
     ###################################
     def on_tick(self, symbol: Symbol):
         if symbol.is_warm_up:
@@ -0,0 +1,132 @@
+"""
+Bar replay: a bar provider (data_rate != 0) drives the backtest bar by bar
+Run: python -m pytest test_bar_replay.py
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pytz
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Symbol in the order the app does)
+from Api.Bars import Bars
+from Api.Symbol import Symbol
+from Api.TickDay import TickDay
+
+FIRST_DAY = datetime(2024, 3, 4, tzinfo=pytz.UTC)
+BARS_PER_DAY = 120  # two hours of M1 bars
+SPREAD = 0.0002
+
+
+class BarProvider:
+    """M1 bars as a provider with get_highest_data_rate() == 60 returns them"""
+
+    data_rate = 60
+
+    def __init__(self, days: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.days = {}
+        close = 1.1
+        for ndx in range(days):
+            day = FIRST_DAY + timedelta(days=ndx)
+            day_ms = int((day - TickDay.EPOCH).total_seconds()) * 1000
+            opens = close + np.cumsum(rng.normal(0, 0.0003, BARS_PER_DAY))
+            closes = opens + rng.normal(0, 0.0003, BARS_PER_DAY)
+            highs = np.maximum(opens, closes) + rng.uniform(0, 0.0003, BARS_PER_DAY)
+            lows = np.minimum(opens, closes) - rng.uniform(0, 0.0003, BARS_PER_DAY)
+            close = closes[-1]
+            self.days[day] = TickDay(
+                day_ms + np.arange(BARS_PER_DAY, dtype=np.int64) * 60_000,
+                closes,
+                closes + SPREAD,
+                np.full(BARS_PER_DAY, 10.0),
+                60,
+                open_bids=opens,
+                high_bids=highs,
+                low_bids=lows,
+                open_asks=opens + SPREAD,
+                high_asks=highs + SPREAD,
+                low_asks=lows + SPREAD,
+            )
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        return "", utc, self.days.get(utc, TickDay.empty(60))
+
+
+def make_symbol(provider: BarProvider, days: int, bar_tick_synthesis: bool) -> Symbol:
+    robot = SimpleNamespace(
+        _BacktestStartUtc=FIRST_DAY, _BacktestEndUtc=FIRST_DAY + timedelta(days=days), _debug_log=lambda _: None
+    )
+    symbol = Symbol.__new__(Symbol)
+    symbol.api = SimpleNamespace(
+        robot=robot, TickPrefetchDepth=0, BarTickSynthesis=bar_tick_synthesis, TickPrefilter=True
+    )
+    symbol.name = "EURUSD"
+    symbol.point_size = 0.00001
+    symbol.quote_provider = provider
+    symbol.time = None
+    symbol.prev_bid = symbol.prev_ask = 0.0
+    symbol.bars_dictonary = {
+        60: Bars(symbol.name, 60, 1000, symbol=symbol),
+        3600: Bars(symbol.name, 3600, 100, symbol=symbol),
+    }
+    symbol._init_tick_stream(FIRST_DAY)
+    symbol._build_indicator_cache()
+    return symbol
+
+
+def replay(symbol: Symbol) -> list[tuple[datetime, float, float]]:
+    steps = []
+    while "" == symbol.symbol_on_tick():
+        steps.append((symbol.time, symbol.bid, symbol.ask))
+    return steps
+
+
+def test_bars_are_replayed_at_their_open():
+    days = 2
+    provider = BarProvider(days)
+    symbol = make_symbol(provider, days, bar_tick_synthesis=False)
+    steps = replay(symbol)
+
+    # one step per source bar at its open time and open prices
+    source = TickDay.concatenate(list(provider.days.values()))
+    assert len(steps) == source.count
+    times = [int((time - TickDay.EPOCH).total_seconds() * 1000) for time, _, _ in steps]
+    assert times == source.times.tolist()
+    opens = np.concatenate([day.open_bids for day in provider.days.values()])
+    np.testing.assert_allclose([bid for _, bid, _ in steps], opens)
+
+    # M1 bars are the source bars again (high/low/close merged when the next bar opened)
+    m1 = symbol.bars_dictonary[60]
+    highs = np.concatenate([day.high_bids for day in provider.days.values()])
+    lows = np.concatenate([day.low_bids for day in provider.days.values()])
+    for ago in range(1, 10):
+        assert m1.high_bids.last(ago) == highs[-1 - ago]
+        assert m1.low_bids.last(ago) == lows[-1 - ago]
+        assert m1.close_bids.last(ago) == source.bids[-1 - ago]
+
+    # the H1 bar before the last one covers 60 source bars
+    h1 = symbol.bars_dictonary[3600]
+    assert h1.high_bids.last(1) == highs[-120:-60].max()
+    assert h1.low_bids.last(1) == lows[-120:-60].min()
+    assert h1.close_bids.last(1) == source.bids[-61]
+
+
+def test_bar_tick_synthesis():
+    provider = BarProvider(1)
+    symbol = make_symbol(provider, 1, bar_tick_synthesis=True)
+    steps = replay(symbol)
+    day = provider.days[FIRST_DAY]
+
+    # first bar: open, then the extreme nearer the close last, then close - a quarter bar apart
+    rising = day.bids[0] >= day.open_bids[0]
+    first, second = (day.low_bids[0], day.high_bids[0]) if rising else (day.high_bids[0], day.low_bids[0])
+    assert [bid for _, bid, _ in steps[:4]] == [day.open_bids[0], first, second, day.bids[0]]
+    assert [time for time, _, _ in steps[:4]] == [FIRST_DAY + timedelta(seconds=15 * k) for k in range(4)]
+    assert len(steps) <= 4 * BARS_PER_DAY  # unchanged synthesized ticks are filtered
+
+    m1 = symbol.bars_dictonary[60]
+    assert m1.high_bids.last(1) == day.high_bids[-2]
+    assert m1.low_bids.last(1) == day.low_bids[-2]
+    assert m1.close_bids.last(1) == day.bids[-2]
+
+
+# end of file
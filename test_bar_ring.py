@@ -0,0 +1,119 @@
+"""
+BarRing: struct-of-arrays bar storage of Bars; its columns must behave like the former Ringbuffer per field
+Run: python -m pytest test_bar_ring.py
+"""
+import math
+import random
+from datetime import datetime
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.BarRing import BarRing
+from Api.ring_buffer import Ringbuffer
+from Api.TickDay import TickDay
+from Indicators.Indicators import Indicators
+
+FIRST_MS = TickDay.to_ms(datetime(2024, 3, 4))
+
+
+def record(ndx: int) -> tuple:
+    bid = 1.08 + ndx * 0.00001
+    return (FIRST_MS + ndx * 60_000, bid, bid + 2e-4, bid - 2e-4, bid, 5.0, bid + 1e-4, bid + 3e-4, bid - 1e-4,
+            bid + 1e-4, 5.0, 5)  # fmt: skip
+
+
+def test_columns_match_ringbuffer_over_wrap_and_resize():
+    rng = random.Random(1)
+    ring = BarRing(7)
+    close = ring.column("close_bid")
+    reference = Ringbuffer[float](7)
+    for ndx in range(40):
+        ring.append(record(ndx))
+        reference.add(record(ndx)[4])
+        if 20 == ndx:
+            ring.resize(16)
+            copy = Ringbuffer[float](16)
+            for rel_pos in range(reference._count - 1, -1, -1):
+                copy.add(reference[rel_pos])
+            copy._add_count = reference._add_count
+            reference = copy
+        if rng.random() < 0.3:  # the current bar is updated through the column
+            close[0] = reference[0] = close[0] + 1e-5
+
+        assert (close._count, close._size, close._add_count) == (reference._count, reference._size, ndx + 1)
+        assert [close[rel_pos] for rel_pos in range(close._count)] == [
+            reference[rel_pos] for rel_pos in range(reference._count)
+        ]
+        assert ring.close_bid[ring.slot(0)] == close[0]
+        newest = [reference[rel_pos] for rel_pos in range(min(5, reference._count))]
+        assert close.window(5).tolist() == newest[::-1]
+
+
+def test_bars_series_are_views_of_one_ring():
+    bars = Bars("EURUSD", 60, 4)  # ring of 5 bars (look back + 1)
+    for ndx in range(8):
+        open_time = TickDay.from_ms(record(ndx)[0])
+        bars.append(open_time, *record(ndx)[1:11])
+    bars._update_current_bar(2.0, 2.0001, 3)
+
+    assert bars.count == 5 and bars.close_bids._add_count == bars.open_times._add_count == 8
+    assert bars.open_times.last(1) == TickDay.from_ms(record(6)[0])
+    assert bars.close_bids.last(0) == bars.high_bids.last(0) == 2.0
+    assert bars.volume_bids.last(0) == 6.0
+    last = bars.Last(0)
+    assert last.Close == 2.0 and last.TickVolume == 8 and last.Open == record(7)[1]
+    assert math.isnan(bars.close_bids[2])  # overwritten, absolute index
+    assert bars.close_bids[4] == record(4)[4]
+
+    bars.update_max_period_requirement(12)
+    assert bars.count == 5 and bars.close_bids._add_count == 8
+    assert bars.close_bids[4] == record(4)[4] and bars.Last(4).Open == record(3)[1]
+
+
+def test_resize_block_copy_and_reserve():
+    for appended in (0, 3, 5, 9):  # empty, partly filled, full, wrapped around
+        ring = BarRing(5)
+        for ndx in range(appended):
+            ring.append(record(ndx))
+        expected = [ring[rel_pos].Close for rel_pos in range(ring._count)]
+        ring.resize(8)
+        assert [ring[rel_pos].Close for rel_pos in range(ring._count)] == expected
+        assert ring._add_count == appended and ring._count == min(appended, 5)
+        ring.append(record(appended))
+        assert [ring[rel_pos].Close for rel_pos in range(ring._count)] == [record(appended)[4]] + expected
+
+    bars = Bars("EURUSD", 60, 4)
+    Indicators().reserve(bars.close_bids, 50)
+    values = bars._bar_buffer.values
+    assert bars._bar_buffer._size == bars.close_bids._size == 51 and bars.look_back == 5
+    bars.update_max_period_requirement(20)  # an indicator registered later
+    bars.update_max_period_requirement(50)
+    assert bars._bar_buffer.values is values and bars.look_back == 51
+    bars.update_max_period_requirement(60)
+    assert bars._bar_buffer._size == bars.open_times._size == 61
+
+
+def test_last_is_cached_live_view():
+    bars = Bars("EURUSD", 60, 4)
+    for ndx in range(3):
+        bars.append(TickDay.from_ms(record(ndx)[0]), *record(ndx)[1:11])
+
+    current = bars.Last(0)
+    assert current is bars.Last(0) and bars.Last(1) is not current
+    snapshot = bars._bar_buffer[1]
+    view = bars.Last(1)
+    for name in ("OpenTime", "Open", "High", "Low", "Close", "TickVolume", "open_time", "close_bid"):
+        assert getattr(view, name) == getattr(snapshot, name)
+    assert view.close_ask == record(1)[9] and view.volume_ask == record(1)[10]
+
+    bars._update_current_bar(2.0, 2.0001, 1)
+    assert current.High == current.Close == 2.0 and current.TickVolume == 6
+    bars.append(TickDay.from_ms(record(3)[0]), *record(3)[1:11])
+    assert bars.Last(1) is current  # the same bar, one position further back
+
+
+def test_bar_has_slots():
+    bar = Bars("EURUSD", 60, 4).Last(0)  # out of range: an empty Bar
+    assert not hasattr(bar, "__dict__") and bar.close_ask == 0
+
+
+# end of file
@@ -0,0 +1,238 @@
+"""
+QuoteCtraderCache.InternalDataDownloader against the local Open API stand-in (no internet needed)
+Run: python -m pytest test_ctrader_downloader_offline.py
+"""
+import os
+import gzip
+import random
+import pytest
+from datetime import timedelta
+import numpy as np
+
+pytest.importorskip("ctrader_open_api")
+pytest.importorskip("Api.KitaApi")  # import order, Symbol needs KitaApi first
+QuoteCtraderCache = pytest.importorskip("BrokerProvider.QuoteCtraderCache").QuoteCtraderCache
+from Api.DataCatalog import DataCatalog  # noqa: E402
+from Api.KitaApiEnums import BidAsk  # noqa: E402
+from Benchmarks.bench_ctrader_download import FIRST_DAY, download  # noqa: E402
+from Benchmarks.ctrader_stand_in import DAY_MS, make_ticks  # noqa: E402
+from OpenApiModelMessages_pb2 import ProtoOAQuoteType  # noqa: E402
+
+DAYS = 3
+TICKS = make_ticks(FIRST_DAY, DAYS, 2_500)
+Downloader = QuoteCtraderCache.InternalDataDownloader
+
+
+def expected_day(day: int) -> np.ndarray:
+    """Bid/ask quotes of one day merged like the downloader does"""
+    start_ms = int(FIRST_DAY.timestamp()) * 1000 + day * DAY_MS
+    sides = []
+    for quote_type in (ProtoOAQuoteType.BID, ProtoOAQuoteType.ASK):
+        times, prices = TICKS[quote_type]
+        mask = (times >= start_ms) & (times < start_ms + DAY_MS)
+        sides.append(np.column_stack((times[mask], prices[mask])))
+    return Downloader.merge_ticks(*sides)
+
+
+def loop_merge(bids: list, asks: list) -> list:
+    """The former per-tick merge_ticks loop"""
+    quotes = []
+    b_idx = a_idx = 0
+    last_b = last_a = None
+    while b_idx < len(bids) or a_idx < len(asks):
+        ts_b = bids[b_idx][0] if b_idx < len(bids) else float("inf")
+        ts_a = asks[a_idx][0] if a_idx < len(asks) else float("inf")
+        if ts_b <= ts_a:
+            curr_ts = ts_b
+            last_b = bids[b_idx][1]
+            b_idx += 1
+        else:
+            curr_ts = ts_a
+            last_a = asks[a_idx][1]
+            a_idx += 1
+        if last_b is not None and last_a is not None:
+            quotes.append((curr_ts, last_b, last_a))
+    return quotes
+
+
+def test_merge_matches_loop():
+    rng = random.Random(1)
+    for _ in range(200):
+        # few distinct milliseconds, so there are many ties within and across sides
+        bids = [(rng.randint(0, 20), rng.randint(1, 99)) for _ in range(rng.randint(0, 30))]
+        asks = [(rng.randint(0, 20), rng.randint(1, 99)) for _ in range(rng.randint(0, 30))]
+        bids.sort(key=lambda x: x[0])
+        asks.sort(key=lambda x: x[0])
+        expected = np.array(loop_merge(bids, asks), dtype=np.int64).reshape(-1, 3)
+        merged = Downloader.merge_ticks(Downloader.sort_ticks(bids), Downloader.sort_ticks(asks))
+        assert np.array_equal(merged, expected)
+
+
+def test_written_day_round_trips(tmp_path):
+    quotes = expected_day(0)
+    cache_path = str(tmp_path / "t1")
+    os.makedirs(cache_path)
+    Downloader.write_ticks(os.path.join(cache_path, FIRST_DAY.strftime("%Y%m%d.zticks")), quotes)
+    provider = QuoteCtraderCache(0)
+    provider.cache_path = cache_path
+    provider.catalog = DataCatalog(cache_path, ".zticks")
+
+    error, _, day = provider.get_day_at_utc(FIRST_DAY)
+
+    assert "" == error
+    assert np.array_equal(day.times, quotes[:, 0])
+    assert np.allclose(day.bids, quotes[:, 1] * 1e-5)
+    assert np.allclose(day.asks, quotes[:, 2] * 1e-5)
+    assert np.all(day.volumes == 2)
+
+
+def test_replaced_day_is_summarized_again(tmp_path):
+    cache_path = str(tmp_path / "t1")
+    os.makedirs(cache_path)
+    path = os.path.join(cache_path, FIRST_DAY.strftime("%Y%m%d.zticks"))
+    Downloader.write_ticks(path, expected_day(0))
+    provider = QuoteCtraderCache(0)
+    provider.cache_path = cache_path
+    provider.catalog = DataCatalog(cache_path, ".zticks")
+    provider.get_day_at_utc(FIRST_DAY)
+    assert len(expected_day(0)) == provider.catalog.get_summary(FIRST_DAY)["tick_count"]
+
+    quotes = expected_day(1)[:100]  # the day file is replaced in place
+    Downloader.write_ticks(path, quotes)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert provider.catalog.get_summary(FIRST_DAY) is None
+
+    error, _, day = provider.get_day_at_utc(FIRST_DAY)
+
+    entry = provider.catalog.get_summary(FIRST_DAY)
+    assert "" == error and 100 == day.count == entry["tick_count"]
+    assert (entry["first_ms"], entry["last_ms"]) == (quotes[0, 0], quotes[-1, 0])
+    assert entry["last_bid"] == day.bids[-1] and entry["last_ask"] == day.asks[-1]
+
+
+def scan_prevs(cache_path: str, utc, bid_ask) -> float:
+    """The former _get_prevs_: backward scan of the previous day files for the last non zero field"""
+    while True:
+        utc -= timedelta(days=1)
+        with gzip.open(os.path.join(cache_path, utc.strftime("%Y%m%d.zticks")), "rb") as file:
+            records = np.frombuffer(file.read(), dtype=np.int64).reshape(-1, 3)
+        values = records[:, 1 if BidAsk.Bid == bid_ask else 2]
+        values = values[values != 0]
+        if len(values):
+            return values[-1] * 1e-5
+
+
+def test_prevs_match_backward_scan(tmp_path):
+    cache_path = str(tmp_path / "t1")
+    os.makedirs(cache_path)
+    quotes = expected_day(0).copy()
+    quotes[-7:, 1] = 0  # the day ends with ask only and bid only updates
+    quotes[-3:, 2] = 0
+    quotes[-1, 1] = 0
+    paths = [
+        os.path.join(cache_path, (FIRST_DAY + timedelta(days=day)).strftime("%Y%m%d.zticks")) for day in (0, 1)
+    ]
+    Downloader.write_ticks(paths[0], quotes)
+    Downloader.write_ticks(paths[1], np.zeros((0, 3), dtype=np.int64))  # a day without ticks
+    provider = QuoteCtraderCache(0)
+    provider.cache_path = cache_path
+    provider.catalog = DataCatalog(cache_path, ".zticks")
+    day = FIRST_DAY + timedelta(days=2)
+
+    for bid_ask in (BidAsk.Bid, BidAsk.Ask):
+        assert provider._get_prevs_(day, bid_ask, 0) == pytest.approx(scan_prevs(cache_path, day, bid_ask))
+
+    quotes[-1, 1:] = (123_456, 123_460)  # the former summary must not be trusted for a rewritten file
+    Downloader.write_ticks(paths[0], quotes)
+    os.utime(paths[0], ns=(os.stat(paths[0]).st_atime_ns, os.stat(paths[0]).st_mtime_ns + 1_000_000_000))
+    for bid_ask in (BidAsk.Bid, BidAsk.Ask):
+        assert provider._get_prevs_(day, bid_ask, 0) == pytest.approx(scan_prevs(cache_path, day, bid_ask))
+
+
+def test_days_match_stand_in(tmp_path):
+    _, stand_in = download(TICKS, DAYS, 0.05, str(tmp_path))
+
+    assert 0 == stand_in.violations
+    for day in range(DAYS):
+        with gzip.open(tmp_path / (FIRST_DAY + timedelta(days=day)).strftime("%Y%m%d.zticks"), "rb") as file:
+            records = np.frombuffer(file.read(), dtype=np.int64).reshape(-1, 3)
+        assert np.array_equal(records, expected_day(day))
+
+
+def test_catalog_is_updated(tmp_path):
+    catalog = DataCatalog(str(tmp_path / "t1"), ".zticks")
+    download(TICKS, DAYS, 0.05, str(tmp_path / "t1"), catalog=catalog)
+
+    assert [] == catalog.missing_days(FIRST_DAY, FIRST_DAY + timedelta(days=DAYS))
+    assert len(expected_day(1)) == catalog.get_entry(FIRST_DAY + timedelta(days=1))["tick_count"]
+
+
+def test_limits_are_kept(tmp_path):
+    _, stand_in = download(TICKS, DAYS, 0.05, str(tmp_path), max_in_flight=3, max_per_second=4)
+
+    assert 0 == stand_in.violations
+    assert stand_in.max_in_flight_seen <= 3
+
+
+def test_interrupted_download_resumes(tmp_path):
+    _, full = download(TICKS, DAYS, 0.05, str(tmp_path / "full"))
+    _, interrupted = download(TICKS, DAYS, 0.05, str(tmp_path), {"fail_after_tick_requests": 10})
+    checkpoint = QuoteCtraderCache.DownloadCheckpoint(str(tmp_path))
+    assert 10 == interrupted.tick_request_count
+    assert 0 < len(checkpoint.days)
+    assert not any(name.endswith(".zticks") for name in os.listdir(tmp_path) if name[:8] in checkpoint.days)
+
+    _, resumed = download(TICKS, DAYS, 0.05, str(tmp_path))
+
+    assert resumed.tick_request_count < full.tick_request_count
+    for day in range(DAYS):
+        with gzip.open(tmp_path / (FIRST_DAY + timedelta(days=day)).strftime("%Y%m%d.zticks"), "rb") as file:
+            records = np.frombuffer(file.read(), dtype=np.int64).reshape(-1, 3)
+        assert np.array_equal(records, expected_day(day))
+    assert not any(name.endswith((".part", ".tmp", ".json")) for name in os.listdir(tmp_path))
+
+    # an orphan part file (page written, crash before its cursor was stored) is not taken over
+    checkpoint = QuoteCtraderCache.DownloadCheckpoint(str(tmp_path))
+    with open(tmp_path / "20240101_1.part", "wb") as file:
+        file.write(np.array([[900, 102], [901, 103]], dtype="<i8").tobytes())
+    assert (899, [], False) == checkpoint.resume("20240101", 1, 899)
+    checkpoint.confirm_page("20240101", 1, [[5, 100], [6, 101]], 4, False)
+    assert (4, [[5, 100], [6, 101]], False) == QuoteCtraderCache.DownloadCheckpoint(str(tmp_path)).resume(
+        "20240101", 1, 899
+    )
+
+
+def test_broken_files_are_found(tmp_path):
+    cache_path = str(tmp_path / "t1")
+    os.makedirs(cache_path)
+    for day in range(DAYS):
+        Downloader.write_ticks(
+            os.path.join(cache_path, (FIRST_DAY + timedelta(days=day)).strftime("%Y%m%d.zticks")), expected_day(day)
+        )
+    truncated = os.path.join(cache_path, (FIRST_DAY + timedelta(days=1)).strftime("%Y%m%d.zticks"))
+    with open(truncated, "r+b") as file:
+        file.truncate(os.path.getsize(truncated) // 2)
+    catalog = DataCatalog(cache_path, ".zticks")
+
+    broken = catalog.verify(FIRST_DAY, FIRST_DAY + timedelta(days=DAYS), QuoteCtraderCache._check_zticks)
+
+    assert [FIRST_DAY + timedelta(days=1)] == broken
+    assert [FIRST_DAY + timedelta(days=1)] == catalog.missing_days(FIRST_DAY, FIRST_DAY + timedelta(days=DAYS))
+    assert os.path.exists(truncated + ".corrupt")
+    payload = np.ascontiguousarray(expected_day(0), dtype="<i8").tobytes()
+    assert QuoteCtraderCache.checksum(payload) == catalog.get_entry(FIRST_DAY)["checksum"]
+    assert [] == catalog.verify(FIRST_DAY, FIRST_DAY + timedelta(days=DAYS), QuoteCtraderCache._check_zticks)
+
+
+def test_requests_are_pipelined(tmp_path):
+    # the speedup itself is measured by Benchmarks/bench_ctrader_download.py
+    _, serial = download(TICKS, DAYS, 0.2, str(tmp_path / "serial"), max_in_flight=1, max_parallel_days=1)
+    _, pipelined = download(TICKS, DAYS, 0.2, str(tmp_path / "pipelined"), max_in_flight=5, max_parallel_days=3)
+
+    assert 1 == serial.max_in_flight_seen and 1 == serial.max_days_in_flight_seen
+    assert 1 < pipelined.max_in_flight_seen <= 5  # several pages outstanding at once
+    assert 1 < pipelined.max_days_in_flight_seen <= 3  # days are downloaded overlapping
+    assert 0 == serial.violations == pipelined.violations
+
+
+# end of file
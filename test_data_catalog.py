@@ -0,0 +1,126 @@
+"""
+DataCatalog: SQLite manifest of the day files of one provider/symbol folder
+Run: python -m pytest test_data_catalog.py
+"""
+import os
+import gzip
+import zlib
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from pytz import UTC
+from Api.DataCatalog import DataCatalog
+from Api.TickDay import TickDay
+
+FIRST_DAY = datetime(2024, 3, 4, tzinfo=UTC)
+
+
+def day_at(day: int) -> datetime:
+    return FIRST_DAY + timedelta(days=day)
+
+
+def write_day(folder: str, day: int, payload: bytes = b"ticks") -> str:
+    path = os.path.join(folder, day_at(day).strftime("%Y%m%d") + ".zticks")
+    with gzip.open(path, "wb") as file:
+        file.write(payload * 1000)
+    return path
+
+
+def check(path: str) -> str:
+    with gzip.open(path, "rb") as file:
+        return f"{zlib.crc32(file.read()):08x}"
+
+
+def set_folder_mtime(folder: str, mtime_ns: int):
+    os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+
+def tick_day(count: int, last_bid: float = 1.08) -> TickDay:
+    times = 1_709_510_400_000 + np.arange(count, dtype=np.int64)
+    bids = np.full(count, last_bid)
+    return TickDay(times, bids, bids + 1e-4, np.ones(count))
+
+
+@pytest.fixture
+def folder(tmp_path) -> str:
+    folder = str(tmp_path / "t1")
+    os.makedirs(folder)
+    for day in (0, 1, 2, 5):
+        write_day(folder, day)
+    return folder
+
+
+def test_sync_follows_folder_mtime(folder):
+    catalog = DataCatalog(folder, ".zticks")
+    assert [day_at(day) for day in (0, 1, 2, 5)] == catalog.days(day_at(0), day_at(10))
+    mtime_ns = os.stat(folder).st_mtime_ns
+
+    write_day(folder, 3)
+    os.remove(os.path.join(folder, day_at(1).strftime("%Y%m%d") + ".zticks"))
+    with open(os.path.join(folder, "notes.txt"), "w") as file:
+        file.write("not a day file")
+    set_folder_mtime(folder, mtime_ns)
+    catalog.sync()  # folder mtime as recorded: not listed again
+    assert catalog.has_day(day_at(1)) and not catalog.has_day(day_at(3))
+
+    set_folder_mtime(folder, mtime_ns + 1_000_000_000)
+    catalog.sync()
+    assert [day_at(day) for day in (0, 2, 3, 5)] == catalog.days(day_at(0), day_at(10))
+    catalog.close()
+
+    reopened = DataCatalog(folder, ".zticks")  # persisted next to the folder
+    assert reopened.has_day(day_at(3)) and not reopened.has_day(day_at(1))
+    reopened.close()
+
+
+def test_day_ranges(folder):
+    catalog = DataCatalog(folder, ".zticks")
+
+    assert catalog.has_day(day_at(2)) and not catalog.has_day(day_at(3))
+    assert day_at(0) == catalog.first_day() and day_at(5) == catalog.last_day()
+    assert [day_at(1), day_at(2)] == catalog.days(day_at(1), day_at(3))  # [start, end)
+    assert [] == catalog.days(day_at(6), day_at(9))
+    assert [day_at(3), day_at(4), day_at(6)] == catalog.missing_days(day_at(0), day_at(7))
+    assert [day_at(-1)] == catalog.missing_days(day_at(-1), day_at(1))
+    catalog.close()
+
+    empty = DataCatalog(os.path.join(os.path.dirname(folder), "empty"), ".zticks")
+    assert empty.first_day() is None and empty.last_day() is None
+    empty.close()
+
+
+def test_previous_entry_skips_days_without_ticks(folder):
+    catalog = DataCatalog(folder, ".zticks")
+    catalog.update_day(day_at(0), tick_day(3, 1.07), "00000001")
+    catalog.update_day(day_at(2), tick_day(0), "00000002")  # e.g. a holiday
+
+    entry = catalog.previous_entry(day_at(5))
+    assert day_at(1) == entry["day"] and entry["tick_count"] is None  # not summarized yet: a candidate
+
+    catalog.update_day(day_at(1), tick_day(0), "00000003")
+    entry = catalog.previous_entry(day_at(5))
+    assert day_at(0) == entry["day"] and 3 == entry["tick_count"] and 1.07 == entry["last_bid"]
+    assert catalog.previous_entry(day_at(0)) is None
+    assert day_at(0) == catalog.get_summary(day_at(0))["day"]
+    catalog.close()
+
+
+def test_verify_renames_truncated_file(folder):
+    catalog = DataCatalog(folder, ".zticks")
+    truncated = os.path.join(folder, day_at(1).strftime("%Y%m%d") + ".zticks")
+    with open(truncated, "r+b") as file:
+        file.truncate(os.path.getsize(truncated) // 2)
+
+    broken = catalog.verify(day_at(0), day_at(10), check)
+
+    assert [day_at(1)] == broken
+    assert os.path.exists(truncated + ".corrupt") and not os.path.exists(truncated)
+    assert [day_at(1), day_at(3), day_at(4)] == catalog.missing_days(day_at(0), day_at(5))
+    assert check(os.path.join(folder, day_at(0).strftime("%Y%m%d") + ".zticks")) == catalog.get_entry(
+        day_at(0)
+    )["checksum"]
+    assert [] == catalog.verify(day_at(0), day_at(10), check)  # checked days are not read again
+    catalog.close()
+
+
+# end of file
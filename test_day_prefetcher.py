@@ -0,0 +1,87 @@
+"""
+DayPrefetcher: days of a tick stream loaded ahead on a worker thread
+Run: python -m pytest test_day_prefetcher.py
+"""
+import time
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+from Api.KitaApi import Symbol
+from Api.DayPrefetcher import DayPrefetcher
+from Api.TickDay import TickDay
+
+FIRST_DAY = datetime(2024, 3, 4)
+
+
+class DayProvider:
+    """get_day_at_utc of a QuoteProvider: one tick per day at midnight"""
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        day_ms = TickDay.to_ms(utc)
+        return "", utc, TickDay(np.array([day_ms]), np.array([1.08]), np.array([1.0801]))
+
+
+class SlowDayProvider(DayProvider):
+    """Each day takes load_seconds to load (read and decompress)"""
+
+    def __init__(self, load_seconds: float):
+        self.load_seconds = load_seconds
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        time.sleep(self.load_seconds)
+        return DayProvider.get_day_at_utc(self, utc)
+
+
+def read_days(prefetcher: DayPrefetcher, calls: int) -> list:
+    return [prefetcher.next_day() for _ in range(calls)]
+
+
+def test_days_in_order_then_end():
+    for depth in (0, 2):
+        prefetcher = DayPrefetcher(DayProvider(), FIRST_DAY, FIRST_DAY + timedelta(days=2), depth)
+        days = read_days(prefetcher, 4)
+        prefetcher.close()
+        assert [TickDay.from_ms(day.times.item(0)).day for _, day in days[:3]] == [4, 5, 6]
+        assert days[3] is None
+
+
+def test_next_day_after_end_does_not_block():
+    # the stream may be asked again after it ended (e.g. the backtest end is behind the last day)
+    for depth in (0, 2):
+        prefetcher = DayPrefetcher(DayProvider(), FIRST_DAY, FIRST_DAY, depth)
+        result = []
+        reader = threading.Thread(target=lambda: result.extend(read_days(prefetcher, 4)), daemon=True)
+        reader.start()
+        reader.join(timeout=5)
+        prefetcher.close()
+        assert not reader.is_alive()
+        assert result[1:] == [None, None, None]
+
+
+def replay(prefetcher: DayPrefetcher, replay_seconds: float) -> float:
+    """Replay all days (replay_seconds each) and return the time spent waiting for them"""
+    while prefetcher.next_day() is not None:
+        time.sleep(replay_seconds)
+    prefetcher.close()
+    return prefetcher.stall_seconds
+
+
+def test_prefetch_reduces_stall():
+    last_day = FIRST_DAY + timedelta(days=5)
+    synchronous = replay(DayPrefetcher(SlowDayProvider(0.03), FIRST_DAY, last_day, 0), 0.05)
+    prefetched = replay(DayPrefetcher(SlowDayProvider(0.03), FIRST_DAY, last_day, 2), 0.05)
+
+    assert synchronous >= 6 * 0.03  # every day is loaded while the caller waits
+    assert prefetched < synchronous / 2  # only the first day is waited for
+
+
+def test_symbol_stall_survives_stream_restart():
+    symbol = Symbol.__new__(Symbol)  # only the tick stream members are used
+    for _ in range(2):  # e.g. warm-up stream, then the stream restarted for the backtest
+        symbol._tick_prefetcher = DayPrefetcher(SlowDayProvider(0.02), FIRST_DAY, FIRST_DAY, 0)
+        read_days(symbol._tick_prefetcher, 2)
+        symbol.close_tick_stream()
+    assert symbol._tick_prefetcher is None and symbol.tick_io_stall_seconds >= 2 * 0.02
+
+
+# end of file
@@ -0,0 +1,104 @@
+"""
+QuoteDukascopy against the local stand-in server (no internet needed)
+Run: python -m pytest test_dukascopy_offline.py
+"""
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+import numpy as np
+from pytz import UTC
+from BrokerProvider.QuoteDukascopy import Dukascopy
+from Benchmarks.dukascopy_stand_in import (
+    DukascopyStandIn,
+    hour_url_path,
+    make_hour_records,
+    write_fixture_hour,
+)
+
+SYMBOL = "EURUSD"
+POINT_SIZE = 0.00001
+DAY = datetime(2025, 12, 1, tzinfo=UTC)
+
+
+def make_fixture_day(fixture_path: str, empty_hours: tuple[int, ...] = ()) -> list[np.ndarray]:
+    records = []
+    for hour in range(24):
+        hour_records = make_hour_records(0 if hour in empty_hours else 500, hour)
+        write_fixture_hour(fixture_path, SYMBOL, DAY + timedelta(hours=hour), hour_records)
+        records.append(hour_records)
+    return records
+
+
+def make_provider(web_root: str, cache_path: str, **kwargs) -> Dukascopy:
+    provider = Dukascopy(0, web_root=web_root, **kwargs)
+    provider.symbol = SimpleNamespace(name=SYMBOL, broker_symbol_name=SYMBOL, point_size=POINT_SIZE)  # type: ignore
+    provider.cache_path = cache_path
+    return provider
+
+
+def test_day_matches_fixture(tmp_path):
+    records = make_fixture_day(str(tmp_path / "fixture"), empty_hours=(0, 23))
+    with DukascopyStandIn(str(tmp_path / "fixture")) as stand_in:
+        provider = make_provider(stand_in.web_root, str(tmp_path / "cache"))
+        error, _, day = provider.get_day_at_utc(DAY)
+
+    assert "" == error
+    day_ms = int(DAY.timestamp()) * 1000
+    times = np.concatenate([day_ms + hour * 3_600_000 + r["ms"].astype(np.int64) for hour, r in enumerate(records)])
+    assert np.array_equal(day.times, times)
+    assert np.allclose(day.bids, np.concatenate([r["bid"] for r in records]) * POINT_SIZE)
+    assert np.allclose(day.asks, np.concatenate([r["ask"] for r in records]) * POINT_SIZE)
+    assert day.volumes is None
+
+
+def test_cached_day_needs_no_server(tmp_path):
+    make_fixture_day(str(tmp_path / "fixture"))
+    with DukascopyStandIn(str(tmp_path / "fixture")) as stand_in:
+        _, _, first = make_provider(stand_in.web_root, str(tmp_path / "cache")).get_day_at_utc(DAY)
+        requests_after_download = stand_in.request_count
+        _, _, second = make_provider(stand_in.web_root, str(tmp_path / "cache")).get_day_at_utc(DAY)
+
+    assert 24 == requests_after_download
+    assert 24 == stand_in.request_count
+    assert np.array_equal(first.times, second.times)
+
+
+def test_transient_errors_are_retried(tmp_path):
+    make_fixture_day(str(tmp_path / "fixture"))
+    failures = {hour_url_path(SYMBOL, DAY + timedelta(hours=5)): 2}
+    with DukascopyStandIn(str(tmp_path / "fixture"), failures=failures) as stand_in:
+        provider = make_provider(stand_in.web_root, str(tmp_path / "cache"), retries=3, backoff_seconds=0.01)
+        error, _, day = provider.get_day_at_utc(DAY)
+
+    assert "" == error
+    assert 24 * 500 == day.count
+    assert 24 + 2 == stand_in.request_count
+
+
+def test_persistent_errors_are_reported(tmp_path):
+    make_fixture_day(str(tmp_path / "fixture"))
+    failures = {hour_url_path(SYMBOL, DAY + timedelta(hours=7)): 100}
+    with DukascopyStandIn(str(tmp_path / "fixture"), failures=failures) as stand_in:
+        provider = make_provider(stand_in.web_root, str(tmp_path / "cache"), retries=2, backoff_seconds=0.01)
+        error, _, day = provider.get_day_at_utc(DAY)
+
+    assert "" != error
+    assert 0 == day.count
+
+
+def test_hours_are_downloaded_concurrently(tmp_path):
+    # the speedup itself is measured by Benchmarks/bench_dukascopy_download.py
+    make_fixture_day(str(tmp_path / "fixture"))
+    for max_workers in (1, 8):
+        with DukascopyStandIn(str(tmp_path / "fixture"), latency_seconds=0.02) as stand_in:
+            cache_path = str(tmp_path / f"cache{max_workers}")
+            provider = make_provider(stand_in.web_root, cache_path, max_workers=max_workers)
+            error, _, _ = provider.get_day_at_utc(DAY)
+
+        assert "" == error and 24 == stand_in.request_count
+        if 1 == max_workers:
+            assert 1 == stand_in.max_in_flight_seen
+        else:
+            assert 1 < stand_in.max_in_flight_seen <= max_workers
+
+
+# end of file
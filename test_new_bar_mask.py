@@ -0,0 +1,52 @@
+"""
+New-bar notification: Bars.bar_sequence, subscribe_bar_closed and Symbol.new_bar_mask
+Run: python -m pytest test_new_bar_mask.py
+"""
+from datetime import datetime
+from types import SimpleNamespace
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Symbol in the order the app does)
+from Api.Bars import Bars
+from Api.Symbol import Symbol
+from Api.TickDay import TickDay
+
+FIRST_MS = TickDay.to_ms(datetime(2024, 3, 4))
+
+
+def test_sequence_and_callbacks_with_full_buffer():
+    symbol = SimpleNamespace(_backtest_end_ms=TickDay.to_ms(datetime(2100, 1, 1)), is_warm_up=True)
+    bars = Bars("EURUSD", 60, 3, symbol=symbol)  # ring buffer of 4 bars
+    closed = []
+    bars.subscribe_bar_closed(closed.append)
+    bars.subscribe_bar_closed(closed.append)  # no-op
+
+    for minute in range(10):
+        for second in (0, 20, 40):
+            bars.bars_on_tick(FIRST_MS + minute * 60_000 + second * 1000, 1.1, 1.1002, 1)
+    assert 10 == bars.bar_sequence
+    assert 9 == len(closed)  # the first bar does not close one, callbacks run in warm-up too
+    assert all(item is bars for item in closed)
+
+
+def test_symbol_mask_bits():
+    symbol = Symbol.__new__(Symbol)
+    symbol._backtest_end_ms = TickDay.to_ms(datetime(2100, 1, 1))
+    symbol.is_warm_up = True
+    symbol.bars_dictonary = {tf: Bars("EURUSD", tf, 10, symbol=symbol) for tf in (60, 300, 3600)}
+    for ndx, bars in enumerate(symbol.bars_dictonary.values()):
+        bars.dirty_bit = 1 << ndx
+        bars.subscribe_bar_closed(symbol._on_bar_closed)
+
+    def tick(time_ms: int) -> int:
+        symbol.new_bar_mask = 0
+        for bars in symbol.bars_dictonary.values():
+            bars.bars_on_tick(time_ms, 1.1, 1.1002, 1)
+        return symbol.new_bar_mask
+
+    assert 0 == tick(FIRST_MS + 10_000)
+    assert 0b001 == tick(FIRST_MS + 70_000)  # M1
+    assert 0b011 == tick(FIRST_MS + 300_000)  # M1 and M5
+    assert 0 == tick(FIRST_MS + 310_000)
+    assert 0b111 == tick(FIRST_MS + 3_600_000)  # all three
+
+
+# end of file
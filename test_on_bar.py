@@ -0,0 +1,108 @@
+"""
+on_bar(symbol, timeframe) dispatch for timeframes requested with on_bar=True
+Run: python -m pytest test_on_bar.py
+"""
+import os
+from datetime import datetime, timedelta
+import numpy as np
+from pytz import UTC
+from Api.KitaApi import KitaApi, Symbol
+from Api.Constants import Constants
+from Api.QuoteProvider import QuoteProvider
+from Api.TickDay import TickDay
+from BrokerProvider.TradePaper import TradePaper
+
+FIRST_DAY = datetime(2024, 3, 4)  # Monday
+
+
+class MinuteTicks(QuoteProvider):
+    """One tick every 20 seconds with a moving price"""
+
+    provider_name = "Minute ticks"
+
+    def __init__(self):
+        QuoteProvider.__init__(self, "", os.path.join("Files", "Assets_Pepperstone_Live.csv"), 0)
+
+    def init_symbol(self, api: KitaApi, symbol: Symbol):
+        self.api = api
+        self.symbol = symbol
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        day = utc.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=UTC)
+        count = 86400 // 20
+        bids = 1.08 + (np.arange(count) % 7) * 0.00001
+        times = TickDay.to_ms(day) + np.arange(count, dtype=np.int64) * 20_000
+        return "", day, TickDay(times, bids, bids + 0.0001)
+
+    def get_first_datetime(self) -> tuple[str, datetime]:
+        return "", FIRST_DAY
+
+    def get_highest_data_rate(self) -> int:
+        return 0
+
+
+class OnBarBot(KitaApi):
+    def __init__(self):
+        self.WarmupStart = FIRST_DAY
+        self.BacktestStart = FIRST_DAY + timedelta(hours=6)
+        self.BacktestEnd = FIRST_DAY + timedelta(days=1)
+        self.calls: list[tuple[int, int]] = []  # (timeframe, time_ms), on_tick as timeframe 0
+        super().__init__()
+
+    def _init_debug_log(self):
+        self._debug_log_file = None
+
+    def on_init(self) -> None:
+        _, self.eurusd = self.request_symbol("EURUSD", MinuteTicks(), TradePaper(), "utc")
+        self.eurusd.request_bars(15 * Constants.SEC_PER_MINUTE, 10, on_bar=True)
+        self.eurusd.request_bars(5 * Constants.SEC_PER_MINUTE, 10, on_bar=True)
+        self.eurusd.request_bars(Constants.SEC_PER_HOUR, 10)  # no subscriber
+
+    def on_start(self, symbol: Symbol) -> None:
+        pass
+
+    def on_bar(self, symbol: Symbol, timeframe: int):
+        self.calls.append((timeframe, symbol.time_ms))
+
+    def on_tick(self, symbol: Symbol):
+        self.calls.append((0, symbol.time_ms))
+
+    def on_stop(self, symbol: Symbol = None):
+        pass
+
+
+def test_on_bar_for_subscribed_timeframes():
+    robot = OnBarBot()
+    robot.do_init()
+    robot.do_start()
+    while not robot.do_tick():
+        pass
+    robot.eurusd.close_tick_stream()
+
+    start_ms = TickDay.to_ms(robot.BacktestStart)
+    end_ms = TickDay.to_ms(robot._BacktestEndUtc)
+    m5 = [time_ms for timeframe, time_ms in robot.calls if 300 == timeframe]
+    m15 = [time_ms for timeframe, time_ms in robot.calls if 900 == timeframe]
+    assert {0, 300, 900} == {timeframe for timeframe, _ in robot.calls}  # H1 has no subscriber
+    # a call at the first tick of every new bar from BacktestStart on
+    assert m5 == list(range(start_ms, end_ms, 300_000))
+    assert m15 == list(range(start_ms, end_ms, 900_000))
+    # shorter timeframe first when both close on the same tick, on_tick after them
+    assert robot.calls[:4] == [(300, start_ms), (900, start_ms), (0, start_ms), (0, start_ms + 20_000)]
+
+
+def test_on_bar_is_optional():
+    class TickOnlyBot(OnBarBot):
+        on_bar = KitaApi.on_bar  # subscribed with on_bar=True, but on_bar is not overridden
+
+    robot = TickOnlyBot()
+    robot.do_init()
+    robot.do_start()
+    while not robot.do_tick():
+        pass
+    robot.eurusd.close_tick_stream()
+
+    assert 0 < len(robot.calls) and {0} == {timeframe for timeframe, _ in robot.calls}
+
+
+# end of file
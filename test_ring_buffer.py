@@ -0,0 +1,86 @@
+"""
+NumpyRingbuffer: mirrored float ring buffer, must behave as Ringbuffer and give zero-copy windows
+Run: python -m pytest test_ring_buffer.py
+"""
+import random
+import numpy as np
+import pytest
+from Api.ring_buffer import Ringbuffer, NumpyRingbuffer
+
+
+def newest_first(ring) -> list:
+    return [ring[rel_pos] for rel_pos in range(ring._count)]
+
+
+def test_matches_ringbuffer_and_windows():
+    rng = random.Random(7)
+    for size in (1, 2, 5, 17):
+        reference = Ringbuffer[float](size)
+        ring = NumpyRingbuffer(size)
+        for step in range(6 * size + 10):
+            action = rng.random()
+            value = round(rng.uniform(-1, 1), 6)
+            if action < 0.7 or 0 == reference._count:
+                slot = reference.add_with_details(value, out_ndx=True)
+                assert ring.add_with_details(value, out_ndx=True) == slot
+            elif action < 0.85:
+                reference.exchange(value)
+                ring.exchange(value)
+            else:
+                rel_pos = rng.randrange(reference._count)
+                reference[rel_pos] = ring[rel_pos] = value
+
+            assert (ring._count, ring._add_count, ring._position) == (
+                reference._count,
+                reference._add_count,
+                reference._position,
+            )
+            assert newest_first(ring) == newest_first(reference)
+            assert (ring.first(), ring.last()) == (reference.first(), reference.last())
+            for length in (1, size, size + 3):
+                window = ring.window(length)
+                assert window.tolist() == newest_first(reference)[: min(length, size)][::-1]
+                assert np.shares_memory(window, ring._buffer)
+
+
+def test_window_is_read_only_view():
+    ring = NumpyRingbuffer(4)
+    for value in range(6):
+        ring.add(float(value))
+    window = ring.window(3)
+    assert window.tolist() == [3.0, 4.0, 5.0]
+    with pytest.raises(ValueError):
+        window[0] = 1.0
+    ring[0] = 9.0  # writes both copies, so the view shows it
+    assert window.tolist() == [3.0, 4.0, 9.0] and ring.window(4).tolist() == [2.0, 3.0, 4.0, 9.0]
+
+
+def test_remove_at_and_clear():
+    reference = Ringbuffer[float](5)
+    ring = NumpyRingbuffer(5)
+    for value in range(4):
+        reference.add(float(value))
+        ring.add(float(value))
+    reference.remove_at(1)
+    ring.remove_at(1)
+    assert newest_first(ring) == newest_first(reference) and ring.window(5).tolist() == [0.0, 2.0, 3.0]
+    assert ring.contains(2.0) and not ring.contains(1.0)
+    ring.clear()
+    assert 0 == ring._count and 0 == len(ring.window(5))
+
+
+def test_resize_keeps_values_and_add_count():
+    for added in (0, 3, 6, 11):  # empty, partly filled, full, wrapped around
+        ring = NumpyRingbuffer(6)
+        for value in range(added):
+            ring.add(float(value))
+        expected = ring.window(6).tolist()
+        ring.resize(10)
+        assert ring._size == 10 and ring._add_count == added and ring.window(10).tolist() == expected
+        for value in range(added, added + 7):
+            ring.add(float(value))
+        assert ring.window(10).tolist() == (expected + [float(value) for value in range(added, added + 7)])[-10:]
+        assert newest_first(ring) == ring.window(10).tolist()[::-1]
+
+
+# end of file
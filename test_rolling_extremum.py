@@ -0,0 +1,102 @@
+"""
+RollingExtremum: monotonic deque rolling max/min, randomized equivalence against brute force
+Run: python -m pytest test_rolling_extremum.py
+"""
+import math
+import random
+from datetime import datetime, timedelta
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.DataSeries import DataSeries
+from Api.ring_buffer import Ringbuffer, NumpyRingbuffer
+from Api.ring_buffer_time_price import RingbufferTimePrice
+from Api.RollingExtremum import RollingExtremum
+from Api.TickDay import TickDay
+
+
+def brute(ring, period: int, maximum: bool) -> float:
+    values = [ring[rel_pos] for rel_pos in range(min(period, ring._size, ring._count))]
+    values = [value for value in values if value is not None and not math.isnan(value)]
+    if not values:
+        return float("nan")
+    return max(values) if maximum else min(values)
+
+
+def same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def random_value(rng: random.Random) -> float:
+    return float("nan") if rng.random() < 0.05 else float(rng.randint(0, 30))  # many ties
+
+
+def test_ring_buffers_random_ops():
+    rng = random.Random(3)
+    for ring_class in (Ringbuffer[float], NumpyRingbuffer):
+        for size, period in ((1, 1), (5, 3), (8, 8), (12, 20), (40, 7)):
+            ring = ring_class(size)
+            trackers = [RollingExtremum(ring, period, maximum) for maximum in (True, False)]
+            for _ in range(600):
+                if rng.random() < 0.75 or 0 == ring._count:
+                    for _ in range(rng.choice((1, 1, 1, 2, period + 3))):  # queries may skip many adds
+                        ring.add(random_value(rng))
+                else:
+                    ring.exchange(random_value(rng))  # the newest changes (current bar)
+                if rng.random() < 0.6:
+                    for tracker in trackers:
+                        assert same(tracker.value, brute(ring, period, tracker.maximum))
+
+
+def test_bar_columns_and_current_bar():
+    rng = random.Random(5)
+    bars = Bars("EURUSD", 60, 9)
+    high_bids = bars.high_bids.data
+    highest = RollingExtremum(high_bids, 6, True)
+    lowest = RollingExtremum(bars.low_bids.data, 6, False)
+    first_ms = TickDay.to_ms(datetime(2024, 3, 4))
+    for ndx in range(300):
+        if 0 == ndx % 4:
+            bid = 1.08 + rng.randint(-50, 50) * 1e-5
+            bars.append(TickDay.from_ms(first_ms + ndx * 60_000), bid, bid, bid, bid, 1.0, bid, bid, bid, bid, 1.0)
+        else:
+            bid = 1.08 + rng.randint(-50, 50) * 1e-5
+            bars._update_current_bar(bid, bid + 1e-4, 1)
+        assert highest.value == brute(high_bids, 6, True)
+        assert lowest.value == brute(bars.low_bids.data, 6, False)
+
+
+def test_data_series_get_max_min_with_resize():
+    rng = random.Random(11)
+    series = DataSeries(None, 10)  # type: ignore
+    for step in range(400):
+        series.append(random_value(rng))
+        if 200 == step:
+            series.resize(25)
+        assert same(series.get_max(), brute(series.data, series._size, True))
+        assert same(series.get_min(), brute(series.data, series._size, False))
+
+
+def test_time_price_extrema_match_rescan():
+    rng = random.Random(13)
+    ring = RingbufferTimePrice(7)
+    start = datetime(2024, 3, 4)
+    for ndx in range(300):
+        ring.add((start + timedelta(minutes=ndx), float(rng.randint(0, 20))))
+        high, low = ring.get_extrema()[RingbufferTimePrice.HIGH], ring.get_extrema()[RingbufferTimePrice.LOW]
+        assert ring.highest_value == high and ring.lowest_value == low  # same item on ties (the oldest)
+
+
+def test_time_price_mode_builds_its_trackers_only():
+    start = datetime(2024, 3, 4)
+    rings = {mode: RingbufferTimePrice(5, mode) for mode in (RingbufferTimePrice.HIGH, RingbufferTimePrice.LOW)}
+    for ndx, price in enumerate((3.0, 1.0, 4.0, 1.5, 5.0, 9.0, 2.0)):
+        for ring in rings.values():
+            ring.add((start + timedelta(minutes=ndx), price))
+
+    high_only, low_only = rings[RingbufferTimePrice.HIGH], rings[RingbufferTimePrice.LOW]
+    assert high_only._lowest_tracker is None and low_only._highest_tracker is None
+    assert high_only.highest_value[1] == 9.0 and high_only.lowest_value == (datetime.min, math.inf)
+    assert low_only.lowest_value[1] == 1.5 and low_only.highest_value == (datetime.min, -math.inf)
+
+
+# end of file
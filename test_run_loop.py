@@ -0,0 +1,118 @@
+"""
+KitaApi.run(): same ticks as the do_tick() loop, stop at until, batched progress
+Run: python -m pytest test_run_loop.py
+"""
+import os
+from datetime import datetime, timedelta
+import numpy as np
+from pytz import UTC
+from Api.KitaApi import KitaApi, Symbol
+from Api.QuoteProvider import QuoteProvider
+from Api.TickDay import TickDay
+from BrokerProvider.TradePaper import TradePaper
+
+FIRST_DAY = datetime(2024, 3, 4)  # Monday
+
+
+class RandomTicks(QuoteProvider):
+    provider_name = "Random ticks"
+
+    def __init__(self, seed: int):
+        QuoteProvider.__init__(self, "", os.path.join("Files", "Assets_Pepperstone_Live.csv"), 0)
+        self.seed = seed
+
+    def init_symbol(self, api: KitaApi, symbol: Symbol):
+        self.api = api
+        self.symbol = symbol
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        day = utc.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=UTC)
+        rng = np.random.default_rng(self.seed + day.toordinal())
+        times = TickDay.to_ms(day) + np.sort(rng.integers(0, 86_400_000, 3000))
+        bids = 1.08 + np.cumsum(rng.integers(-1, 2, 3000)) * 0.00005
+        return "", day, TickDay(times, bids, bids + 0.0001)
+
+    def get_first_datetime(self) -> tuple[str, datetime]:
+        return "", FIRST_DAY
+
+    def get_highest_data_rate(self) -> int:
+        return 0
+
+
+class RecordingBot(KitaApi):
+    def __init__(self):
+        self.WarmupStart = FIRST_DAY
+        self.BacktestStart = FIRST_DAY + timedelta(hours=12)
+        self.BacktestEnd = FIRST_DAY + timedelta(days=1)
+        self.ticks: list[tuple[str, int]] = []
+        super().__init__()
+
+    def _init_debug_log(self):
+        self._debug_log_file = None
+
+    def on_init(self) -> None:
+        for seed, name in enumerate(("EURUSD", "GBPUSD")):
+            _, symbol = self.request_symbol(name, RandomTicks(seed), TradePaper(), "utc")
+            symbol.request_bars(3600, 10)
+
+    def on_start(self, symbol: Symbol) -> None:
+        pass
+
+    def on_tick(self, symbol: Symbol):
+        self.ticks.append((symbol.name, symbol.time_ms))
+
+    def on_stop(self, symbol: Symbol = None):
+        pass
+
+
+def started() -> RecordingBot:
+    robot = RecordingBot()
+    robot.do_init()
+    robot.do_start()
+    return robot
+
+
+def stop(robot: RecordingBot):
+    for symbol in robot.symbol_dictionary.values():
+        symbol.close_tick_stream()
+
+
+def test_run_matches_do_tick():
+    stepwise = started()
+    steps = 0
+    while not stepwise.do_tick():
+        steps += 1
+    stop(stepwise)
+
+    progress = []
+    whole = started()
+    ended, ticks = whole.run(
+        progress_cb=lambda count, time_ms: progress.append((count, time_ms)), progress_every=1000
+    )
+    stop(whole)
+
+    assert ended
+    assert whole.ticks == stepwise.ticks and len(whole.ticks) > 1000
+    assert ticks == steps
+    assert [count for count, _ in progress] == list(range(1000, ticks + 1, 1000))
+
+
+def test_run_until_in_slices():
+    whole = started()
+    whole.run()
+    stop(whole)
+
+    sliced = started()
+    until = FIRST_DAY + timedelta(hours=13)
+    while True:
+        ended, _ = sliced.run(until=until)
+        if ended:
+            break
+        assert sliced.ticks[-1][1] < TickDay.to_ms(until)
+        sliced.do_tick()  # stepwise in between
+        until += timedelta(hours=1)
+    stop(sliced)
+    assert sliced.ticks == whole.ticks
+
+
+# end of file
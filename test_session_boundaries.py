@@ -0,0 +1,90 @@
+"""
+SessionBoundaries: precomputed H4/D1 bar starts across the DST switch weekends
+Run: python -m pytest test_session_boundaries.py
+"""
+from datetime import datetime, timedelta
+import pytz
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Bars in the order the app does)
+from Api.Bars import Bars
+from Api.SessionBoundaries import SessionBoundaries
+
+UTC = pytz.UTC
+NY_TZ = pytz.timezone("America/New_York")
+
+
+def h4_start_by_timezone(time: datetime) -> datetime:
+    """H4 bar start computed per tick with timezone math (anchor: New York 17:00 of the day)"""
+    anchor = NY_TZ.localize(time.astimezone(NY_TZ).replace(hour=17, minute=0, tzinfo=None)).astimezone(UTC)
+    if time < anchor:
+        anchor = NY_TZ.localize(
+            (time.astimezone(NY_TZ) - timedelta(days=1)).replace(hour=17, minute=0, tzinfo=None)
+        ).astimezone(UTC)
+    next_anchor = NY_TZ.localize(
+        (anchor.astimezone(NY_TZ) + timedelta(days=1)).replace(hour=17, minute=0, tzinfo=None)
+    ).astimezone(UTC)
+    start = anchor + timedelta(hours=(time - anchor) // timedelta(hours=4) * 4)
+    assert start < next_anchor
+    return start
+
+
+def bar_starts(timeframe_seconds: int, first: datetime, last: datetime) -> list[tuple[datetime, datetime]]:
+    """(tick time, bar start) every 7 minutes, through one Bars object like the tick stream does"""
+    bars = Bars("EURUSD", timeframe_seconds, 10)
+    result = []
+    time = first
+    while time <= last:
+        result.append((time, bars._calculate_bar_start_time(time, timeframe_seconds)))
+        time += timedelta(minutes=7)
+    return result
+
+
+def test_h4_spring_switch():
+    # 2024-03-10 02:00 EST -> 03:00 EDT: 17:00 NY moves from 22:00 UTC to 21:00 UTC
+    starts = bar_starts(14400, datetime(2024, 3, 7, tzinfo=UTC), datetime(2024, 3, 13, tzinfo=UTC))
+    for time, start in starts:
+        assert start == h4_start_by_timezone(time), time
+    opened = sorted({start for _, start in starts})
+    assert datetime(2024, 3, 8, 22, tzinfo=UTC) in opened  # Friday 17:00 EST
+    assert datetime(2024, 3, 10, 21, tzinfo=UTC) in opened  # Sunday 17:00 EDT
+    assert datetime(2024, 3, 11, 1, tzinfo=UTC) in opened
+    # the anchor day over the switch has 23 hours, its last bar 3 hours
+    assert datetime(2024, 3, 10, 18, tzinfo=UTC) in opened
+    assert datetime(2024, 3, 10, 22, tzinfo=UTC) not in opened
+
+
+def test_h4_autumn_switch():
+    # 2024-11-03 02:00 EDT -> 01:00 EST: 17:00 NY moves from 21:00 UTC to 22:00 UTC
+    starts = bar_starts(14400, datetime(2024, 10, 31, tzinfo=UTC), datetime(2024, 11, 6, tzinfo=UTC))
+    for time, start in starts:
+        assert start == h4_start_by_timezone(time), time
+    opened = sorted({start for _, start in starts})
+    assert datetime(2024, 11, 1, 21, tzinfo=UTC) in opened  # Friday 17:00 EDT
+    assert datetime(2024, 11, 3, 22, tzinfo=UTC) in opened  # Sunday 17:00 EST
+    # the anchor day over the switch has 25 hours, it ends with a 1 hour bar
+    assert datetime(2024, 11, 3, 21, tzinfo=UTC) in opened
+    anchor_day = (datetime(2024, 11, 2, 21, tzinfo=UTC), datetime(2024, 11, 3, 22, tzinfo=UTC))
+    day_bars = [start for start in opened if anchor_day[0] <= start < anchor_day[1]]
+    assert 7 == len(day_bars)
+
+
+def test_d1_and_year_change():
+    starts = bar_starts(86400, datetime(2024, 12, 30, 20, tzinfo=UTC), datetime(2025, 1, 2, 3, tzinfo=UTC))
+    for time, start in starts:
+        assert start == time.replace(hour=0, minute=0)
+
+    # H4 over the year change: bisection in the next year's table
+    starts = bar_starts(14400, datetime(2024, 12, 31, 12, tzinfo=UTC), datetime(2025, 1, 1, 12, tzinfo=UTC))
+    for time, start in starts:
+        assert start == h4_start_by_timezone(time), time
+
+
+def test_tables_are_sorted_and_cover_the_year():
+    for year in (2023, 2024):
+        table = SessionBoundaries.table(14400, year)
+        assert table == sorted(set(table))
+        first_ms = int(datetime(year, 1, 1, tzinfo=UTC).timestamp()) * 1000
+        last_ms = int(datetime(year + 1, 1, 1, tzinfo=UTC).timestamp()) * 1000 - 1
+        assert table[0] <= first_ms and table[-1] > last_ms
+
+
+# end of file
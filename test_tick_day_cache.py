@@ -0,0 +1,88 @@
+"""
+TickDayCache: memory-mapped copy of decoded days, invalidated by changes of the source file
+Run: python -m pytest test_tick_day_cache.py
+"""
+import os
+import numpy as np
+from Api.TickDay import TickDay
+from Api.TickDayCache import TickDayCache
+
+POINT = 1e-5
+
+
+def make_day(count: int = 500) -> TickDay:
+    rng = np.random.default_rng(4)
+    times = 1_709_510_400_000 + np.cumsum(rng.integers(1, 2_000, count))
+    bid_points = 108_000 + np.cumsum(rng.integers(-3, 4, count))
+    ask_points = bid_points + rng.integers(1, 5, count)
+    volumes = rng.integers(1, 3, count).astype(np.float64)
+    return TickDay(
+        times,
+        bid_points * POINT,
+        ask_points * POINT,
+        volumes,
+        bid_points=bid_points,
+        ask_points=ask_points,
+        point_size=POINT,
+    )
+
+
+def make_cache(tmp_path) -> tuple[TickDayCache, str]:
+    source_path = str(tmp_path / "20240304.zticks")
+    with open(source_path, "wb") as file:
+        file.write(b"compressed day")
+    return TickDayCache(str(tmp_path / "t1_npy")), source_path
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    cache, source_path = make_cache(tmp_path)
+    day = make_day()
+    assert cache.load("20240304", source_path) is None
+
+    cache.store("20240304", source_path, day)
+    loaded = cache.load("20240304", source_path)
+
+    assert loaded is not None and loaded.count == day.count and loaded.point_size == POINT
+    for name in TickDayCache.COLUMNS:
+        assert np.array_equal(getattr(loaded, name), getattr(day, name))
+    assert isinstance(loaded.bid_points.base, np.memmap) or isinstance(loaded.bid_points, np.memmap)
+
+    cache.store("20240305", source_path, TickDay.empty())
+    assert 0 == cache.load("20240305", source_path).count
+
+
+def test_changed_source_invalidates(tmp_path):
+    cache, source_path = make_cache(tmp_path)
+    cache.store("20240304", source_path, make_day())
+
+    stat = os.stat(source_path)
+    os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load("20240304", source_path) is None  # other mtime
+
+    cache.store("20240304", source_path, make_day())
+    with open(source_path, "ab") as file:
+        file.write(b"more")
+    os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.load("20240304", source_path) is None  # other size
+
+
+def test_broken_npy_falls_back(tmp_path):
+    cache, source_path = make_cache(tmp_path)
+    day = make_day()
+    column_path = os.path.join(cache.root_path, "20240304", "bids.npy")
+
+    cache.store("20240304", source_path, day)
+    with open(column_path, "r+b") as file:
+        file.truncate(os.path.getsize(column_path) // 2)  # e.g. a disk full while storing
+    assert cache.load("20240304", source_path) is None
+
+    cache.store("20240304", source_path, day)
+    with open(column_path, "wb") as file:
+        file.write(b"PK\x03\x04 not an npy file" * 8)  # foreign header
+    assert cache.load("20240304", source_path) is None
+
+    cache.store("20240304", source_path, day)  # the decoded day is stored again
+    assert np.array_equal(cache.load("20240304", source_path).bids, day.bids)
+
+
+# end of file
@@ -0,0 +1,99 @@
+"""
+Integer point prices: TickDay.points and the unchanged-quote filter of the tick stream
+Run: python -m pytest test_tick_points.py
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pytz
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Symbol in the order the app does)
+from Api.Bars import Bars
+from Api.Symbol import Symbol
+from Api.TickDay import TickDay
+
+FIRST_DAY = datetime(2024, 3, 4, tzinfo=pytz.UTC)
+LOADER_TICK_SIZE = 10e-6  # cTrader integer prices
+
+
+def ctrader_like_day(day: datetime, count: int, base_points: int, seed: int) -> TickDay:
+    """Ticks as QuoteCtraderCache decodes them: integer prices at 1e-5 plus the float columns"""
+    rng = np.random.default_rng(seed)
+    day_ms = TickDay.to_ms(day)
+    bids_int = base_points + np.cumsum(rng.integers(-3, 4, count)).astype(np.int64)
+    asks_int = bids_int + rng.integers(1, 30, count)
+    return TickDay(
+        day_ms + np.sort(rng.integers(0, 86_400_000, count)),
+        bids_int * LOADER_TICK_SIZE,
+        asks_int * LOADER_TICK_SIZE,
+        bid_points=bids_int,
+        ask_points=asks_int,
+        point_size=LOADER_TICK_SIZE,
+    )
+
+
+def test_points_match_float_rounding():
+    day = ctrader_like_day(FIRST_DAY, 5000, 15_000_000, 1)  # USDJPY like: 150.00000
+    for point_size, factor in ((0.00001, 1), (0.001, 100), (0.01, 1000)):
+        bid_points, ask_points = day.points(point_size)
+        assert bid_points.dtype == np.int64
+        # away from exact halves integer rounding is float rounding; halves are rounded up, not to even
+        halves = day.bid_points % factor * 2 == factor
+        np.testing.assert_array_equal(bid_points[~halves], np.rint(day.bids / point_size)[~halves])
+        np.testing.assert_array_equal(bid_points[halves], (day.bid_points[halves] + factor // 2) // factor)
+        halves = day.ask_points % factor * 2 == factor
+        np.testing.assert_array_equal(ask_points[~halves], np.rint(day.asks / point_size)[~halves])
+
+    # without integer columns the float prices are rounded
+    plain = TickDay(day.times, day.bids, day.asks)
+    np.testing.assert_array_equal(plain.points(0.00001)[0], day.bid_points)
+
+    # integer columns survive concatenation
+    joined = TickDay.concatenate([day, ctrader_like_day(FIRST_DAY + timedelta(days=1), 10, 15_000_000, 2)])
+    assert joined.point_size == LOADER_TICK_SIZE and joined.bid_points is not None
+
+
+class TickProvider:
+    def __init__(self, days: dict[datetime, TickDay]):
+        self.days = days
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        return "", utc, self.days.get(utc, TickDay.empty())
+
+
+def test_filter_accepts_changes_at_symbol_resolution():
+    days = {}
+    for ndx in range(2):
+        day = FIRST_DAY + timedelta(days=ndx)
+        days[day] = ctrader_like_day(day, 3000, 15_000_000, ndx)
+    robot = SimpleNamespace(
+        _BacktestStartUtc=FIRST_DAY, _BacktestEndUtc=FIRST_DAY + timedelta(days=2), _debug_log=lambda _: None
+    )
+    symbol = Symbol.__new__(Symbol)
+    symbol.api = SimpleNamespace(robot=robot, TickPrefetchDepth=0, BarTickSynthesis=False, TickPrefilter=True)
+    symbol.name = "USDJPY"
+    symbol.point_size = 0.001
+    symbol.quote_provider = TickProvider(days)
+    symbol.time = None
+    symbol.bars_dictonary = {86400: Bars(symbol.name, 86400, 10, symbol=symbol)}
+    symbol._init_tick_stream(FIRST_DAY)
+    symbol._build_indicator_cache()
+
+    accepted = []
+    while "" == symbol.symbol_on_tick():
+        accepted.append((symbol.time_ms, symbol.bid, symbol.ask))
+
+    # reference: a tick passes when its quote rounded to 3 digits differs from the last accepted one
+    # or it opens a new D1 bar
+    expected = []
+    prev = None
+    for day in days.values():
+        for time_ms, bid, ask in zip(day.times.tolist(), day.bids.tolist(), day.asks.tolist()):
+            quote = (round(bid / 0.001 + 1e-9), round(ask / 0.001 + 1e-9))  # halves up like the int points
+            if quote != prev or (expected and time_ms // 86_400_000 != expected[-1][0] // 86_400_000):
+                expected.append((time_ms, bid, ask))
+                prev = quote
+    assert accepted == expected
+    assert len(accepted) < sum(day.count for day in days.values())
+
+
+# end of file
@@ -0,0 +1,111 @@
+"""
+Day-level prefilter of repeated quotes (KitaApi.TickPrefilter) against the raw tick stream
+Run: python -m pytest test_tick_prefilter.py
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import numpy as np
+import pytz
+from Api.KitaApi import KitaApi  # noqa: F401  (imports Symbol in the order the app does)
+from Api.Bars import Bars
+from Api.Symbol import Symbol
+from Api.TickDay import TickDay
+
+FIRST_DAY = datetime(2024, 3, 4, tzinfo=pytz.UTC)
+DAYS = 3
+TIMEFRAMES = (60, 3600, 4 * 3600, 86400)
+
+
+def repeating_day(day: datetime, count: int, seed: int) -> TickDay:
+    """Ticks of which most repeat the previous quote, a few NaN quotes and TickVolume deltas"""
+    rng = np.random.default_rng(seed)
+    bids = 1.08 + np.cumsum(rng.choice([-1, 0, 0, 0, 0, 0, 1], count)) * 0.00001
+    asks = bids + np.where(rng.random(count) < 0.05, 0.00003, 0.00002)
+    bids[rng.random(count) < 0.01] = np.nan
+    return TickDay(
+        TickDay.to_ms(day) + np.sort(rng.integers(0, 86_400_000, count)),
+        bids,
+        asks,
+        rng.integers(1, 4, count).astype(np.float64),
+    )
+
+
+class TickProvider:
+    def __init__(self):
+        self.days = {}
+        for ndx in range(DAYS):
+            day = FIRST_DAY + timedelta(days=ndx)
+            self.days[day] = repeating_day(day, 20_000, ndx)
+
+    def get_day_at_utc(self, utc: datetime) -> tuple[str, datetime, TickDay]:
+        return "", utc, self.days.get(utc, TickDay.empty())
+
+
+def make_symbol(prefilter: bool) -> Symbol:
+    robot = SimpleNamespace(
+        _BacktestStartUtc=FIRST_DAY, _BacktestEndUtc=FIRST_DAY + timedelta(days=DAYS), _debug_log=lambda _: None
+    )
+    symbol = Symbol.__new__(Symbol)
+    symbol.api = SimpleNamespace(robot=robot, TickPrefetchDepth=0, BarTickSynthesis=False, TickPrefilter=prefilter)
+    symbol.name = "EURUSD"
+    symbol.point_size = 0.00001
+    symbol.quote_provider = TickProvider()
+    symbol.time = None
+    symbol.bars_dictonary = {tf: Bars(symbol.name, tf, 2000, symbol=symbol) for tf in TIMEFRAMES}
+    symbol._init_tick_stream(FIRST_DAY)
+    symbol._build_indicator_cache()
+    return symbol
+
+
+def bar_state(symbol: Symbol) -> dict:
+    state = {}
+    for tf, bars in symbol.bars_dictonary.items():
+        state[tf] = [
+            (
+                bars.open_times.last(ago),
+                bars.high_bids.last(ago),
+                bars.low_bids.last(ago),
+                bars.close_bids.last(ago),
+                bars.close_asks.last(ago),
+                bars.volume_bids.last(ago),
+                bars.Last(ago).TickVolume,
+            )
+            for ago in range(min(bars.count, 1000))
+        ]
+    return state
+
+
+def run(prefilter: bool, step_ms: int = 0) -> tuple[list, dict, int]:
+    """Accepted ticks, bars and processed count; step_ms > 0 drives the stream in until_ms slices"""
+    symbol = make_symbol(prefilter)
+    accepted = []
+    until_ms = TickDay.to_ms(FIRST_DAY)
+    while True:
+        error = symbol.symbol_on_tick(until_ms if step_ms else None)
+        if "Tick pending" == error:
+            until_ms += step_ms
+            continue
+        if "" != error:
+            break
+        assert not step_ms or symbol.time_ms <= until_ms
+        accepted.append((symbol.time_ms, symbol.bid, symbol.ask))
+    return accepted, bar_state(symbol), symbol._tick_total_processed
+
+
+def test_prefilter_matches_raw_stream():
+    raw = run(prefilter=False)
+    assert raw == run(prefilter=True)
+    accepted, bars, processed = raw
+    assert processed == sum(int(np.count_nonzero(~np.isnan(day.bids))) for day in TickProvider().days.values())
+    assert len(accepted) < processed // 2  # most ticks repeat
+    # every valid tick fed its TickVolume to the bars
+    days = TickProvider().days.values()
+    assert sum(bar[6] for bar in bars[86400]) == sum(day.volumes[~np.isnan(day.bids)].sum() for day in days)
+
+
+def test_prefilter_with_pending_ticks():
+    # runs of repeated quotes stop at until_ms like the per-tick path does
+    assert run(prefilter=False, step_ms=97_000) == run(prefilter=True, step_ms=97_000)
+
+
+# end of file
@@ -0,0 +1,90 @@
+"""
+TickScheduler: chronological merge of several symbols' tick streams
+Run: python -m pytest test_tick_scheduler.py
+"""
+import random
+from Api.TickScheduler import TickScheduler
+
+
+class FilteringSymbol:
+    """
+    Tick stream consumed like Symbol.symbol_on_tick: ticks flagged as unchanged are filtered (they only feed
+    the bars) and consumption goes on until an accepted tick or until the next tick is later than until_ms
+    """
+
+    def __init__(self, name: str, ticks: list[tuple[int, bool]]):
+        self.name = name
+        self.ticks = ticks  # (epoc ms, accepted)
+        self.index = 0
+        self.consumed: list[tuple[int, str]] = []
+
+    def next_tick_ms(self):
+        return self.ticks[self.index][0] if self.index < len(self.ticks) else None
+
+    def symbol_on_tick(self, until_ms) -> str:
+        while True:
+            next_ms = self.next_tick_ms()
+            if next_ms is None:
+                return "End reached"
+            if until_ms is not None and next_ms > until_ms:
+                return "Tick pending"
+            time_ms, accepted = self.ticks[self.index]
+            self.index += 1
+            self.consumed.append((time_ms, self.name))
+            if accepted:
+                return ""
+
+
+def run(symbols: list[FilteringSymbol]) -> list[tuple[int, str]]:
+    """The do_tick loop; returns all consumed ticks in processing order"""
+    processed = []
+    scheduler = TickScheduler(symbols)
+    while len(scheduler) > 0:
+        order, symbol, until_ms = scheduler.pop()
+        before = len(symbol.consumed)
+        error = symbol.symbol_on_tick(until_ms)
+        processed.extend(symbol.consumed[before:])
+        if "" == error or "Tick pending" == error:
+            scheduler.push(order, symbol)
+    return processed
+
+
+def make_symbols(rng: random.Random, count: int) -> list[FilteringSymbol]:
+    symbols = []
+    for ndx in range(count):
+        times = sorted(rng.randint(0, 50) for _ in range(rng.randint(0, 40)))
+        symbols.append(FilteringSymbol(f"S{ndx}", [(time_ms, rng.random() < 0.5) for time_ms in times]))
+    return symbols
+
+
+def test_ticks_are_processed_in_time_order():
+    rng = random.Random(3)
+    for _ in range(200):
+        symbols = make_symbols(rng, rng.randint(1, 6))
+        processed = run(symbols)
+
+        # every tick once; by time, equal times in the order the symbols were requested
+        order = {symbol.name: ndx for ndx, symbol in enumerate(symbols)}
+        expected = sorted(
+            [(time_ms, symbol.name) for symbol in symbols for time_ms, _ in symbol.ticks],
+            key=lambda tick: (tick[0], order[tick[1]]),
+        )
+        assert processed == expected
+
+
+def test_quiet_symbol_does_not_run_ahead():
+    busy = FilteringSymbol("EURUSD", [(time_ms, True) for time_ms in range(0, 1000, 10)])
+    quiet = FilteringSymbol("NZDCAD", [(500, True), (900, True)])
+    processed = run([quiet, busy])
+    assert (500, "NZDCAD") == processed[50]  # after EURUSD 0..490
+    assert (500, "EURUSD") == processed[51]
+
+
+def test_exhausted_symbols_are_dropped():
+    scheduler = TickScheduler([FilteringSymbol("A", []), FilteringSymbol("B", [(1, True)])])
+    assert 1 == len(scheduler)
+    _, symbol, until_ms = scheduler.pop()
+    assert "B" == symbol.name and until_ms is None
+
+
+# end of file